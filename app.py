@@ -1,21 +1,26 @@
 import os
+import atexit
 import logging
 import threading
 import datetime
 import time
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, jsonify, request
 from monitor import BotMonitor
 from bot import create_discord_bot
+from cluster import CLUSTER_WORKERS, Cluster
+from log_setup import LOG_FILE, log_stats, setup_logging
+from log_buffer import QUERY_PARAMS, LogRingBuffer, query_from_args
+from log_stream import LogBroadcaster, stream_logs
+from log_tail import read_log
+from status_stream import StatusPublisher
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('discord_bot.log')
-    ]
-)
+# Fans new log records out to the dashboard's live stream
+log_broadcaster = LogBroadcaster()
+# Keeps the latest records structured for filtering through /api/logs
+log_buffer = LogRingBuffer()
+
+# Configure logging: console, rotating file and live stream are written by a background thread
+setup_logging(log_broadcaster, log_buffer)
 logger = logging.getLogger(__name__)
 
 # Create Flask app
@@ -26,11 +31,18 @@ app.secret_key = os.environ.get("SESSION_SECRET", "default_secret_key")
 DISCORD_TOKEN = os.environ.get("DISCORD_TOKEN")
 logger.info("Discord token configured from environment")
 
-# Create Discord bot
-discord_bot = create_discord_bot()
+if CLUSTER_WORKERS:
+    # Shards run in separate worker processes supervised by the cluster
+    bot_monitor = Cluster(CLUSTER_WORKERS, DISCORD_TOKEN)
+else:
+    # Create Discord bot
+    discord_bot = create_discord_bot()
+    
+    # Initialize the bot monitor
+    bot_monitor = BotMonitor(discord_bot, DISCORD_TOKEN)
 
-# Initialize the bot monitor
-bot_monitor = BotMonitor(discord_bot, DISCORD_TOKEN)
+# Pushes status changes to the dashboards; samples only while one is connected
+status_publisher = StatusPublisher(bot_monitor.get_summary)
 
 # Start the bot in a separate thread
 def start_bot():
@@ -43,6 +55,9 @@ def start_bot():
     bot_thread.daemon = True
     bot_thread.start()
     logger.info("Bot monitor thread started")
+    
+    # Stop the bot cleanly when the process exits
+    atexit.register(bot_monitor.stop)
 
 # Initialize the bot on startup
 with app.app_context():
@@ -56,34 +71,72 @@ def index():
 @app.route('/api/status')
 def status():
     """API endpoint for getting bot status"""
-    status_data = {
-        'is_running': bot_monitor.is_bot_running(),
-        'uptime': bot_monitor.get_uptime(),
-        'last_restart': bot_monitor.get_last_restart_time(),
-        'restart_count': bot_monitor.get_restart_count(),
-        'server_time': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'bot_guilds': bot_monitor.get_guild_count(),
-    }
+    # Eine Form in beiden Modi: auf dem Bot-Loop erstellt bzw. aus den Workern zusammengeführt
+    status_data = bot_monitor.collect_status()
+    status_data['logging'] = log_stats()
+    status_data['server_time'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     return jsonify(status_data)
 
+@app.route('/api/status/stream')
+def status_stream():
+    """API endpoint pushing a status frame as server-sent event whenever the status changes"""
+    return Response(
+        status_publisher.stream(request.headers.get('Last-Event-ID')), mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/restart', methods=['POST'])
 def restart_bot():
     """API endpoint for manually restarting the bot"""
-    logger.info("Manual restart requested via API")
-    bot_monitor.restart_bot()
-    return jsonify({'status': 'restarting'})
+    mode = request.args.get('mode', 'hard')
+    if mode not in ('soft', 'hard'):
+        return jsonify({'error': f"Unknown restart mode '{mode}', expected 'soft' or 'hard'"}), 400
+    shard = request.args.get('shard', type=int)
+    if shard is not None:
+        logger.info(f"Manual {mode} restart of shard {shard} requested via API")
+        bot_monitor.restart_shard(shard, mode)
+        return jsonify({'status': 'restarting', 'mode': mode, 'shard': shard})
+    
+    logger.info(f"Manual {mode} restart requested via API")
+    if mode == 'soft':
+        bot_monitor.soft_restart_bot()
+    else:
+        bot_monitor.restart_bot()
+    return jsonify({'status': 'restarting', 'mode': mode})
 
 @app.route('/api/logs')
 def get_logs():
-    """API endpoint for fetching recent logs"""
+    """
+    API endpoint for fetching recent logs, or with ?cursor= only the lines written since.
+    
+    With level, logger, since, contains, guild_id, list_id or limit the
+    records in memory are filtered instead, without reading the file.
+    """
+    if any(name in request.args for name in QUERY_PARAMS):
+        records = log_buffer.query(**query_from_args(request.args))
+        return jsonify({'records': records, 'buffered': len(log_buffer)})
+    # Taken before reading, so the live stream continues without a gap
+    stream_id = log_broadcaster.last_id
     try:
-        with open('discord_bot.log', 'r') as log_file:
-            # Get the last 50 lines
-            lines = log_file.readlines()[-50:]
-            return jsonify({'logs': lines})
+        lines, cursor, reset = read_log(
+            LOG_FILE, request.args.get('cursor'), request.args.get('lines', 50, type=int)
+        )
+        return jsonify({'logs': lines, 'cursor': cursor, 'reset': reset, 'stream_id': stream_id})
     except Exception as e:
         logger.error(f"Error reading log file: {e}")
         return jsonify({'error': 'Failed to read logs', 'logs': []})
 
+@app.route('/api/logs/stream')
+def stream_logs_events():
+    """API endpoint streaming new log records as server-sent events"""
+    # Browsers send the last received ID when they reconnect on their own
+    last_id = request.headers.get('Last-Event-ID', type=int)
+    if last_id is None:
+        last_id = request.args.get('last_id', type=int)
+    return Response(
+        stream_logs(log_broadcaster, last_id), mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,60 @@
+"""
+Benchmark for the list embed renderer.
+
+Measures a full render of a fresh list and an incremental render after a
+single status change, for lists with 10, 100 and 1000 names:
+
+    python bench_render.py
+"""
+import timeit
+
+from list_renderer import render_parts
+from list_state import KATEGORIE_NAMEN, STATUS_JA, STATUS_NEIN, ListState
+
+GROESSEN = (10, 100, 1000)
+
+
+def build_state(anzahl):
+    """Build a list with ``anzahl`` names spread over all categories"""
+    state = ListState(author_id=1, user_message_id=2, guild_id=3, channel_id=4, message_id=5)
+    for i in range(anzahl):
+        state.add(f"Mitglied Nummer {i}", member_id=1000 + i, category=i % len(KATEGORIE_NAMEN))
+    return state
+
+
+def bench_full(anzahl, number):
+    """Render a list whose categories are all dirty"""
+    state = build_state(anzahl)
+
+    def run():
+        state._dirty.update(state.categories)
+        render_parts(state)
+
+    return min(timeit.repeat(run, number=number, repeat=5)) / number
+
+
+def bench_incremental(anzahl, number):
+    """Render a list after flipping the status of one name"""
+    state = build_state(anzahl)
+    render_parts(state)
+    flip = [STATUS_JA, STATUS_NEIN]
+
+    def run():
+        state.set_status(anzahl // 2, flip[0])
+        flip.reverse()
+        render_parts(state)
+
+    return min(timeit.repeat(run, number=number, repeat=5)) / number
+
+
+def main():
+    print(f"{'Namen':>6} {'voll (µs)':>12} {'inkrementell (µs)':>18} {'Faktor':>8}")
+    for anzahl in GROESSEN:
+        number = max(10, 20000 // anzahl)
+        voll = bench_full(anzahl, number) * 1e6
+        inkrementell = bench_incremental(anzahl, number) * 1e6
+        print(f"{anzahl:>6} {voll:>12.1f} {inkrementell:>18.1f} {voll / inkrementell:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
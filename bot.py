@@ -1,77 +1,516 @@
 import discord
 import logging
+from discord import app_commands
 from discord.ext import commands
 import asyncio
 import traceback
 import sys
+import os
+import atexit
+import time
+import datetime
+from collections import deque
+from member_index import LazyMemberLoader, MemberIndex
+from edit_coalescer import EditCoalescer
+from list_cache import ListCache
+from list_updates import ListUpdateQueue
+from list_store import ListStore
+from list_state import KATEGORIE_ANDERE, STATUS_BY_EMOJI, STATUS_EMOJIS, ListState
+from list_renderer import render_parts, same_part, to_embeds
+from list_view import StatusView
+from role_categories import RoleCategories
+from rest_scheduler import LANE_BULK, LANE_INTERACTIVE, LANE_NORMAL, RestScheduler
 
 logger = logging.getLogger(__name__)
 
-# Speichert die zuletzt gesendete Liste zum Bearbeiten
-message_cache = {}
-status_emojis = {"✅", "❌"}
+# Obergrenzen des Listen-Caches im Speicher (Anzahl, Bytes, Leerlaufzeit in Sekunden)
+LIST_CACHE_MAX_ENTRIES = int(os.environ.get("LIST_CACHE_MAX_ENTRIES", "1000"))
+LIST_CACHE_MAX_BYTES = int(os.environ.get("LIST_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+LIST_CACHE_TTL = float(os.environ.get("LIST_CACHE_TTL", str(6 * 3600)))
+# Gespeicherte Listen, die so viele Tage nicht geändert wurden, werden gelöscht (0 = nie)
+LIST_RETENTION_DAYS = float(os.environ.get("LIST_RETENTION_DAYS", "30"))
 
-def create_discord_bot():
-    """Factory function to create a new Discord bot instance"""
+# Speichert den Zustand der gesendeten Listen zum Bearbeiten
+message_cache = ListCache(
+    max_entries=LIST_CACHE_MAX_ENTRIES,
+    max_bytes=LIST_CACHE_MAX_BYTES,
+    ttl=LIST_CACHE_TTL,
+    retention=LIST_RETENTION_DAYS * 86400
+)
+
+# Zeitfenster (Sekunden), in dem Statusänderungen zu einer Bearbeitung zusammengefasst werden
+LIST_EDIT_WINDOW = float(os.environ.get("LIST_EDIT_WINDOW", "1.0"))
+LIST_EDIT_MAX_DELAY = float(os.environ.get("LIST_EDIT_MAX_DELAY", "3.0"))
+
+# "reactions": Status über ✅/❌-Reaktionen, "buttons": über Schaltflächen unter der Liste
+LIST_BUTTONS = os.environ.get("LIST_MODE", "reactions") == "buttons"
+
+# "fields": ein Feld pro Name, "compact": Namen zeilenweise in wenigen Feldern (für große Listen)
+LIST_COMPACT = os.environ.get("LIST_RENDER", "fields") == "compact"
+
+# SQLite-Datei, in der die Listen über Neustarts hinweg gespeichert werden
+LIST_STORE_PATH = os.environ.get("LIST_STORE_PATH", "lists.db")
+
+# Sharding: leer = eine einzelne Gateway-Verbindung, "auto" = von Discord empfohlene Anzahl
+SHARD_COUNT = os.environ.get("SHARD_COUNT", "")
+# Nur diese Shards in diesem Prozess starten, z.B. "0-3" oder "0,2,4" (benötigt SHARD_COUNT)
+SHARD_IDS = os.environ.get("SHARD_IDS", "")
+
+# Präfix-Befehle wie !liste; mit "0" gibt es nur /liste und der Bot braucht weder
+# den Message-Content-Intent noch Nachrichtenereignisse
+PREFIX_COMMANDS = os.environ.get("PREFIX_COMMANDS", "1") == "1"
+
+# Mitglieder erst bei Bedarf abfragen, statt beim Start alle Server vollständig zu laden
+LAZY_MEMBERS = os.environ.get("LAZY_MEMBERS", "0") == "1"
+
+# Index von Anzeige-/Benutzernamen auf Mitglieder pro Server
+member_index = MemberIndex()
+
+# Lädt im Lazy-Modus die Mitglieder, deren Namen in einer Liste stehen
+member_loader = LazyMemberLoader(member_index)
+
+# Zwischengespeicherte Rollenkategorien der Mitglieder pro Server
+role_categories = RoleCategories()
+
+def resolve_name(guild, name):
+    """Resolve a listed name to ``(member_id, category)`` for the list state"""
+    member = member_index.resolve(guild, name)
+    if member is None:
+        # Kein passendes Mitglied gefunden
+        return None, KATEGORIE_ANDERE
+    return member.id, role_categories.category(member)
+
+def log_ids(state):
+    """Return the logging ``extra`` that tags a record with the guild and list of a state"""
+    return {'guild_id': state.guild_id, 'list_id': state.message_id}
+
+def list_message(bot, state, message_id=None):
+    """Return a handle for editing the list message (or a follow-up message) of a state"""
+    # Jeder Listenzustand kennt seinen Kanal: Teilnachricht aus den gespeicherten IDs, ohne REST-Aufruf
+    messageable = bot.get_partial_messageable(state.channel_id, guild_id=state.guild_id)
+    return messageable.get_partial_message(message_id or state.message_id)
+
+def parse_shard_ids(text):
+    """Parse a shard selection like "0-3" or "0,2,4" into a sorted list of IDs"""
+    shard_ids = set()
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            shard_ids.update(range(int(first), int(last) + 1))
+        else:
+            shard_ids.add(int(part))
+    return sorted(shard_ids)
+
+def create_discord_bot(shard_count=None, shard_ids=None):
+    """
+    Factory function to create a new Discord bot instance.
+    
+    Without a shard count the bot uses a single gateway connection. With
+    ``shard_count`` ("auto" or a number, default ``SHARD_COUNT``) and
+    optionally ``shard_ids`` (default ``SHARD_IDS``) an auto-sharded bot is
+    created that runs the selected shards.
+    """
+    if shard_count is None:
+        shard_count = SHARD_COUNT
+    if shard_ids is None:
+        shard_ids = parse_shard_ids(SHARD_IDS)
     
     # Create a bot instance with command prefix '!'
     intents = discord.Intents.default()
-    intents.message_content = True  # Required to receive message content
+    intents.message_content = PREFIX_COMMANDS  # Required to receive message content
     intents.reactions = True  # Required for reaction handling
-    intents.messages = True   # Required for message events
+    intents.messages = PREFIX_COMMANDS   # Required for message events
     intents.members = True    # Required for member access 
     
-    bot = commands.Bot(command_prefix='!', intents=intents)
+    # Ohne Präfix-Befehle empfängt der Bot keine Nachrichten mehr und ist nur über Slash-Befehle erreichbar
+    # Im Lazy-Modus werden die Mitgliederlisten nicht beim Verbinden abgerufen
+    options = dict(command_prefix='!', intents=intents, chunk_guilds_at_startup=not LAZY_MEMBERS)
+    
+    if shard_count or shard_ids:
+        if shard_count and shard_count != "auto":
+            options['shard_count'] = int(shard_count)
+        if shard_ids:
+            options['shard_ids'] = list(shard_ids)
+        bot = commands.AutoShardedBot(**options)
+        logger.info(f"Sharded mode: shard_count={shard_count}, shard_ids={shard_ids or 'all'}")
+    else:
+        bot = commands.Bot(**options)
+    
+    bot.member_loader = member_loader if LAZY_MEMBERS else None
+    # Zeit vom Start bis on_ready, gesetzt von run_bot
+    bot.start_requested = None
+    bot.time_to_ready = None
+    
+    # Alle ausgehenden REST-Aufrufe laufen über den Scheduler
+    bot.rest = RestScheduler()
+    
+    async def reply(ctx, lane=LANE_NORMAL, **kwargs):
+        """Send a message to the context's channel through the REST scheduler"""
+        return await bot.rest.submit(lane, ("send_message", ctx.channel.id), lambda: ctx.send(**kwargs))
+    
+    bot.list_cache = message_cache
+    
+    # Persistente Ablage der Listen, damit sie Neustarts überstehen
+    if message_cache.store is None and LIST_STORE_PATH:
+        list_store = ListStore(LIST_STORE_PATH)
+        list_store.start()
+        atexit.register(list_store.close)
+        message_cache.attach_store(list_store)
+    
+    bot.status_view = None
+    bot.commands_synced = False
+    
+    @bot.event
+    async def setup_hook():
+        """Load the IDs of the stored lists and register the list buttons before connecting"""
+        if message_cache.store is not None and not message_cache.index_loaded:
+            await asyncio.get_running_loop().run_in_executor(None, message_cache.load_index)
+            logger.info(f"Loaded index of {len(message_cache.user_messages)} stored lists")
+        # Die Schaltflächen aller Listen bleiben auch nach einem Neustart bedienbar
+        bot.status_view = StatusView(status_button)
+        bot.add_view(bot.status_view)
+        
+        # Slash-Befehle einmal pro Prozess registrieren, bei mehreren Prozessen nur mit Shard 0
+        if not bot.commands_synced and 0 in (getattr(bot, 'shard_ids', None) or [0]):
+            try:
+                synced = await bot.tree.sync()
+                bot.commands_synced = True
+                logger.info(f"Synced {len(synced)} application commands")
+            except discord.HTTPException as e:
+                logger.error(f"Error syncing application commands: {e}")
+    
+    async def add_reactions(message, channel_id):
+        """Add the status reactions to a list message"""
+        for emoji in ("✅", "❌"):
+            # Reaktionen sind Massenarbeit und dürfen Statusänderungen nicht aufhalten
+            await bot.rest.submit(
+                LANE_BULK, ("add_reaction", channel_id),
+                lambda emoji=emoji: message.add_reaction(emoji)
+            )
+    
+    async def delete_message(channel_id, guild_id, message_id):
+        """Delete a message of a list that is no longer needed"""
+        messageable = bot.get_partial_messageable(channel_id, guild_id=guild_id)
+        message = messageable.get_partial_message(message_id)
+        try:
+            await bot.rest.submit(LANE_BULK, ("delete_message", channel_id), message.delete)
+        except discord.NotFound:
+            pass
+    
+    async def send_part(state, part):
+        """Send a follow-up message of a large list and register it"""
+        messageable = bot.get_partial_messageable(state.channel_id, guild_id=state.guild_id)
+        kwargs = {'embeds': to_embeds(part)}
+        if LIST_BUTTONS:
+            kwargs['view'] = bot.status_view
+        message = await bot.rest.submit(
+            LANE_NORMAL, ("send_message", state.channel_id),
+            lambda: messageable.send(**kwargs)
+        )
+        message_cache.add_part(state, message.id)
+        if not LIST_BUTTONS:
+            await add_reactions(message, state.channel_id)
+    
+    def forget_part(state, part_id):
+        """Unregister a deleted follow-up message; the later parts move up"""
+        index = state.message_ids().index(part_id)
+        message_cache.remove_part(state, part_id)
+        for teil in [teil for teil in state.sent_parts if teil >= index]:
+            del state.sent_parts[teil]
+    
+    async def sync_parts(state, parts):
+        """
+        Bring the messages of a list in line with its rendered parts.
+        
+        Only parts that differ from what was last sent are edited, missing
+        parts are sent as new messages and surplus ones deleted.
+        """
+        part_ids = list(state.part_ids)
+        index = 0
+        while index < len(parts):
+            ids = state.message_ids()
+            part = parts[index]
+            if index >= len(ids):
+                await send_part(state, part)
+            elif not same_part(state.sent_parts.get(index), part):
+                message = list_message(bot, state, message_id=ids[index])
+                try:
+                    await bot.rest.submit(
+                        LANE_INTERACTIVE, ("edit_message", state.channel_id),
+                        lambda: message.edit(embeds=to_embeds(part))
+                    )
+                except discord.NotFound:
+                    if index == 0:
+                        raise
+                    # Gelöschte Folgenachricht: die späteren Teile rücken nach
+                    forget_part(state, ids[index])
+                    continue
+            state.sent_parts[index] = part
+            index += 1
+        
+        # Die Liste ist kürzer geworden: überzählige Folgenachrichten löschen
+        for part_id in state.part_ids[len(parts) - 1:]:
+            forget_part(state, part_id)
+            await delete_message(state.channel_id, state.guild_id, part_id)
+        
+        if state.part_ids != part_ids:
+            message_cache.save(state)
+    
+    async def flush_list(message_id):
+        """Render the latest state of a list into its messages"""
+        state = await message_cache.fetch(message_id)
+        if state is None:
+            return
+        try:
+            await sync_parts(state, render_parts(state, LIST_COMPACT))
+        except discord.NotFound:
+            # Ohne Nachrichtenereignisse bemerken wir gelöschte Listen erst hier
+            part_ids = list(state.part_ids)
+            message_cache.remove(message_id)
+            logger.info(f"Dienstübersicht {message_id} existiert nicht mehr", extra=log_ids(state))
+            for part_id in part_ids:
+                await delete_message(state.channel_id, state.guild_id, part_id)
+    
+    # Fasst Bearbeitungen derselben Liste zusammen
+    bot.edit_coalescer = EditCoalescer(flush_list, LIST_EDIT_WINDOW, LIST_EDIT_MAX_DELAY)
+    
+    def list_changed(state, changes):
+        """Persist a changed list and schedule the edit of its message"""
+        message_cache.save(state)
+        # Die Nachricht wird gebündelt mit dem neuesten Stand aktualisiert
+        bot.edit_coalescer.request(state.message_id, changes)
+    
+    # Wendet die Änderungen jeder Liste der Reihe nach an
+    bot.list_updates = ListUpdateQueue(message_cache.fetch, list_changed)
+    
+    def status_update(member, status):
+        """Build the list update that sets the status of a member's entry"""
+        def status_setzen(state):
+            """Nur der Eintrag des Mitglieds wird geändert"""
+            index = state.find(member)
+            if index is None or not state.set_status(index, status):
+                return False
+            logger.info(
+                f"Status für {state.entries[index].name} geändert zu {STATUS_EMOJIS[status]}", extra=log_ids(state)
+            )
+            return True
+        return status_setzen
+    
+    async def status_button(interaction, status):
+        """Apply a status button and show the list in the interaction response"""
+        # Die Schaltflächen großer Listen hängen auch an deren Folgenachrichten
+        list_id = message_cache.list_id(interaction.message.id) or interaction.message.id
+        state = await bot.list_updates.apply(list_id, status_update(interaction.user, status))
+        if state is None:
+            await interaction.response.send_message("Diese Liste ist nicht mehr verfügbar.", ephemeral=True)
+            return
+        if state.find(interaction.user) is None:
+            await interaction.response.send_message("Du stehst nicht auf dieser Liste.", ephemeral=True)
+            return
+        
+        parts = render_parts(state, LIST_COMPACT)
+        ids = state.message_ids()
+        index = ids.index(interaction.message.id) if interaction.message.id in ids else None
+        if index is None or index >= len(parts):
+            # Veraltete Folgenachricht: die gebündelte Bearbeitung räumt sie auf
+            await interaction.response.defer()
+            return
+        
+        # Die Antwort zeigt den neuesten Stand dieses Teils; nur wenn alle anderen
+        # Teile unverändert sind, ist eine gebündelte Bearbeitung überflüssig
+        if len(parts) == len(ids) and all(
+            same_part(state.sent_parts.get(teil), part) for teil, part in enumerate(parts) if teil != index
+        ):
+            bot.edit_coalescer.settle(list_id)
+        state.sent_parts[index] = parts[index]
+        try:
+            await interaction.response.edit_message(embeds=to_embeds(parts[index]))
+        except discord.HTTPException as e:
+            logger.error(f"Error answering status button of list {list_id}: {e}", extra=log_ids(state))
+            state.sent_parts.pop(index, None)
+            bot.edit_coalescer.request(list_id, 0)
+    
+    # Verlauf der Neustarts mit gemessener Ausfallzeit
+    bot.restart_log = deque(maxlen=20)
+    bot.restart_pending = None
     
     @bot.event
     async def on_ready():
         """Event that triggers when the bot is connected and ready"""
         logger.info(f'Bot connected as {bot.user.name} (ID: {bot.user.id})')
         logger.info(f'Connected to {len(bot.guilds)} guilds')
+        if bot.start_requested is not None:
+            bot.time_to_ready = round(time.monotonic() - bot.start_requested, 2)
+            bot.start_requested = None
+            logger.info(f'Ready {bot.time_to_ready}s after start (lazy members: {LAZY_MEMBERS})')
+        finish_restart(bot, "identify")
         
         # Set bot activity status
         await bot.change_presence(activity=discord.Activity(
             type=discord.ActivityType.watching, 
-            name="Teilnehmerlisten | !liste"
+            name="Teilnehmerlisten | !liste" if PREFIX_COMMANDS else "Teilnehmerlisten | /liste"
         ))
     
+    @bot.event
+    async def on_resumed():
+        """Event that triggers when the gateway session has been resumed"""
+        logger.info('Gateway session resumed')
+        finish_restart(bot, "resume")
+    
     @bot.event
     async def on_guild_join(guild):
         """Event that triggers when the bot joins a new server"""
-        logger.info(f'Bot joined new guild: {guild.name} (ID: {guild.id})')
+        logger.info(f'Bot joined new guild: {guild.name} (ID: {guild.id})', extra={'guild_id': guild.id})
+        member_index.build(guild)
+    
+    @bot.event
+    async def on_guild_available(guild):
+        """Event that triggers when a guild becomes ready"""
+        member_index.build(guild)
+    
+    @bot.event
+    async def on_guild_remove(guild):
+        """Event that triggers when the bot leaves or loses a server"""
+        member_index.drop_guild(guild.id)
+        role_categories.invalidate_guild(guild.id)
+    
+    @bot.event
+    async def on_member_join(member):
+        """Event that triggers when a member joins a server"""
+        member_index.add_member(member)
+        if LAZY_MEMBERS:
+            member_loader.forget_misses(member.guild.id)
+    
+    @bot.event
+    async def on_member_update(before, after):
+        """Event that triggers when a member's nickname or roles change"""
+        member_index.add_member(after)
+        if before.roles != after.roles:
+            role_categories.invalidate_member(after.guild.id, after.id)
+    
+    @bot.event
+    async def on_user_update(before, after):
+        """Event that triggers when a user's username or global name changes"""
+        for guild in bot.guilds:
+            member = guild.get_member(after.id)
+            if member:
+                member_index.add_member(member)
+    
+    @bot.event
+    async def on_raw_member_remove(payload):
+        """Event that triggers when a member leaves a server"""
+        member_index.remove_member(payload.guild_id, payload.user.id)
+        role_categories.invalidate_member(payload.guild_id, payload.user.id)
+    
+    @bot.event
+    async def on_guild_role_create(role):
+        """Event that triggers when a role is created"""
+        role_categories.invalidate_guild(role.guild.id)
+    
+    @bot.event
+    async def on_guild_role_update(before, after):
+        """Event that triggers when a role is renamed or changed"""
+        if before.name != after.name:
+            role_categories.invalidate_guild(after.guild.id)
+    
+    @bot.event
+    async def on_guild_role_delete(role):
+        """Event that triggers when a role is deleted"""
+        role_categories.invalidate_guild(role.guild.id)
     
     @bot.event
     async def on_command_error(ctx, error):
         """Event that triggers when a command raises an error"""
         if isinstance(error, commands.CommandNotFound):
-            await ctx.send("Befehl nicht gefunden. Nutze `!help` um verfügbare Befehle zu sehen.")
+            await reply(ctx, content="Befehl nicht gefunden. Nutze `!help` um verfügbare Befehle zu sehen.")
         elif isinstance(error, commands.MissingRequiredArgument):
-            await ctx.send(f"Fehlendes Argument: {error.param}")
+            await reply(ctx, content=f"Fehlendes Argument: {error.param}")
         elif isinstance(error, commands.BadArgument):
-            await ctx.send(f"Ungültiges Argument: {error}")
+            await reply(ctx, content=f"Ungültiges Argument: {error}")
         else:
             error_traceback = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
             logger.error(f'Command error: {error_traceback}')
-            await ctx.send("Bei der Ausführung des Befehls ist ein Fehler aufgetreten.")
+            await reply(ctx, content="Bei der Ausführung des Befehls ist ein Fehler aufgetreten.")
+    
+    def status_embed():
+        """Build the embed shown by !status and /status"""
+        embed = discord.Embed(
+            title="Bot Status",
+            color=discord.Color.green(),
+            description="Bot ist aktiv und funktioniert."
+        )
+        embed.add_field(name="Latenz", value=f"{round(bot.latency * 1000)}ms")
+        embed.add_field(name="Server", value=str(len(bot.guilds)))
+        embed.add_field(name="API Version", value=discord.__version__)
+        return embed
     
     @bot.command(name="ping")
     async def ping(ctx):
         """Simple command to check if the bot is responsive"""
         latency = round(bot.latency * 1000)
-        await ctx.send(f"Pong! Latenz: {latency}ms")
+        await reply(ctx, content=f"Pong! Latenz: {latency}ms")
     
     @bot.command(name="status")
     async def status(ctx):
         """Command to show bot status information"""
-        embed = discord.Embed(
-            title="Bot Status",
-            color=discord.Color.green(),
-            description="Bot ist aktiv und funktioniert."
+        await reply(ctx, embed=status_embed())
+    
+    # Slash-Varianten, damit der Bot auch mit PREFIX_COMMANDS=0 erreichbar bleibt
+    @bot.tree.command(name="ping", description="Prüft, ob der Bot reagiert")
+    async def ping_slash(interaction):
+        """Slash-Variante von !ping"""
+        latency = round(bot.latency * 1000)
+        await interaction.response.send_message(f"Pong! Latenz: {latency}ms")
+    
+    @bot.tree.command(name="status", description="Zeigt den Status des Bots")
+    async def status_slash(interaction):
+        """Slash-Variante von !status"""
+        await interaction.response.send_message(embed=status_embed())
+    
+    async def create_list(guild, channel, author, namen, send, user_message_id=None):
+        """Resolve the names, send the list with ``send(**kwargs)`` and register it"""
+        # Baue den Listenzustand auf, aus dem das Embed gerendert wird
+        state = ListState(
+            author_id=author.id,
+            user_message_id=user_message_id,  # Speichere die ursprüngliche Nachricht-ID
+            guild_id=guild.id,
+            channel_id=channel.id
         )
-        embed.add_field(name="Latenz", value=f"{round(bot.latency * 1000)}ms")
-        embed.add_field(name="Server", value=str(len(bot.guilds)))
-        embed.add_field(name="API Version", value=discord.__version__)
-        await ctx.send(embed=embed)
+        
+        if LAZY_MEMBERS:
+            # Nur die genannten Mitglieder vom Gateway abfragen
+            await member_loader.prefetch(guild, namen)
+        
+        for name in namen:
+            # Suche nach Mitgliedern im Server, die den genannten Namen entsprechen
+            state.add(name, *resolve_name(guild, name))
+        
+        # Große Listen werden auf mehrere Nachrichten innerhalb der Discord-Grenzen verteilt
+        parts = render_parts(state, LIST_COMPACT)
+        
+        # Sende die erste Nachricht, im Schaltflächen-Modus mit ✅/❌-Schaltflächen
+        if LIST_BUTTONS:
+            message = await send(embeds=to_embeds(parts[0]), view=bot.status_view)
+        else:
+            message = await send(embeds=to_embeds(parts[0]))
+
+        # Speichere den Zustand der Liste, bevor die ersten Reaktionen eintreffen
+        state.message_id = message.id
+        state.sent_parts[0] = parts[0]
+        message_cache.add(state)
+        
+        if len(parts) > 1:
+            # Folgenachrichten über den Coalescer senden, damit keine Bearbeitung dazwischenkommt
+            bot.edit_coalescer.request(state.message_id, 0)
+            await bot.edit_coalescer.flush(state.message_id)
+
+        if not LIST_BUTTONS:
+            await add_reactions(message, channel.id)
+
+        logger.info(f"Neue Dienstübersicht erstellt von {author.name} mit {len(namen)} Namen", extra=log_ids(state))
     
     @bot.command()
     async def liste(ctx, *, text=""):
@@ -80,152 +519,70 @@ def create_discord_bot():
         namen = [name.strip() for name in text.split(",") if name.strip()]
         
         if not namen:
-            await ctx.send("Bitte gib mindestens einen Namen an! Beispiel: `!liste Felix Westfield, Mirella Sterling, John Paul Jones`")
+            await reply(ctx, content="Bitte gib mindestens einen Namen an! Beispiel: `!liste Felix Westfield, Mirella Sterling, John Paul Jones`")
             return
         
-        # Erstelle ein Embed für die Dienstübersicht
-        embed = discord.Embed(
-            title="Dienstübersicht",
-            description="Reagiere mit ✅ oder ❌ um deinen Status zu ändern",
-            color=discord.Color.blue()
+        await create_list(
+            ctx.guild, ctx.channel, ctx.author, namen,
+            lambda **kwargs: reply(ctx, **kwargs),
+            user_message_id=ctx.message.id
         )
+    
+    @bot.tree.command(name="liste", description="Erstellt eine Dienstübersicht mit Status hinter jedem Namen")
+    @app_commands.describe(namen="Namen, durch Kommas getrennt")
+    @app_commands.guild_only()
+    async def liste_slash(interaction, namen: str):
+        """Slash-Variante von !liste; antwortet sofort verzögert und löst die Namen danach auf"""
+        await interaction.response.defer(thinking=True)
         
-        # Definiere die Rollenreihenfolge
-        rollen_reihenfolge = ["Chefarzt", "Praxisleitung", "Arzt", "Ausbildung", "Praktikant"]
-        
-        # Initialisiere ein Dictionary für die Kategorisierung nach Rollen
-        rollen_kategorien = {rolle: [] for rolle in rollen_reihenfolge}
-        andere_kategorie = []  # Für Mitglieder ohne spezifische Rolle
-        
-        # Suche nach Mitgliedern im Server, die den genannten Namen entsprechen
-        guild = ctx.guild
-        status_list = []
-        
-        for name in namen:
-            # Versuche den Benutzer zu finden (nach Nickname oder Username)
-            member = None
-            for m in guild.members:
-                if m.display_name.lower() == name.lower() or m.name.lower() == name.lower():
-                    member = m
-                    break
-            
-            if member:
-                # Bestimme die höchste Rolle des Mitglieds aus unserer Reihenfolge
-                member_rolle = None
-                for rolle in rollen_reihenfolge:
-                    if any(r.name == rolle for r in member.roles):
-                        member_rolle = rolle
-                        break
-                
-                # Nutze die Hauptrolle des Mitglieds für die Farbe
-                role_color = member.color.value if member.color.value != 0 else None
-                
-                # Füge das Mitglied zur entsprechenden Kategorie hinzu
-                member_info = {
-                    "name": name, 
-                    "member_id": member.id, 
-                    "color": role_color,
-                    "status": "❌"
-                }
-                status_list.append(member_info)
-                
-                if member_rolle:
-                    rollen_kategorien[member_rolle].append(member_info)
-                else:
-                    andere_kategorie.append(member_info)
-            else:
-                # Kein passendes Mitglied gefunden
-                member_info = {
-                    "name": name, 
-                    "member_id": None, 
-                    "color": None,
-                    "status": "❌"
-                }
-                status_list.append(member_info)
-                andere_kategorie.append(member_info)
-        
-        # Füge die Namen nach Kategorien sortiert hinzu
-        for rolle in rollen_reihenfolge:
-            mitglieder = rollen_kategorien[rolle]
-            if mitglieder:
-                # Füge eine Überschrift für die Rollenkategorie hinzu
-                embed.add_field(
-                    name=f"__**{rolle}**__",
-                    value="\u200b",  # Zero-width space als Platzhalter
-                    inline=False
-                )
-                
-                # Füge die Mitglieder dieser Kategorie hinzu
-                for member_info in mitglieder:
-                    name = member_info["name"]
-                    status = member_info["status"]
-                    embed.add_field(
-                        name=f"{name} {status}",
-                        value="\u200b",  # Zero-width space als Platzhalter
-                        inline=True
-                    )
+        namen_liste = [name.strip() for name in namen.split(",") if name.strip()]
+        if not namen_liste:
+            await interaction.followup.send("Bitte gib mindestens einen Namen an! Beispiel: `/liste Felix Westfield, Mirella Sterling`")
+            return
         
-        # Füge Mitglieder ohne spezifische Rolle hinzu
-        if andere_kategorie:
-            embed.add_field(
-                name="__**Andere**__",
-                value="\u200b",  # Zero-width space als Platzhalter
-                inline=False
+        # Die erste Folgenachricht ersetzt die „denkt nach …“-Antwort
+        try:
+            await create_list(
+                interaction.guild, interaction.channel, interaction.user, namen_liste,
+                lambda **kwargs: interaction.followup.send(wait=True, **kwargs)
             )
-            
-            for member_info in andere_kategorie:
-                name = member_info["name"]
-                status = member_info["status"]
-                embed.add_field(
-                    name=f"{name} {status}",
-                    value="\u200b",  # Zero-width space als Platzhalter
-                    inline=True
-                )
-        
-        # Sende die Embed-Nachricht
-        message = await ctx.send(embed=embed)
-        await message.add_reaction("✅")
-        await message.add_reaction("❌")
-
-        # Speichere die Nachricht und die Namen
-        message_cache[message.id] = {
-            "author_id": ctx.author.id,
-            "user_message_id": ctx.message.id,  # Speichere die ursprüngliche Nachricht-ID
-            "names": namen,
-            "status_list": status_list,  # Speichere die Liste mit Farben
-            "rollen_kategorien": rollen_kategorien,
-            "andere_kategorie": andere_kategorie
-        }
-        logger.info(f"Neue Dienstübersicht erstellt von {ctx.author.name} mit {len(namen)} Namen")
+        except Exception as error:
+            # Nach defer() bleibt die Antwort sonst bis zum Ablauf der Interaktion bei „denkt nach …“
+            error_traceback = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+            logger.error(f'Slash command error: {error_traceback}', extra={'guild_id': interaction.guild_id})
+            await interaction.followup.send("Bei der Ausführung des Befehls ist ein Fehler aufgetreten.", ephemeral=True)
 
+    # Liste -> Marke der neuesten Bearbeitung, die noch auf Mitgliederabfragen wartet
+    neueste_bearbeitung = {}
+    
     @bot.event
-    async def on_message_edit(before, after):
-        """Event, der ausgelöst wird, wenn eine Nachricht bearbeitet wurde"""
+    async def on_raw_message_edit(payload):
+        """Event, der ausgelöst wird, wenn eine Nachricht bearbeitet wurde, auch wenn sie nicht im Nachrichtencache liegt"""
         # Wir müssen prüfen, ob diese Benutzer-Nachricht mit einer Bot-Liste verbunden ist
-        # Durchsuche den Cache nach der Benutzer-Nachricht-ID
-        bot_message_id = None
-        for msg_id, data in message_cache.items():
-            if data.get("user_message_id") == before.id:
-                bot_message_id = msg_id
-                break
-                
-        if not bot_message_id:
+        # (der Index wird gespeichert und gilt auch nach einem Neustart)
+        list_id = message_cache.user_messages.get(payload.message_id)
+        if list_id is None:
+            return
+        
+        # Nur Änderungen des Inhalts zählen, nicht z.B. nachgeladene Link-Vorschauen
+        author = payload.data.get('author')
+        befehl_text = payload.data.get('content')
+        if author is None or befehl_text is None:
             return
         
         # Ignoriere Nachrichten, die vom Bot stammen (um Endlosschleifen zu vermeiden)
-        if before.author.id == bot.user.id:
+        if int(author['id']) == bot.user.id:
             return
         
-        # Die Nachricht kommt vom Benutzer und ist mit einer Liste verknüpft
-        logger.info(f"Liste bearbeitet von {before.author.name}")
+        guild = bot.get_guild(payload.guild_id) if payload.guild_id else None
+        if guild is None:
+            return
         
-        # Finde die Bot-Nachricht (die Teilnehmerliste)
-        channel = before.channel
-        bot_message = await channel.fetch_message(bot_message_id)
+        # Die Nachricht kommt vom Benutzer und ist mit einer Liste verknüpft
+        logger.info(f"Liste bearbeitet von {author.get('username')}", extra={'guild_id': guild.id, 'list_id': list_id})
         
         # Analysiere den neuen Inhalt der Benutzernachricht
         # Entferne den Befehl "!liste" und teile nach Kommas
-        befehl_text = after.content
         if befehl_text.startswith("!liste"):
             befehl_text = befehl_text[6:].strip()
             
@@ -235,261 +592,29 @@ def create_discord_bot():
         if not neue_namen:
             return
         
-        # Prüfe, ob die Nachricht ein Embed ist
-        if bot_message.embeds:
-            # Wir haben ein Embed-Format
-            embed = bot_message.embeds[0]
-            
-            # Definiere die Rollenreihenfolge
-            rollen_reihenfolge = ["Chefarzt", "Praxisleitung", "Arzt", "Ausbildung", "Praktikant"]
-            
-            # Prüfe, ob wir das neue kategorisierte Format haben
-            is_categorized = any(field.name.startswith("__**") and field.name.endswith("**__") for field in embed.fields)
-            
-            if is_categorized:
-                # Wir haben das kategorisierte Format
-                # Sammle alle Namen und deren Status/Kategorie
-                all_entries = []
-                category = None
-                
-                for field in embed.fields:
-                    if field.name.startswith("__**") and field.name.endswith("**__"):
-                        # Das ist eine Kategorie-Überschrift
-                        category = field.name.strip("_*")
-                    elif field.value == "\u200b":  # Zero-width space
-                        # Das ist ein Mitglied
-                        name = field.name
-                        
-                        # Extrahiere Name und Status
-                        if " " in name and name.split(" ")[-1] in status_emojis:
-                            name_parts = name.split(" ")
-                            status = name_parts[-1]
-                            name_without_status = " ".join(name_parts[:-1])
-                        else:
-                            name_without_status = name
-                            status = "❌"  # Standard-Status, falls keiner vorhanden
-                        
-                        all_entries.append({
-                            'name': name_without_status,
-                            'status': status,
-                            'category': category,
-                            'inline': field.inline
-                        })
-                
-                # Extrahiere alle Namen ohne Status
-                bestehende_namen = [entry['name'] for entry in all_entries]
-                
-                # Finde Namen, die hinzugefügt werden sollen
-                hinzugefuegte_namen = [name for name in neue_namen if name not in bestehende_namen]
-                
-                # Finde Namen, die entfernt werden sollen
-                entfernte_namen = [name for name in bestehende_namen if name not in neue_namen]
-                
-                if not hinzugefuegte_namen and not entfernte_namen:
-                    # Keine Änderungen notwendig
-                    return
-                
-                # Entferne die zu entfernenden Namen aus der Liste
-                all_entries = [entry for entry in all_entries if entry['name'] not in entfernte_namen]
-                
-                # Füge neue Namen hinzu
-                guild = channel.guild
-                
-                for name in hinzugefuegte_namen:
-                    # Versuche den Benutzer zu finden
-                    member = None
-                    for m in guild.members:
-                        if m.display_name.lower() == name.lower() or m.name.lower() == name.lower():
-                            member = m
-                            break
-                    
-                    if member:
-                        # Bestimme die höchste Rolle des Mitglieds aus unserer Reihenfolge
-                        member_rolle = None
-                        for rolle in rollen_reihenfolge:
-                            if any(r.name == rolle for r in member.roles):
-                                member_rolle = rolle
-                                break
-                        
-                        all_entries.append({
-                            'name': name,
-                            'status': "❌",
-                            'category': member_rolle or "Andere",
-                            'inline': True
-                        })
-                    else:
-                        # Kein passendes Mitglied gefunden
-                        all_entries.append({
-                            'name': name,
-                            'status': "❌",
-                            'category': "Andere",
-                            'inline': True
-                        })
-                
-                # Erstelle ein neues Embed mit den aktualisierten Einträgen
-                new_embed = discord.Embed(
-                    title=embed.title,
-                    description=embed.description,
-                    color=embed.color
-                )
-                
-                # Gruppiere Einträge nach Kategorie
-                entries_by_category = {}
-                for entry in all_entries:
-                    category = entry['category']
-                    if category not in entries_by_category:
-                        entries_by_category[category] = []
-                    entries_by_category[category].append(entry)
-                
-                # Füge Kategorien und Einträge hinzu
-                # Zunächst die definierten Rollen in der richtigen Reihenfolge
-                for rolle in rollen_reihenfolge:
-                    if rolle in entries_by_category and entries_by_category[rolle]:
-                        # Füge die Kategorie-Überschrift hinzu
-                        new_embed.add_field(
-                            name=f"__**{rolle}**__",
-                            value="\u200b",  # Zero-width space als Platzhalter
-                            inline=False
-                        )
-                        
-                        # Füge alle Einträge dieser Kategorie hinzu
-                        for entry in entries_by_category[rolle]:
-                            new_embed.add_field(
-                                name=f"{entry['name']} {entry['status']}",
-                                value="\u200b",  # Zero-width space als Platzhalter
-                                inline=entry['inline']
-                            )
-                
-                # Dann alle anderen Kategorien
-                for category, entries in entries_by_category.items():
-                    if category not in rollen_reihenfolge and entries:
-                        # Füge die Kategorie-Überschrift hinzu
-                        new_embed.add_field(
-                            name=f"__**{category}**__",
-                            value="\u200b",  # Zero-width space als Platzhalter
-                            inline=False
-                        )
-                        
-                        # Füge alle Einträge dieser Kategorie hinzu
-                        for entry in entries:
-                            new_embed.add_field(
-                                name=f"{entry['name']} {entry['status']}",
-                                value="\u200b",  # Zero-width space als Platzhalter
-                                inline=entry['inline']
-                            )
-            else:
-                # Wir haben das alte Format (ohne Kategorien)
-                
-                # Bestehende Namen und ihre Status aus den Embed-Feldern extrahieren
-                bestehende_namen = []
-                for field in embed.fields:
-                    bestehende_namen.append(field.name)
-                    
-                # Finde Namen, die hinzugefügt werden sollen
-                hinzugefuegte_namen = [name for name in neue_namen if name not in bestehende_namen]
-                
-                # Finde Namen, die entfernt werden sollen
-                entfernte_namen = [name for name in bestehende_namen if name not in neue_namen]
-                
-                if not hinzugefuegte_namen and not entfernte_namen:
-                    # Keine Änderungen notwendig
-                    return
-                    
-                # Erstelle ein neues Embed mit aktualisierten Feldern
-                new_embed = discord.Embed(
-                    title=embed.title,
-                    description=embed.description,
-                    color=embed.color
-                )
-                
-                # Behalte nur die Felder, die nicht entfernt werden sollen
-                for field in embed.fields:
-                    if field.name not in entfernte_namen:
-                        new_embed.add_field(name=field.name, value=field.value, inline=field.inline)
-                
-                # Füge neue Namen hinzu und suche nach passenden Mitgliedern für Rollenfarben
-                guild = channel.guild
-                for name in hinzugefuegte_namen:
-                    # Versuche den Benutzer zu finden
-                    member = None
-                    for m in guild.members:
-                        if m.display_name.lower() == name.lower() or m.name.lower() == name.lower():
-                            member = m
-                            break
-                    
-                    if member:
-                        # Mit Rollenfarbe
-                        role_color = member.color.value if member.color.value != 0 else None
-                        new_embed.add_field(
-                            name=name,
-                            value="❌ Status",
-                            inline=False
-                        )
-                    else:
-                        # Ohne Rollenfarbe
-                        new_embed.add_field(
-                            name=name,
-                            value="❌ Status",
-                            inline=False
-                        )
-            
-            # Aktualisiere den Cache mit aktuellen Namen
-            alle_namen = [name for name in bestehende_namen if name not in entfernte_namen] + hinzugefuegte_namen
-            message_cache[bot_message_id]["names"] = alle_namen
-            
-            # Aktualisiere die Bot-Nachricht
-            await bot_message.edit(embed=new_embed)
-            
-            log_message = []
-            if hinzugefuegte_namen:
-                log_message.append(f"Hinzugefügt: {', '.join(hinzugefuegte_namen)}")
-            if entfernte_namen:
-                log_message.append(f"Entfernt: {', '.join(entfernte_namen)}")
-                
-            logger.info(f"Liste aktualisiert (Embed) - {' | '.join(log_message)}")
-            
-        else:
-            # Fallback für das alte Text-Format
-            # Bestehende Namen aus der Bot-Nachricht extrahieren
-            bestehende_namen = []
-            bestehende_status = {}
-            lines = bot_message.content.split("\n")
-            
-            for line in lines:
-                if line and " " in line:  # Überprüfe, ob die Zeile ein Format "Name Status" hat
-                    name, status = line.rsplit(" ", 1)
-                    name = name.strip()
-                    bestehende_namen.append(name)
-                    bestehende_status[name] = status
-                    
-            # Finde Namen, die hinzugefügt werden sollen
-            hinzugefuegte_namen = [name for name in neue_namen if name not in bestehende_namen]
-            
-            # Finde Namen, die entfernt werden sollen (in der alten Liste aber nicht in der neuen)
-            entfernte_namen = [name for name in bestehende_namen if name not in neue_namen]
+        if LAZY_MEMBERS:
+            # Während der Abfrage kann eine neuere Bearbeitung eintreffen; die ältere
+            # wird dann verworfen, damit die Liste nicht auf veralteten Namen endet
+            marke = neueste_bearbeitung[list_id] = object()
+            try:
+                await member_loader.prefetch(guild, neue_namen)
+            finally:
+                veraltet = neueste_bearbeitung.get(list_id) is not marke
+                if not veraltet:
+                    del neueste_bearbeitung[list_id]
+            if veraltet:
+                logger.debug(f"Veraltete Bearbeitung der Liste {list_id} verworfen", extra={'guild_id': guild.id, 'list_id': list_id})
+                return
+        
+        def namen_abgleichen(state):
+            """Gleiche die Liste mit den neuen Namen ab"""
+            hinzugefuegte_namen, entfernte_namen = state.sync_names(
+                neue_namen, lambda name: resolve_name(guild, name)
+            )
             
             if not hinzugefuegte_namen and not entfernte_namen:
                 # Keine Änderungen notwendig
-                return
-            
-            # Erstelle neue Liste basierend auf aktuellen Namen
-            new_lines = []
-            
-            # Füge alle Namen hinzu, die NICHT entfernt werden sollen
-            for name in bestehende_namen:
-                if name not in entfernte_namen:
-                    new_lines.append(f"{name} {bestehende_status[name]}")
-                    
-            # Füge neue Namen mit X hinzu
-            for name in hinzugefuegte_namen:
-                new_lines.append(f"{name} ❌")
-            
-            # Aktualisiere den Cache mit aktuellen Namen
-            alle_namen = [name for name in bestehende_namen if name not in entfernte_namen] + hinzugefuegte_namen
-            message_cache[bot_message_id]["names"] = alle_namen
-            
-            # Aktualisiere die Bot-Nachricht
-            await bot_message.edit(content="\n".join(new_lines))
+                return False
             
             log_message = []
             if hinzugefuegte_namen:
@@ -497,208 +622,61 @@ def create_discord_bot():
             if entfernte_namen:
                 log_message.append(f"Entfernt: {', '.join(entfernte_namen)}")
                 
-            logger.info(f"Liste aktualisiert (Text) - {' | '.join(log_message)}")
+            logger.info(f"Liste aktualisiert (Embed) - {' | '.join(log_message)}", extra=log_ids(state))
+            return True
+        
+        # Änderungen derselben Liste werden der Reihe nach angewendet
+        bot.list_updates.submit(list_id, namen_abgleichen)
     
     @bot.event
     async def on_raw_reaction_add(payload):
         if payload.user_id == bot.user.id:
             return
 
-        if payload.message_id not in message_cache:
+        # Reaktionen auf Folgenachrichten gelten für die ganze Liste
+        list_id = message_cache.list_id(payload.message_id)
+        if list_id is None:
             return
 
-        emoji = payload.emoji.name
-        if emoji not in status_emojis:
+        status = STATUS_BY_EMOJI.get(payload.emoji.name)
+        if status is None:
             return
 
         guild = bot.get_guild(payload.guild_id)
-        member = guild.get_member(payload.user_id)
-        channel = guild.get_channel(payload.channel_id)
-        message = await channel.fetch_message(payload.message_id)
-
-        entry = message_cache[payload.message_id]
-        user_display = member.display_name
+        member = payload.member or guild.get_member(payload.user_id)
+        if member is None:
+            return
 
-        # Prüfe, ob die Nachricht ein Embed ist
-        if message.embeds:
-            # Wir haben ein Embed
-            embed = message.embeds[0]
-            
-            # Definiere die Rollenreihenfolge für die Neuorganisation
-            rollen_reihenfolge = ["Chefarzt", "Praxisleitung", "Arzt", "Ausbildung", "Praktikant"]
-            
-            # Prüfe, ob wir das neue oder alte Embed-Format haben
-            if "__**Chefarzt**__" in [field.name for field in embed.fields]:
-                # Wir haben das neue kategorisierte Format
-                
-                # Sammle alle Namen und ihre Werte
-                all_entries = []
-                category = None
-                
-                for field in embed.fields:
-                    if field.name.startswith("__**") and field.name.endswith("**__"):
-                        # Das ist eine Kategorie-Überschrift
-                        category = field.name.strip("_*")
-                    elif field.value == "\u200b":  # Zero-width space
-                        # Das ist ein Mitglied
-                        name = field.name
-                        
-                        # Extrahiere Name und aktuellen Status
-                        name_parts = name.split(" ")
-                        if len(name_parts) > 1 and name_parts[-1] in status_emojis:
-                            name_without_status = " ".join(name_parts[:-1])
-                            current_status = name_parts[-1]
-                        else:
-                            name_without_status = name
-                            current_status = "❌"
-                            
-                        # Prüfe, ob dieser Name zum aktuellen Benutzer gehört
-                        if name_without_status == user_display:
-                            # Nur für den reagierenden Benutzer Status ändern
-                            all_entries.append({
-                                'name': name_without_status,
-                                'status': emoji,
-                                'category': category,
-                                'inline': field.inline
-                            })
-                            logger.info(f"Status für {name_without_status} geändert zu {emoji}")
-                        else:
-                            # Für alle anderen den aktuellen Status beibehalten
-                            all_entries.append({
-                                'name': name_without_status,
-                                'status': current_status,
-                                'category': category,
-                                'inline': field.inline
-                            })
-                
-                # Nur fortfahren, wenn wir Einträge haben
-                if all_entries:
-                    # Erstelle ein neues Embed mit dem aktualisierten Status
-                    new_embed = discord.Embed(
-                        title=embed.title,
-                        description=embed.description,
-                        color=embed.color
-                    )
-                    
-                    # Gruppiere Einträge nach Kategorie
-                    entries_by_category = {}
-                    for entry in all_entries:
-                        category = entry['category']
-                        if category not in entries_by_category:
-                            entries_by_category[category] = []
-                        entries_by_category[category].append(entry)
-                    
-                    # Füge Kategorien und Einträge hinzu
-                    # Zunächst die definierten Rollen in der richtigen Reihenfolge
-                    for rolle in rollen_reihenfolge:
-                        if rolle in entries_by_category:
-                            # Füge die Kategorie-Überschrift hinzu
-                            new_embed.add_field(
-                                name=f"__**{rolle}**__",
-                                value="\u200b",  # Zero-width space als Platzhalter
-                                inline=False
-                            )
-                            
-                            # Füge alle Einträge dieser Kategorie hinzu
-                            for entry in entries_by_category[rolle]:
-                                new_embed.add_field(
-                                    name=f"{entry['name']} {entry['status']}",
-                                    value="\u200b",  # Zero-width space als Platzhalter
-                                    inline=entry['inline']
-                                )
-                    
-                    # Dann alle anderen Kategorien
-                    for category, entries in entries_by_category.items():
-                        if category not in rollen_reihenfolge:
-                            # Füge die Kategorie-Überschrift hinzu
-                            new_embed.add_field(
-                                name=f"__**{category}**__",
-                                value="\u200b",  # Zero-width space als Platzhalter
-                                inline=False
-                            )
-                            
-                            # Füge alle Einträge dieser Kategorie hinzu
-                            for entry in entries:
-                                new_embed.add_field(
-                                    name=f"{entry['name']} {entry['status']}",
-                                    value="\u200b",  # Zero-width space als Platzhalter
-                                    inline=entry['inline']
-                                )
-                    
-                    # Aktualisiere die Nachricht mit dem neuen Embed
-                    await message.edit(embed=new_embed)
-            else:
-                # Wir haben das alte Embed-Format ohne Kategorien
-                fields = embed.fields
-                new_fields = []
-                status_updated = False
-
-                # Finde das Field mit dem passenden Namen
-                for field in fields:
-                    field_name = field.name
-                    field_value = field.value
-                    
-                    # Prüfe, ob das Field zum aktuellen Benutzer gehört
-                    if field_name == user_display or any(
-                        name == user_display for name in entry.get("names", [])
-                    ):
-                        # Aktualisiere den Status im Namen
-                        if " " in field_name and field_name.split(" ")[-1] in status_emojis:
-                            name_without_status = " ".join(field_name.split(" ")[:-1])
-                            new_name = f"{name_without_status} {emoji}"
-                        else:
-                            new_name = f"{field_name} {emoji}"
-                            
-                        new_fields.append(
-                            {'name': new_name, 'value': field_value, 'inline': field.inline}
-                        )
-                        status_updated = True
-                        logger.info(f"Status für {field_name} geändert zu {emoji}")
-                    else:
-                        # Behalte das bestehende Field bei
-                        new_fields.append(
-                            {'name': field_name, 'value': field_value, 'inline': field.inline}
-                        )
-                
-                if status_updated:
-                    # Erstelle ein neues Embed mit den aktualisierten Fields
-                    new_embed = discord.Embed(
-                        title=embed.title,
-                        description=embed.description,
-                        color=embed.color
-                    )
-                    
-                    # Füge die Fields hinzu
-                    for field in new_fields:
-                        new_embed.add_field(
-                            name=field['name'],
-                            value=field['value'],
-                            inline=field['inline']
-                        )
-                    
-                    # Aktualisiere die Nachricht mit dem neuen Embed
-                    await message.edit(embed=new_embed)
-        else:
-            # Fallback für nicht-Embed-Nachrichten (altes Text-Format)
-            try:
-                # Aktualisiere nur, wenn der Name in der Liste steht
-                lines = message.content.split("\n")
-                new_lines = []
-
-                for line in lines:
-                    if " " in line:  # Überprüfe, ob die Zeile ein Format "Name Status" hat
-                        name, current_status = line.rsplit(" ", 1)
-                        if name == user_display:
-                            new_lines.append(f"{name} {emoji}")
-                            logger.info(f"Status für {name} geändert zu {emoji}")
-                        else:
-                            new_lines.append(line)
-                    else:
-                        new_lines.append(line)
-
-                await message.edit(content="\n".join(new_lines))
-            except Exception as e:
-                logger.error(f"Fehler beim Aktualisieren der Nachricht: {e}")
+        # Änderungen derselben Liste werden der Reihe nach angewendet
+        bot.list_updates.submit(list_id, status_update(member, status))
+    
+    @bot.event
+    async def on_raw_message_delete(payload):
+        """Event, der ausgelöst wird, wenn eine Nachricht gelöscht wurde"""
+        if payload.message_id in message_cache:
+            bot.edit_coalescer.discard(payload.message_id)
+            part_ids = message_cache.parts_of(payload.message_id)
+            message_cache.remove(payload.message_id)
+            logger.info(
+                f"Dienstübersicht {payload.message_id} gelöscht",
+                extra={'guild_id': payload.guild_id, 'list_id': payload.message_id}
+            )
+            # Die Folgenachrichten gehören zur gelöschten Liste
+            for part_id in part_ids:
+                await delete_message(payload.channel_id, payload.guild_id, part_id)
+            return
+        
+        list_id = message_cache.parts.get(payload.message_id)
+        if list_id is None:
+            return
+        state = await message_cache.fetch(list_id)
+        if state is None or payload.message_id not in state.part_ids:
+            message_cache.parts.pop(payload.message_id, None)
+            return
+        # Folgenachricht gelöscht: die späteren Teile rücken nach und der Rest wird neu gesendet
+        forget_part(state, payload.message_id)
+        message_cache.save(state)
+        bot.edit_coalescer.request(list_id, 0)
     
     return bot
 
@@ -706,6 +684,7 @@ async def run_bot(bot, token):
     """Run the Discord bot with the given token"""
     try:
         logger.info("Attempting to connect to Discord...")
+        bot.start_requested = time.monotonic()
         await bot.start(token)
     except discord.LoginFailure:
         logger.error("Invalid Discord token. Please check your environment variables.")
@@ -713,9 +692,53 @@ async def run_bot(bot, token):
         logger.error(f"Error starting bot: {e}")
         traceback.print_exc()
 
-def disconnect_bot(bot):
-    """Disconnect the bot and clean up"""
-    if bot and bot.is_ready():
-        logger.info("Disconnecting bot...")
-        asyncio.run_coroutine_threadsafe(bot.close(), bot.loop)
-        logger.info("Bot disconnected")
+def begin_restart(bot, mode):
+    """Remember that a restart started, to measure its downtime"""
+    bot.restart_pending = (mode, time.monotonic(), datetime.datetime.now())
+
+def finish_restart(bot, how):
+    """Record the downtime of a pending restart once the gateway is back"""
+    pending = getattr(bot, 'restart_pending', None)
+    if not pending:
+        return
+    mode, started, started_at = pending
+    bot.restart_pending = None
+    downtime = time.monotonic() - started
+    bot.restart_log.append({
+        'mode': mode,
+        'reconnect': how,
+        'started': started_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'downtime_s': round(downtime, 2),
+    })
+    logger.info(f"{mode.capitalize()} restart completed via {how} after {downtime:.2f}s downtime")
+
+def gateway_connections(bot):
+    """Return ``(shard_id, websocket)`` for every gateway connection of the bot"""
+    shards = getattr(bot, 'shards', None)
+    if not shards:
+        return [(0, bot.ws)]
+    return [(shard_id, bot._get_websocket(shard_id=shard_id)) for shard_id in sorted(shards)]
+
+def heartbeat_ack_age(ws):
+    """Return the seconds since the gateway last acknowledged a heartbeat of ``ws``, or None"""
+    # Der Keep-Alive-Handler von discord.py misst mit perf_counter
+    keep_alive = getattr(ws, '_keep_alive', None)
+    last_ack = getattr(keep_alive, '_last_ack', None)
+    if last_ack is None:
+        return None
+    return time.perf_counter() - last_ack
+
+async def resume_gateway(bot, shard_id=None):
+    """
+    Soft restart: keep the process, caches and HTTP session and only recycle
+    the gateway connection (of one shard, or all of them). Closing with code
+    4000 makes discord.py reconnect and RESUME the session; if Discord
+    rejects the resume it identifies anew.
+    """
+    if shard_id is None:
+        begin_restart(bot, "soft")
+        # Ungenutzte Listen bei der Gelegenheit aus dem Speicher entfernen
+        message_cache.sweep()
+    for connection_id, ws in gateway_connections(bot):
+        if ws is not None and shard_id in (None, connection_id):
+            await ws.close(code=4000)
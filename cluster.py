@@ -0,0 +1,452 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import subprocess
+import datetime
+import urllib.request
+from itertools import zip_longest
+
+from log_setup import setup_logging
+from monitor import format_uptime
+
+logger = logging.getLogger(__name__)
+
+# Anzahl der Bot-Prozesse im Cluster-Modus (0 = Bot läuft im Webprozess)
+CLUSTER_WORKERS = int(os.environ.get("CLUSTER_WORKERS", "0"))
+# Sekunden zwischen zwei Statusmeldungen eines Workers
+STATUS_INTERVAL = 5
+# Wartezeit vor dem Neustart eines abgestürzten Workers, verdoppelt sich bis zum Maximum
+WORKER_RESTART_DELAY = 5
+WORKER_RESTART_MAX_DELAY = 120
+WORKER_STOP_TIMEOUT = 20
+
+
+def recommended_shard_count(token):
+    """Ask Discord for the recommended number of shards"""
+    request = urllib.request.Request(
+        "https://discord.com/api/v10/gateway/bot",
+        headers={"Authorization": f"Bot {token}", "User-Agent": "DiscordBot (cluster, 1.0)"},
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.load(response)["shards"]
+
+
+def split_shards(shard_count, workers):
+    """Split the shard IDs into ``workers`` contiguous ranges"""
+    workers = max(1, min(workers, shard_count))
+    return [
+        list(range(index * shard_count // workers, (index + 1) * shard_count // workers))
+        for index in range(workers)
+    ]
+
+
+# Abschnitte des Worker-Status, die zu einem Abschnitt des Clusters zusammengeführt werden
+MERGED_SECTIONS = ("list_edits", "list_cache", "list_updates", "rest", "members", "liveness")
+# Einstellungen, die in allen Workern gleich sind
+_SETTINGS = {"window", "ttl", "retention", "path"}
+# Durchschnitte und die Zähler, mit denen sie gewichtet werden
+_AVERAGES = {"avg_wait_ms": "dispatched", "avg_query_ms": "queries"}
+
+
+def merge_sections(sections):
+    """
+    Merge the same status section of several workers into one.
+
+    Counters are summed, limits, ages and latencies take the worst value,
+    flags must hold for all workers and problem lists are joined. Averages
+    and the cache hit rate are recomputed from the merged counters.
+    """
+    sections = [section for section in sections if section]
+    if not sections:
+        return {}
+    merged = {}
+    for key in dict.fromkeys(key for section in sections for key in section):
+        values = [section[key] for section in sections if section.get(key) is not None]
+        if not values:
+            merged[key] = None
+        elif isinstance(values[0], dict):
+            merged[key] = merge_sections(values)
+        elif isinstance(values[0], bool):
+            merged[key] = all(values)
+        elif isinstance(values[0], list) and any(isinstance(item, dict) for value in values for item in value):
+            # z. B. die Prioritätsstufen des REST-Schedulers: gleiche Stelle, gleiche Stufe
+            merged[key] = [merge_sections(items) for items in zip_longest(*values)]
+        elif isinstance(values[0], list):
+            merged[key] = sorted({item for value in values for item in value})
+        elif key in _SETTINGS or not isinstance(values[0], (int, float)):
+            merged[key] = values[0]
+        elif key.startswith("max_") or key.endswith("_age_s") or key == "latency_ms":
+            merged[key] = max(values)
+        elif key in _AVERAGES:
+            weight = _AVERAGES[key]
+            total = sum(section.get(weight) or 0 for section in sections if section.get(key) is not None)
+            merged[key] = round(
+                sum(section[key] * (section.get(weight) or 0) for section in sections if section.get(key) is not None) / total, 1
+            ) if total else values[0]
+        else:
+            merged[key] = sum(values)
+    if "hit_rate" in merged:
+        lookups = merged.get("hits", 0) + merged.get("misses", 0)
+        merged["hit_rate"] = round(merged["hits"] / lookups, 3) if lookups else None
+    return merged
+
+
+class _Worker:
+    """A bot worker process and the last status it reported"""
+
+    def __init__(self, worker_id, shard_ids):
+        self.id = worker_id
+        self.shard_ids = shard_ids
+        self.process = None
+        self.status = None
+        self.status_at = None
+        self.started_at = None
+        self.restarts = 0
+        self.restart_delay = WORKER_RESTART_DELAY
+        self.restart_at = None
+        self.write_lock = threading.Lock()
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+
+class Cluster:
+    """
+    Runs the bot's shards in several worker processes.
+
+    The shards are split evenly over the workers; each worker runs its own
+    bot and BotMonitor for its shard range, so the bots no longer share one
+    GIL with each other and the web app. Workers report their status and log
+    records as JSON lines on stdout and take commands on stdin. The launcher
+    restarts crashed workers and merges their status for the dashboard; it
+    offers the same methods as BotMonitor that the web app uses.
+    """
+
+    def __init__(self, workers, token, shard_count=None):
+        self.worker_count = workers
+        self.token = token
+        self.shard_count = shard_count
+        self.workers = []
+        self.running = False
+        self.start_time = None
+        self.lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Start the worker processes and their supervisor"""
+        with self.lock:
+            if self.running:
+                logger.warning("Cluster is already running")
+                return
+            if not self.token:
+                logger.error("Cannot start cluster: Discord token is not set")
+                return
+
+            self.running = True
+            self.start_time = datetime.datetime.now()
+            shard_count = self._resolve_shard_count()
+            self.workers = [
+                _Worker(worker_id, shard_ids)
+                for worker_id, shard_ids in enumerate(split_shards(shard_count, self.worker_count))
+            ]
+            logger.info(f"Starting cluster with {len(self.workers)} workers for {shard_count} shards")
+            for worker in self.workers:
+                self._spawn(worker, shard_count)
+            self.shard_count = shard_count
+
+        threading.Thread(target=self._supervise, name="cluster-supervisor", daemon=True).start()
+
+    def stop(self, timeout=WORKER_STOP_TIMEOUT):
+        """Stop all workers, killing those that do not exit in time"""
+        with self.lock:
+            if not self.running:
+                return
+            self.running = False
+            self._stopped.set()
+
+        for worker in self.workers:
+            self._send(worker, {'cmd': 'stop'})
+        deadline = time.monotonic() + timeout
+        for worker in self.workers:
+            if worker.process is None:
+                continue
+            try:
+                worker.process.wait(max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                logger.warning(f"Worker {worker.id} did not stop in time, killing it")
+                worker.process.kill()
+        logger.info("Cluster stopped")
+
+    def restart_bot(self):
+        """Restart the bots of all workers"""
+        self._broadcast({'cmd': 'restart', 'mode': 'hard'})
+
+    def soft_restart_bot(self):
+        """Resume the gateway sessions of all workers"""
+        self._broadcast({'cmd': 'restart', 'mode': 'soft'})
+
+    def restart_shard(self, shard_id, mode="hard"):
+        """Restart a single shard in the worker that runs it"""
+        for worker in self.workers:
+            if shard_id in worker.shard_ids:
+                self._send(worker, {'cmd': 'restart_shard', 'shard': shard_id, 'mode': mode})
+                return
+        logger.warning(f"Cannot restart shard {shard_id}: no worker runs it")
+
+    def _resolve_shard_count(self):
+        if self.shard_count:
+            return self.shard_count
+        shard_count = os.environ.get("SHARD_COUNT", "")
+        if shard_count and shard_count != "auto":
+            return int(shard_count)
+        try:
+            return recommended_shard_count(self.token)
+        except Exception as e:
+            logger.warning(f"Could not fetch recommended shard count, using one shard per worker: {e}")
+            return self.worker_count
+
+    def _spawn(self, worker, shard_count):
+        command = [
+            sys.executable, os.path.abspath(__file__),
+            "--worker", str(worker.id),
+            "--shards", ",".join(map(str, worker.shard_ids)),
+            "--shard-count", str(shard_count),
+        ]
+        worker.process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            text=True, bufsize=1, encoding="utf-8",
+            # Token über die Umgebung, damit es nicht in der Prozessliste steht
+            env=dict(os.environ, DISCORD_TOKEN=self.token),
+        )
+        worker.started_at = datetime.datetime.now()
+        worker.status = None
+        worker.restart_at = None
+        threading.Thread(
+            target=self._read, args=(worker, worker.process),
+            name=f"cluster-worker-{worker.id}", daemon=True,
+        ).start()
+        logger.info(f"Worker {worker.id} started (PID {worker.process.pid}, shards {worker.shard_ids})")
+
+    def _read(self, worker, process):
+        """Handle the status and log lines of a worker until it exits"""
+        for line in process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                logger.info(f"Worker {worker.id}: {line.rstrip()}")
+                continue
+            if message.get('type') == 'log':
+                record = logging.makeLogRecord(message['record'])
+                logging.getLogger(record.name).handle(record)
+            elif message.get('type') == 'status':
+                worker.status = message['status']
+                worker.status_at = time.monotonic()
+
+    def _supervise(self):
+        """Restart workers that exited, with an increasing delay"""
+        while not self._stopped.wait(1):
+            now = time.monotonic()
+            for worker in self.workers:
+                if worker.alive():
+                    # Ein verbundener Worker setzt die Wartezeit zurück
+                    if worker.status and worker.status['is_running']:
+                        worker.restart_delay = WORKER_RESTART_DELAY
+                    continue
+                if worker.restart_at is None:
+                    logger.warning(
+                        f"Worker {worker.id} exited with code {worker.process.returncode}, "
+                        f"restarting in {worker.restart_delay}s"
+                    )
+                    worker.restart_at = now + worker.restart_delay
+                    worker.restart_delay = min(worker.restart_delay * 2, WORKER_RESTART_MAX_DELAY)
+                elif now >= worker.restart_at:
+                    with self.lock:
+                        if not self.running:
+                            return
+                        worker.restarts += 1
+                        self._spawn(worker, self.shard_count)
+
+    def _send(self, worker, command):
+        if not worker.alive():
+            return
+        try:
+            with worker.write_lock:
+                worker.process.stdin.write(json.dumps(command) + "\n")
+                worker.process.stdin.flush()
+        except OSError as e:
+            logger.warning(f"Could not send command to worker {worker.id}: {e}")
+
+    def _broadcast(self, command):
+        for worker in self.workers:
+            self._send(worker, command)
+
+    def is_bot_running(self):
+        """Check if every worker is connected to Discord"""
+        return bool(self.workers) and all(
+            worker.alive() and worker.status and worker.status['is_running'] for worker in self.workers
+        )
+
+    def get_summary(self):
+        """Get the status values shown on the dashboard"""
+        status = self.get_status()
+        return {
+            'is_running': status['is_running'],
+            'uptime': status['uptime'],
+            'last_restart': status['last_restart'],
+            'restart_count': status['restart_count'],
+            'bot_guilds': status['bot_guilds'],
+            'healthy': status['liveness']['healthy'],
+            'problems': status['liveness']['problems'],
+            'latency_ms': status['liveness']['latency_ms'],
+            'shards': status['shards'],
+        }
+
+    def collect_status(self, timeout=None):
+        """Get the merged status; the same call as on BotMonitor, which builds it on the bot loop"""
+        return self.get_status()
+
+    def get_status(self):
+        """
+        Get the merged status of all workers for the dashboard.
+
+        It has the keys of ``BotMonitor.get_status()``, plus the status of
+        every worker under ``workers``.
+        """
+        reported = [worker for worker in self.workers if worker.status]
+        statuses = [worker.status for worker in reported]
+        restarts = [
+            dict(restart, worker=worker.id)
+            for worker in reported
+            for restart in worker.status.get('restarts', [])
+        ]
+        shards = [
+            dict(shard, worker=worker.id)
+            for worker in reported
+            for shard in worker.status.get('shards', [])
+        ]
+        last_restarts = [status['last_restart'] for status in statuses if status['last_restart'] != "Never restarted"]
+        now = time.monotonic()
+
+        status = {
+            'is_running': self.is_bot_running(),
+            'uptime': format_uptime(self.start_time),
+            'last_restart': max(last_restarts) if last_restarts else "Never restarted",
+            'restart_count': sum(status['restart_count'] for status in statuses)
+                             + sum(worker.restarts for worker in self.workers),
+            'bot_guilds': sum(status['bot_guilds'] for status in statuses),
+            'restarts': sorted(restarts, key=lambda restart: restart['started']),
+            'shards': sorted(shards, key=lambda shard: shard['id']),
+            'time_to_ready_s': max(
+                (status['time_to_ready_s'] for status in statuses if status.get('time_to_ready_s') is not None),
+                default=None,
+            ),
+        }
+        for section in MERGED_SECTIONS:
+            status[section] = merge_sections(worker_status.get(section) for worker_status in statuses)
+        liveness = status['liveness']
+        # Ein Worker ohne Status gilt als nicht gesund
+        liveness['healthy'] = len(reported) == len(self.workers) and not liveness.get('problems')
+        liveness.setdefault('problems', [])
+        liveness.setdefault('latency_ms', None)
+        status['workers'] = [
+            {
+                'id': worker.id,
+                'pid': worker.process.pid if worker.process else None,
+                'alive': worker.alive(),
+                'shard_ids': worker.shard_ids,
+                'process_restarts': worker.restarts,
+                'status_age_s': round(now - worker.status_at, 1) if worker.status_at else None,
+                'status': worker.status,
+            }
+            for worker in self.workers
+        ]
+        return status
+
+
+class _PipeHandler(logging.Handler):
+    """Forwards log records of a worker to the launcher"""
+
+    def __init__(self, send, worker_id):
+        super().__init__()
+        self.send = send
+        self.prefix = f"worker{worker_id}."
+
+    def emit(self, record):
+        try:
+            # Formatiert auch den Traceback in record.exc_text
+            self.format(record)
+            data = dict(record.__dict__)
+            data.update(
+                name=self.prefix + record.name, msg=record.getMessage(),
+                args=None, exc_info=None, stack_info=None,
+            )
+            self.send({'type': 'log', 'record': data})
+        except Exception:
+            self.handleError(record)
+
+
+def run_worker(worker_id, shard_ids, shard_count):
+    """Run a bot for the given shards and talk to the launcher over stdin/stdout"""
+    # stdout gehört dem Protokoll, alle anderen Ausgaben gehen nach stderr
+    pipe = sys.stdout
+    sys.stdout = sys.stderr
+    pipe_lock = threading.Lock()
+
+    def send(message):
+        with pipe_lock:
+            pipe.write(json.dumps(message, default=str) + "\n")
+            pipe.flush()
+
+    # Die Einträge gehen über eine Warteschlange an den Launcher, eine volle Pipe hält den Bot nicht auf
+    setup_logging(_PipeHandler(send, worker_id), log_file=None, console=False)
+
+    from bot import create_discord_bot
+    from monitor import BotMonitor
+
+    bot = create_discord_bot(shard_count=str(shard_count), shard_ids=shard_ids)
+    monitor = BotMonitor(bot, os.environ.get("DISCORD_TOKEN"))
+    monitor.start()
+    stopped = threading.Event()
+
+    def report():
+        while not stopped.wait(STATUS_INTERVAL):
+            try:
+                # Der Status wird auf dem Bot-Loop erstellt, dem die Listen- und REST-Zustände gehören
+                send({'type': 'status', 'status': monitor.collect_status(STATUS_INTERVAL)})
+            except Exception as e:
+                logger.error(f"Error reporting worker status: {e}")
+
+    threading.Thread(target=report, name="worker-status", daemon=True).start()
+
+    # Ende der Eingabe heißt: der Launcher ist weg
+    for line in sys.stdin:
+        command = json.loads(line)
+        if command['cmd'] == 'stop':
+            break
+        if command['cmd'] == 'restart':
+            if command.get('mode') == 'soft':
+                monitor.soft_restart_bot()
+            else:
+                monitor.restart_bot()
+        elif command['cmd'] == 'restart_shard':
+            monitor.restart_shard(command['shard'], command.get('mode', 'hard'))
+
+    stopped.set()
+    monitor.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bot worker process of the cluster mode")
+    parser.add_argument("--worker", type=int, required=True)
+    parser.add_argument("--shards", required=True)
+    parser.add_argument("--shard-count", type=int, required=True)
+    args = parser.parse_args(argv)
+    run_worker(args.worker, [int(shard_id) for shard_id in args.shards.split(",")], args.shard_count)
+
+
+if __name__ == "__main__":
+    main()
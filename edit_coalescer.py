@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    """Bookkeeping for one list with unsent changes"""
+
+    __slots__ = ("first_change", "timer", "running", "dirty")
+
+    def __init__(self, first_change):
+        self.first_change = first_change
+        self.timer = None
+        self.running = False
+        self.dirty = False
+
+
+class EditCoalescer:
+    """
+    Folds bursts of list changes into a single message edit per list.
+
+    Every change restarts a debounce timer of ``window`` seconds, but an edit
+    is never delayed more than ``max_delay`` seconds after the first pending
+    change. The flush callback renders the latest state, so the edit always
+    shows everything that happened up to that point. Edits for the same list
+    never overlap; changes arriving during an edit trigger one more edit.
+    """
+
+    def __init__(self, flush, window=1.0, max_delay=3.0):
+        self._flush = flush
+        self.window = window
+        self.max_delay = max_delay
+        self._pending = {}
+        self.changes_requested = 0
+        self.edits_sent = 0
+        self.edits_failed = 0
+        self.edits_answered = 0
+
+    def request(self, key, changes=1):
+        """Record ``changes`` changes of a list and schedule its edit"""
+        self.changes_requested += changes
+        now = time.monotonic()
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _Pending(now)
+        pending.dirty = True
+
+        if pending.running:
+            # Wird nach Abschluss der laufenden Bearbeitung nachgeholt
+            return
+
+        if pending.timer:
+            pending.timer.cancel()
+        delay = min(self.window, max(0.0, pending.first_change + self.max_delay - now))
+        pending.timer = asyncio.get_running_loop().call_later(delay, self._start, key)
+
+    def discard(self, key):
+        """Drop pending changes of a list, e.g. after it was rendered elsewhere"""
+        pending = self._pending.get(key)
+        if pending is None:
+            return
+        if pending.timer:
+            pending.timer.cancel()
+            pending.timer = None
+        pending.dirty = False
+        if not pending.running:
+            del self._pending[key]
+
+    def settle(self, key):
+        """Drop pending changes that an interaction response has already shown"""
+        pending = self._pending.get(key)
+        # Eine laufende Bearbeitung könnte den älteren Stand später anzeigen
+        if pending is not None and not pending.running:
+            self.discard(key)
+            self.edits_answered += 1
+
+    async def flush(self, key):
+        """Send the pending edit of a list immediately"""
+        pending = self._pending.get(key)
+        if pending is None or pending.running:
+            return
+        if pending.timer:
+            pending.timer.cancel()
+            pending.timer = None
+        await self._run(key, pending)
+
+    def _start(self, key):
+        pending = self._pending.get(key)
+        if pending is None:
+            return
+        pending.timer = None
+        asyncio.get_running_loop().create_task(self._run(key, pending))
+
+    async def _run(self, key, pending):
+        pending.running = True
+        try:
+            while pending.dirty:
+                pending.dirty = False
+                try:
+                    await self._flush(key)
+                    self.edits_sent += 1
+                except Exception as e:
+                    self.edits_failed += 1
+                    logger.error(f"Error editing list {key}: {e}", extra={'list_id': key})
+                if pending.dirty:
+                    # Änderungen während der Bearbeitung: Fenster erneut abwarten
+                    await asyncio.sleep(self.window)
+        finally:
+            pending.running = False
+            if self._pending.get(key) is pending:
+                del self._pending[key]
+
+    def stats(self):
+        """Return counters about coalesced edits"""
+        sent = self.edits_sent + self.edits_failed + self.edits_answered
+        return {
+            'changes': self.changes_requested,
+            'edits_sent': self.edits_sent,
+            'edits_failed': self.edits_failed,
+            'edits_answered': self.edits_answered,
+            'edits_saved': max(0, self.changes_requested - sent),
+            'pending_lists': len(self._pending),
+            'window': self.window,
+            'max_delay': self.max_delay,
+        }
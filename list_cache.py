@@ -0,0 +1,295 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class _Slot:
+    """A cached list state with its bookkeeping"""
+
+    __slots__ = ("state", "last_used", "nbytes", "entries")
+
+    def __init__(self, state, last_used):
+        self.state = state
+        self.last_used = last_used
+        self.nbytes = state.approx_size()
+        self.entries = len(state.entries)
+
+
+class ListCache:
+    """
+    Bounded in-memory cache of list states by list message ID.
+
+    Entries are evicted in least-recently-used order once ``max_entries`` or
+    ``max_bytes`` is exceeded, and lists idle for longer than ``ttl`` seconds
+    expire. With a store attached every change is persisted, evicted lists
+    spill to the store and are loaded lazily again on their next use; without
+    a store an evicted list is forgotten. Stored lists not changed for
+    ``retention`` seconds are deleted by ``purge``.
+
+    A reverse index from the ID of the command message to the list message is
+    maintained together with the states, so edits of unrelated messages are
+    rejected with a single lookup. Likewise the follow-up messages of large
+    lists map to the list message they continue.
+    """
+
+    def __init__(self, store=None, max_entries=1000, max_bytes=32 * 1024 * 1024, ttl=6 * 3600, retention=30 * 86400):
+        self.store = store
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.retention = retention
+        self._slots = OrderedDict()
+        self._bytes = 0
+        # user_message_id -> message_id der Liste
+        self.user_messages = {}
+        # message_id einer Folgenachricht -> message_id der Liste
+        self.parts = {}
+        # IDs der gespeicherten, aber nicht geladenen Listen
+        self._stored = set()
+        self.index_loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.purged = 0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, message_id):
+        return message_id in self._slots or message_id in self._stored
+
+    def attach_store(self, store):
+        """Persist lists in ``store`` from now on"""
+        self.store = store
+        self.index_loaded = False
+
+    def load_index(self):
+        """Read the IDs of all stored lists (blocking, run in an executor)"""
+        if self.store is None:
+            return
+        for message_id, user_message_id, part_ids in self.store.load_index():
+            if message_id not in self._slots:
+                self._stored.add(message_id)
+            if user_message_id is not None:
+                self.user_messages.setdefault(user_message_id, message_id)
+            for part_id in part_ids:
+                self.parts.setdefault(part_id, message_id)
+        self.index_loaded = True
+
+    def add(self, state):
+        """Store a list state under its message ID"""
+        self._insert(state)
+        if state.user_message_id is not None:
+            self.user_messages[state.user_message_id] = state.message_id
+        for part_id in state.part_ids:
+            self.parts[part_id] = state.message_id
+        if self.store is not None:
+            self.store.save(state)
+        self._evict()
+
+    def add_part(self, state, part_id):
+        """Register a follow-up message of a list"""
+        state.part_ids.append(part_id)
+        self.parts[part_id] = state.message_id
+
+    def remove_part(self, state, part_id):
+        """Forget a follow-up message of a list"""
+        if part_id in state.part_ids:
+            state.part_ids.remove(part_id)
+        self.parts.pop(part_id, None)
+
+    def parts_of(self, message_id):
+        """Return the IDs of the follow-up messages of a list, also if it is not loaded"""
+        slot = self._slots.get(message_id)
+        if slot is not None:
+            return list(slot.state.part_ids)
+        return [part_id for part_id, list_id in self.parts.items() if list_id == message_id]
+
+    def list_id(self, message_id):
+        """Return the ID of the list a message belongs to, or None"""
+        if message_id in self:
+            return message_id
+        return self.parts.get(message_id)
+
+    def save(self, state):
+        """Persist the current state of a list and refresh its accounting"""
+        slot = self._slots.get(state.message_id)
+        if slot is not None and slot.entries != len(state.entries):
+            # Nur geänderte Namenslisten verändern die Größe
+            nbytes = state.approx_size()
+            self._bytes += nbytes - slot.nbytes
+            slot.nbytes = nbytes
+            slot.entries = len(state.entries)
+        if self.store is not None:
+            self.store.save(state)
+        if slot is not None:
+            self._evict()
+
+    def get(self, message_id):
+        """Return the in-memory state of a list message, or None"""
+        slot = self._slots.get(message_id)
+        if slot is None:
+            return None
+        self._touch(message_id, slot)
+        return slot.state
+
+    async def fetch(self, message_id):
+        """Return the state of a list message, loading it from the store if needed"""
+        slot = self._slots.get(message_id)
+        if slot is not None:
+            self.hits += 1
+            self._touch(message_id, slot)
+            return slot.state
+        if message_id not in self._stored:
+            return None
+
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        state = await loop.run_in_executor(None, self.store.load, message_id)
+        slot = self._slots.get(message_id)
+        if slot is not None:
+            # Wurde während des Ladens bereits von einem anderen Ereignis geladen
+            return slot.state
+        if state is None:
+            self._stored.discard(message_id)
+            return None
+        self.loads += 1
+        self._insert(state)
+        self._evict()
+        return state
+
+    async def fetch_by_user_message(self, user_message_id):
+        """Return the state of the list created by a command message, or None"""
+        message_id = self.user_messages.get(user_message_id)
+        if message_id is None:
+            return None
+        return await self.fetch(message_id)
+
+    def remove(self, message_id):
+        """Forget a list, its command message and its follow-up messages"""
+        slot = self._slots.pop(message_id, None)
+        self._stored.discard(message_id)
+        if slot is not None:
+            self._bytes -= slot.nbytes
+            if slot.state.user_message_id is not None:
+                self.user_messages.pop(slot.state.user_message_id, None)
+            for part_id in slot.state.part_ids:
+                self.parts.pop(part_id, None)
+        else:
+            self._forget({message_id})
+        if self.store is not None:
+            self.store.delete(message_id)
+        return slot.state if slot else None
+
+    async def purge(self):
+        """
+        Delete the stored lists not changed for ``retention`` seconds.
+
+        The rows are deleted in an executor; the index of the lists that are
+        not loaded is cleaned up afterwards. A loaded list is still in use and
+        is saved again instead. Returns the number of forgotten lists.
+        """
+        if self.store is None or not self.retention:
+            return 0
+        loop = asyncio.get_running_loop()
+        message_ids = await loop.run_in_executor(None, self.store.purge, self.retention)
+        forgotten = set()
+        for message_id in message_ids:
+            slot = self._slots.get(message_id)
+            if slot is not None:
+                self.store.save(slot.state)
+            else:
+                forgotten.add(message_id)
+        self._forget(forgotten)
+        self.purged += len(forgotten)
+        if forgotten:
+            logger.info(f"Purged {len(forgotten)} lists unchanged for {self.retention / 86400:g} days")
+        return len(forgotten)
+
+    def sweep(self):
+        """Evict idle and surplus lists now"""
+        self._evict()
+
+    def stats(self):
+        """
+        Return size, hit rate and eviction counters of the cache.
+
+        Called from other threads (dashboard, monitor), so this only reads
+        counters and never evicts; the monitor sweeps on the bot loop.
+        """
+        lookups = self.hits + self.misses
+        stats = {
+            'entries': len(self._slots),
+            'bytes': self._bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'ttl': self.ttl,
+            'retention': self.retention,
+            'stored_not_loaded': len(self._stored),
+            'parts': len(self.parts),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'loads': self.loads,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'purged': self.purged,
+        }
+        if self.store is not None:
+            stats['store'] = self.store.stats()
+        return stats
+
+    def _insert(self, state):
+        old = self._slots.pop(state.message_id, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        slot = _Slot(state, time.monotonic())
+        self._slots[state.message_id] = slot
+        self._bytes += slot.nbytes
+        self._stored.discard(state.message_id)
+
+    def _touch(self, message_id, slot):
+        slot.last_used = time.monotonic()
+        self._slots.move_to_end(message_id)
+
+    def _evict(self):
+        # Die am längsten ungenutzten Listen stehen vorne
+        deadline = time.monotonic() - self.ttl if self.ttl else None
+        while self._slots:
+            message_id, slot = next(iter(self._slots.items()))
+            if deadline is not None and slot.last_used < deadline:
+                self.expirations += 1
+            elif len(self._slots) > 1 and (
+                len(self._slots) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self.evictions += 1
+            else:
+                break
+            self._drop(message_id, slot)
+
+    def _forget(self, message_ids):
+        """Remove lists that are not loaded from the index"""
+        if not message_ids:
+            return
+        self._stored.difference_update(message_ids)
+        for index in (self.user_messages, self.parts):
+            for key in [key for key, list_id in index.items() if list_id in message_ids]:
+                del index[key]
+
+    def _drop(self, message_id, slot):
+        del self._slots[message_id]
+        self._bytes -= slot.nbytes
+        if self.store is not None:
+            # Die Liste ist gespeichert und wird bei Bedarf neu geladen
+            self._stored.add(message_id)
+        else:
+            if slot.state.user_message_id is not None:
+                self.user_messages.pop(slot.state.user_message_id, None)
+            for part_id in slot.state.part_ids:
+                self.parts.pop(part_id, None)
+        logger.debug(f"List {message_id} evicted from cache")
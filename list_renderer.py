@@ -0,0 +1,166 @@
+from bisect import bisect_right
+from itertools import accumulate
+
+import discord
+
+from list_state import KATEGORIE_NAMEN, STATUS_EMOJIS
+
+LISTE_TITEL = "Dienstübersicht"
+LISTE_TITEL_FORTSETZUNG = "Dienstübersicht (Fortsetzung)"
+LISTE_BESCHREIBUNG = "Reagiere mit ✅ oder ❌ um deinen Status zu ändern"
+LISTE_FARBE = discord.Color.blue().value
+
+# Grenzen von Discord für Embeds und Nachrichten
+EMBED_MAX_FIELDS = 25
+FIELD_NAME_MAX = 256
+FIELD_VALUE_MAX = 1024
+MESSAGE_MAX_EMBEDS = 10
+# Summe aus Titeln, Beschreibungen, Feldnamen und -werten aller Embeds einer Nachricht
+MESSAGE_MAX_CHARS = 6000
+
+
+def _shorten(text, limit):
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def _render_category(state, rang, compact):
+    """Render the fields of one category, one per name or packed into few fields"""
+    header = f"__**{KATEGORIE_NAMEN[rang]}**__"
+    entries = state.entries
+    status = state.status
+    zeilen = [
+        _shorten(f"{entries[index].name} {STATUS_EMOJIS[status[index]]}", FIELD_NAME_MAX)
+        for index in state.categories[rang]
+    ]
+
+    if not compact:
+        fields = [{"name": header, "value": "\u200b", "inline": False}]  # Zero-width space als Platzhalter
+        for zeile in zeilen:
+            fields.append({"name": zeile, "value": "\u200b", "inline": True})
+        return fields
+
+    # Kompakt: Namen zeilenweise in Feldwerte packen, bei Überlänge in Folgefelder
+    fields = []
+    block = []
+    laenge = 0
+    for zeile in zeilen:
+        if block and laenge + 1 + len(zeile) > FIELD_VALUE_MAX:
+            fields.append({"name": header if not fields else "\u200b", "value": "\n".join(block), "inline": False})
+            block = []
+            laenge = 0
+        laenge += len(zeile) + (1 if block else 0)
+        block.append(zeile)
+    fields.append({"name": header if not fields else "\u200b", "value": "\n".join(block), "inline": False})
+    return fields
+
+
+def _update_fragments(state, compact):
+    """
+    Rebuild the memoised fields of the categories changed since the last
+    render and return those categories. Each fragment keeps the running
+    character count of its fields for packing. A state is always rendered
+    in the same mode, so the memoised fields never mix modes.
+    """
+    fragments = state.fragments
+    dirty = state.take_dirty()
+    for rang in dirty:
+        if rang in state.categories:
+            fields = _render_category(state, rang, compact)
+            fragments[rang] = (fields, list(accumulate(len(f["name"]) + len(f["value"]) for f in fields)))
+        else:
+            fragments.pop(rang, None)
+    return dirty
+
+
+def _embed(title=None, description=None):
+    embed = {"type": "rich", "color": LISTE_FARBE, "fields": []}
+    if title:
+        embed["title"] = title
+    if description:
+        embed["description"] = description
+    return embed
+
+
+def _resume(parts, checkpoint):
+    """Return the packed messages and character count up to a checkpoint"""
+    teil, embed, felder, zeichen = checkpoint
+    messages = parts[:teil]
+    # Vorherige Teile und volle Embeds bleiben unverändert, nur das letzte Embed wird kopiert
+    alt = parts[teil]
+    letztes = dict(alt[embed])
+    letztes["fields"] = alt[embed]["fields"][:felder]
+    messages.append([*alt[:embed], letztes])
+    return messages, zeichen
+
+
+def render_parts(state, compact=False):
+    """
+    Render a list into the embed payloads of one or more messages.
+
+    The fields are packed in order into embeds of at most 25 fields and
+    messages of at most 10 embeds and 6000 characters, so every part is
+    within Discord's limits before it is sent. The first part carries the
+    title and description, further parts a continuation title.
+
+    The fields of every category and the packed parts are memoised on the
+    state. Only dirty categories are re-rendered, and packing resumes at the
+    first dirty category, so the parts before it are returned as the very
+    same objects.
+    """
+    dirty = _update_fragments(state, compact)
+    packed = state.packed
+    if packed is not None and not dirty:
+        return packed[0]
+
+    anfang = min(dirty) if packed is not None else 0
+    if anfang:
+        parts, checkpoints = packed
+        messages, zeichen = _resume(parts, checkpoints[anfang])
+        checkpoints = checkpoints[:anfang]
+    else:
+        messages = [[_embed(LISTE_TITEL, LISTE_BESCHREIBUNG)]]
+        zeichen = len(LISTE_TITEL) + len(LISTE_BESCHREIBUNG)
+        checkpoints = []
+
+    fragments = state.fragments
+    for rang in range(anfang, len(KATEGORIE_NAMEN)):
+        # Packstand vor der Kategorie: (Teil, Embed, Felder im Embed, Zeichen)
+        embeds = messages[-1]
+        checkpoints.append((len(messages) - 1, len(embeds) - 1, len(embeds[-1]["fields"]), zeichen))
+        fragment = fragments.get(rang)
+        if fragment is None:
+            continue
+
+        # Felder abschnittsweise packen, so viele wie in das aktuelle Embed und die Nachricht passen
+        fields, summen = fragment
+        pos, vorher = 0, 0
+        while pos < len(fields):
+            embeds = messages[-1]
+            frei = EMBED_MAX_FIELDS - len(embeds[-1]["fields"])
+            if zeichen + summen[pos] - vorher > MESSAGE_MAX_CHARS or (not frei and len(embeds) >= MESSAGE_MAX_EMBEDS):
+                messages.append([_embed(LISTE_TITEL_FORTSETZUNG)])
+                zeichen = len(LISTE_TITEL_FORTSETZUNG)
+                embeds = messages[-1]
+                frei = EMBED_MAX_FIELDS
+            elif not frei:
+                embeds.append(_embed())
+                frei = EMBED_MAX_FIELDS
+            # Das nächste Feld kommt immer hinein, die folgenden, solange Embed und Nachricht nicht voll sind
+            ende = max(pos + 1, bisect_right(summen, vorher + MESSAGE_MAX_CHARS - zeichen, pos, min(len(fields), pos + frei)))
+            embeds[-1]["fields"].extend(fields[pos:ende])
+            zeichen += summen[ende - 1] - vorher
+            vorher = summen[ende - 1]
+            pos = ende
+
+    state.packed = (messages, checkpoints)
+    return messages
+
+
+def same_part(sent, part):
+    """Return whether a sent part matches a rendered one; unchanged parts are the same object"""
+    return sent is part or sent == part
+
+
+def to_embeds(part):
+    """Build the embeds of one rendered message part"""
+    return [discord.Embed.from_dict(embed) for embed in part]
@@ -0,0 +1,213 @@
+import json
+import sys
+
+# Status-Bytes pro Eintrag; der Wert ist gleichzeitig der Index in STATUS_EMOJIS
+STATUS_NEIN = 0
+STATUS_JA = 1
+STATUS_ENTFERNT = 0xFF  # Grabstein für entfernte Einträge
+STATUS_EMOJIS = ("❌", "✅")
+STATUS_BY_EMOJI = {emoji: status for status, emoji in enumerate(STATUS_EMOJIS)}
+
+# Reihenfolge der Rollenkategorien; der Index ist der Rang der Kategorie
+ROLLEN_REIHENFOLGE = ("Chefarzt", "Praxisleitung", "Arzt", "Ausbildung", "Praktikant")
+KATEGORIE_ANDERE = len(ROLLEN_REIHENFOLGE)
+KATEGORIE_NAMEN = ROLLEN_REIHENFOLGE + ("Andere",)
+
+
+
+class ListEntry:
+    """A single name on a list"""
+
+    __slots__ = ("name", "member_id", "category")
+
+    def __init__(self, name, member_id, category):
+        self.name = name
+        self.member_id = member_id
+        self.category = category
+
+
+_ENTRY_SIZE = sys.getsizeof(ListEntry("", None, 0))
+_FIELD_SIZE = sys.getsizeof({"name": "", "value": "", "inline": True})
+
+
+class ListState:
+    """
+    Authoritative in-memory model of a list message.
+
+    Entries are kept in insertion order with a parallel status byte per entry.
+    Names and member IDs map to entry indexes, so reactions and edits touch a
+    single entry in O(1). Removed entries are tombstoned and compacted lazily.
+
+    Each category keeps the indexes of its entries, and every change marks its
+    category dirty, so the renderer only rebuilds the categories that changed.
+
+    A list too large for one message continues in further messages, whose IDs
+    are kept in ``part_ids`` in display order after ``message_id``.
+    """
+
+    __slots__ = (
+        "message_id", "channel_id", "guild_id", "author_id", "user_message_id",
+        "part_ids", "sent_parts", "entries", "status", "categories", "fragments", "packed",
+        "_by_name", "_by_member", "_removed", "_dirty",
+    )
+
+    def __init__(self, author_id, user_message_id, guild_id, channel_id, message_id=None):
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.author_id = author_id
+        self.user_message_id = user_message_id
+        # IDs der Folgenachrichten großer Listen
+        self.part_ids = []
+        # Teilnummer -> zuletzt gesendete Embeds, um unveränderte Teile nicht zu bearbeiten
+        self.sent_parts = {}
+        self.entries = []
+        self.status = bytearray()
+        # rang -> {index: None} in Einfügereihenfolge
+        self.categories = {}
+        # rang -> (gerenderte Felder, laufende Zeichensummen) der Kategorie (vom Renderer gepflegt)
+        self.fragments = {}
+        # (Teile, Packstände je Kategorie) des letzten Renderns (vom Renderer gepflegt)
+        self.packed = None
+        self._by_name = {}
+        self._by_member = {}
+        self._removed = 0
+        self._dirty = set()
+
+    def __len__(self):
+        return len(self.entries) - self._removed
+
+    def add(self, name, member_id=None, category=KATEGORIE_ANDERE, status=STATUS_NEIN):
+        """Append a name; returns its index or None if it is already listed"""
+        key = name.casefold()
+        if key in self._by_name:
+            return None
+        index = len(self.entries)
+        self.entries.append(ListEntry(name, member_id, category))
+        self.status.append(status)
+        self._by_name[key] = index
+        if member_id is not None:
+            self._by_member.setdefault(member_id, index)
+        self.categories.setdefault(category, {})[index] = None
+        self._dirty.add(category)
+        return index
+
+    def remove(self, name):
+        """Remove a name from the list; returns False if it was not listed"""
+        index = self._by_name.pop(name.casefold(), None)
+        if index is None:
+            return False
+        entry = self.entries[index]
+        if self._by_member.get(entry.member_id) == index:
+            del self._by_member[entry.member_id]
+        indexes = self.categories[entry.category]
+        del indexes[index]
+        if not indexes:
+            del self.categories[entry.category]
+        self._dirty.add(entry.category)
+        self.status[index] = STATUS_ENTFERNT
+        self._removed += 1
+        if self._removed > len(self.entries) // 2:
+            self._compact()
+        return True
+
+    def find(self, member):
+        """Return the index of the entry belonging to a member, if any"""
+        index = self._by_member.get(member.id)
+        if index is not None:
+            return index
+        # Über den Namen nur Einträge, die keinem anderen Mitglied zugeordnet sind
+        for name in (member.display_name, member.name):
+            index = self._by_name.get(name.casefold())
+            if index is not None and self.entries[index].member_id is None:
+                return index
+        return None
+
+    def set_status(self, index, status):
+        """Set the status byte of an entry; returns True if it changed"""
+        if self.status[index] == status:
+            return False
+        self.status[index] = status
+        self._dirty.add(self.entries[index].category)
+        return True
+
+    def take_dirty(self):
+        """Return the categories changed since the last call and reset them"""
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def names(self):
+        """Return the listed names in insertion order"""
+        return [e.name for e, s in zip(self.entries, self.status) if s != STATUS_ENTFERNT]
+
+    def sync_names(self, neue_namen, resolve):
+        """
+        Bring the list in line with ``neue_namen``.
+
+        ``resolve`` maps a new name to ``(member_id, category)``. Returns the
+        added and removed names.
+        """
+        neue_keys = {name.casefold() for name in neue_namen}
+        entfernt = [name for name in self.names() if name.casefold() not in neue_keys]
+        for name in entfernt:
+            self.remove(name)
+
+        hinzugefuegt = []
+        for name in neue_namen:
+            if name.casefold() not in self._by_name:
+                member_id, category = resolve(name)
+                self.add(name, member_id, category)
+                hinzugefuegt.append(name)
+        return hinzugefuegt, entfernt
+
+    def approx_size(self):
+        """Estimate the memory used by the state in bytes"""
+        size = sys.getsizeof(self) + sys.getsizeof(self.entries) + sys.getsizeof(self.status)
+        size += sys.getsizeof(self._by_name) + sys.getsizeof(self._by_member)
+        size += sys.getsizeof(self.categories) + sys.getsizeof(self.fragments)
+        for entry in self.entries:
+            # Eintrag, Name, Schlüssel im Namensindex und gerendertes Feld
+            size += _ENTRY_SIZE + _FIELD_SIZE + 3 * sys.getsizeof(entry.name)
+        return size
+
+    def message_ids(self):
+        """Return the IDs of all messages of the list in display order"""
+        return [self.message_id, *self.part_ids]
+
+    def to_row(self):
+        """Serialize the state into a row for the list store"""
+        entries = [
+            [e.name, e.member_id, e.category, s]
+            for e, s in zip(self.entries, self.status) if s != STATUS_ENTFERNT
+        ]
+        return (
+            self.message_id, self.channel_id, self.guild_id, self.author_id,
+            self.user_message_id, json.dumps(entries, ensure_ascii=False, separators=(",", ":")),
+            json.dumps(self.part_ids) if self.part_ids else None,
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        """Rebuild a state from a row of the list store"""
+        message_id, channel_id, guild_id, author_id, user_message_id, entries, part_ids = row
+        state = cls(author_id, user_message_id, guild_id, channel_id, message_id)
+        if part_ids:
+            state.part_ids = json.loads(part_ids)
+        for name, member_id, category, status in json.loads(entries):
+            state.add(name, member_id, category, status)
+        return state
+
+    def _compact(self):
+        lebend = [(e, s) for e, s in zip(self.entries, self.status) if s != STATUS_ENTFERNT]
+        self.entries = [e for e, _ in lebend]
+        self.status = bytearray(s for _, s in lebend)
+        self._by_name = {}
+        self._by_member = {}
+        self.categories = {}
+        for index, entry in enumerate(self.entries):
+            self._by_name[entry.name.casefold()] = index
+            if entry.member_id is not None:
+                self._by_member.setdefault(entry.member_id, index)
+            self.categories.setdefault(entry.category, {})[index] = None
+        self._removed = 0
+
@@ -0,0 +1,189 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from list_state import ListState
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lists (
+    message_id INTEGER PRIMARY KEY,
+    channel_id INTEGER,
+    guild_id INTEGER,
+    author_id INTEGER,
+    user_message_id INTEGER,
+    entries TEXT NOT NULL,
+    part_ids TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lists_user_message ON lists (user_message_id);
+CREATE INDEX IF NOT EXISTS lists_updated_at ON lists (updated_at);
+"""
+
+_COLUMNS = "message_id, channel_id, guild_id, author_id, user_message_id, entries, part_ids"
+
+
+class ListStore:
+    """
+    Durable SQLite store for list states.
+
+    The database runs in WAL mode. ``save`` and ``delete`` only record the
+    latest row per list in memory; a background writer thread writes all
+    pending rows in one transaction every ``batch_interval`` seconds, so the
+    gateway loop never waits on disk I/O. Reads use their own connection, are
+    blocking and meant to be run in an executor.
+    """
+
+    def __init__(self, path, batch_interval=1.0):
+        self.path = path
+        self.batch_interval = batch_interval
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._writer = None
+        self.rows_written = 0
+        self.batches_written = 0
+        self.rows_purged = 0
+
+        self._writer_conn = self._connect()
+        self._writer_conn.executescript(_SCHEMA)
+        self._reader = self._connect()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def start(self):
+        """Start the background writer thread"""
+        if self._writer and self._writer.is_alive():
+            return
+        self._stopped.clear()
+        self._writer = threading.Thread(target=self._write_loop, name="list-store-writer")
+        self._writer.daemon = True
+        self._writer.start()
+        logger.info(f"List store writer started ({self.path})")
+
+    def save(self, state):
+        """Queue the current state of a list for writing"""
+        row = state.to_row()
+        with self._pending_lock:
+            self._pending[state.message_id] = row
+
+    def delete(self, message_id):
+        """Queue the removal of a list"""
+        with self._pending_lock:
+            self._pending[message_id] = None
+
+    def load(self, message_id):
+        """Load a single list state by its message ID (blocking)"""
+        with self._pending_lock:
+            if message_id in self._pending:
+                # Noch nicht geschriebene Änderungen sind aktueller als die Datenbank
+                row = self._pending[message_id]
+                return ListState.from_row(row) if row else None
+        with self._read_lock:
+            row = self._reader.execute(
+                f"SELECT {_COLUMNS} FROM lists WHERE message_id = ?", (message_id,)
+            ).fetchone()
+        return ListState.from_row(row) if row else None
+
+    def load_index(self):
+        """Return ``(message_id, user_message_id, part_ids)`` for all stored lists (blocking)"""
+        with self._read_lock:
+            rows = self._reader.execute("SELECT message_id, user_message_id, part_ids FROM lists").fetchall()
+        return [
+            (message_id, user_message_id, json.loads(part_ids) if part_ids else [])
+            for message_id, user_message_id, part_ids in rows
+        ]
+
+    def purge(self, max_age):
+        """
+        Delete the lists not changed for ``max_age`` seconds (blocking).
+
+        Lists with unwritten changes are kept. Returns the IDs of the
+        deleted lists.
+        """
+        cutoff = time.time() - max_age
+        with self._write_lock:
+            rows = self._writer_conn.execute(
+                "SELECT message_id FROM lists WHERE updated_at < ?", (cutoff,)
+            ).fetchall()
+            with self._pending_lock:
+                # Ausstehende Zeilen sind neuer als die Datenbank
+                message_ids = [message_id for message_id, in rows if message_id not in self._pending]
+            with self._writer_conn:
+                self._writer_conn.executemany(
+                    "DELETE FROM lists WHERE message_id = ? AND updated_at < ?",
+                    [(message_id, cutoff) for message_id in message_ids]
+                )
+        self.rows_purged += len(message_ids)
+        return message_ids
+
+    def flush(self):
+        """Write all pending rows now (blocking)"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        upserts = [row + (time.time(),) for row in pending.values() if row is not None]
+        deletes = [(message_id,) for message_id, row in pending.items() if row is None]
+        try:
+            with self._write_lock:
+                with self._writer_conn:
+                    if upserts:
+                        self._writer_conn.executemany(
+                            f"INSERT OR REPLACE INTO lists ({_COLUMNS}, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            upserts
+                        )
+                    if deletes:
+                        self._writer_conn.executemany("DELETE FROM lists WHERE message_id = ?", deletes)
+        except sqlite3.Error:
+            # Nicht geschriebene Zeilen zurücklegen, ohne neuere zu überschreiben
+            with self._pending_lock:
+                for message_id, row in pending.items():
+                    self._pending.setdefault(message_id, row)
+            raise
+        self.rows_written += len(pending)
+        self.batches_written += 1
+
+    def _write_loop(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.batch_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error(f"Error writing list store: {e}")
+
+    def close(self):
+        """Stop the writer and write everything still pending"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._writer:
+            self._writer.join(timeout=5)
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.error(f"Error writing list store: {e}")
+        logger.info("List store closed")
+
+    def stats(self):
+        """Return counters about the store"""
+        with self._pending_lock:
+            pending = len(self._pending)
+        return {
+            'path': self.path,
+            'pending_rows': pending,
+            'rows_written': self.rows_written,
+            'batches_written': self.batches_written,
+            'rows_purged': self.rows_purged,
+        }
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class ListUpdateQueue:
+    """
+    Serializes the changes of each list.
+
+    Every list gets its own FIFO queue and a worker task that applies the
+    queued updates in order against the in-memory state. An update is a
+    plain function ``update(state) -> bool`` that returns whether it changed
+    the list; after a run of updates ``on_change(state, changes)`` is called
+    once with the number of updates that changed something. Workers of different lists run in parallel and exit
+    when their queue is empty.
+
+    ``apply`` additionally returns a future for callers that have to answer
+    with the resulting state, such as a button interaction.
+    """
+
+    def __init__(self, load, on_change):
+        self._load = load
+        self._on_change = on_change
+        self._queues = {}
+        self.submitted = 0
+        self.applied = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def submit(self, key, update):
+        """Queue an update for a list and make sure its worker is running"""
+        self._enqueue(key, update, None)
+
+    def apply(self, key, update):
+        """Queue an update and return a future resolved with the list state once it ran (None if the list is gone)"""
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(key, update, future)
+        return future
+
+    def _enqueue(self, key, update, future):
+        self.submitted += 1
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = deque()
+            asyncio.get_running_loop().create_task(self._work(key, queue))
+        queue.append((update, future))
+        self.max_depth = max(self.max_depth, len(queue))
+
+    async def _work(self, key, queue):
+        try:
+            while queue:
+                try:
+                    state = await self._load(key)
+                except Exception as e:
+                    logger.error(f"Error loading list {key}: {e}", extra={'list_id': key})
+                    state = None
+                if state is None:
+                    # Die Liste existiert nicht mehr
+                    self.dropped += len(queue)
+                    for _, future in queue:
+                        if future is not None and not future.done():
+                            future.set_result(None)
+                    queue.clear()
+                    break
+
+                changes = 0
+                while queue:
+                    update, future = queue.popleft()
+                    try:
+                        if update(state):
+                            changes += 1
+                        self.applied += 1
+                    except Exception as e:
+                        self.failed += 1
+                        logger.error(f"Error applying update to list {key}: {e}", extra={'list_id': key})
+                    if future is not None and not future.done():
+                        future.set_result(state)
+                if changes:
+                    self._on_change(state, changes)
+        finally:
+            del self._queues[key]
+
+    def stats(self):
+        """Return queue depth and throughput counters (safe to call from other threads)"""
+        # Kopie der Warteschlangen, der Loop fügt währenddessen Listen hinzu und entfernt sie
+        queues = list(self._queues.values())
+        return {
+            'active_lists': len(queues),
+            'queued': sum(len(queue) for queue in queues),
+            'submitted': self.submitted,
+            'applied': self.applied,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'max_depth': self.max_depth,
+        }
@@ -0,0 +1,26 @@
+import discord
+
+from list_state import STATUS_EMOJIS, STATUS_JA, STATUS_NEIN
+
+
+class StatusView(discord.ui.View):
+    """
+    Persistent ✅/❌ buttons under a list message.
+
+    The custom IDs are fixed, so one registered view handles the buttons of
+    every list, also after a restart. The list is identified by the message
+    the clicked button belongs to; ``on_status(interaction, status)`` applies
+    the change and answers the interaction.
+    """
+
+    def __init__(self, on_status):
+        super().__init__(timeout=None)
+        self._on_status = on_status
+
+    @discord.ui.button(emoji=STATUS_EMOJIS[STATUS_JA], style=discord.ButtonStyle.success, custom_id="liste:status:ja")
+    async def ja(self, interaction, button):
+        await self._on_status(interaction, STATUS_JA)
+
+    @discord.ui.button(emoji=STATUS_EMOJIS[STATUS_NEIN], style=discord.ButtonStyle.danger, custom_id="liste:status:nein")
+    async def nein(self, interaction, button):
+        await self._on_status(interaction, STATUS_NEIN)
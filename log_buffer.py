@@ -0,0 +1,132 @@
+import datetime
+import logging
+import os
+import sys
+from collections import deque
+
+# Anzahl der Einträge, die im Speicher durchsucht werden können
+LOG_BUFFER_SIZE = int(os.environ.get("LOG_BUFFER_SIZE", "20000"))
+MAX_QUERY_LIMIT = 1000
+
+
+class _Entry(tuple):
+    """One buffered record: ``(created, levelno, logger, message, guild_id, list_id)``"""
+
+    __slots__ = ()
+
+    def to_dict(self):
+        created, levelno, name, message, guild_id, list_id = self
+        return {
+            'time': datetime.datetime.fromtimestamp(created).isoformat(sep=' ', timespec='milliseconds'),
+            'level': logging.getLevelName(levelno),
+            'logger': name,
+            'message': message,
+            'guild_id': guild_id,
+            'list_id': list_id,
+        }
+
+
+def parse_level(value):
+    """Parse a level name or number; None if it is empty or unknown"""
+    if not value:
+        return None
+    if str(value).isdigit():
+        return int(value)
+    level = logging.getLevelName(str(value).upper())
+    return level if isinstance(level, int) else None
+
+
+def parse_since(value):
+    """Parse a Unix timestamp or an ISO date and time into a timestamp; None if invalid"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+# Parameter von /api/logs, die statt der Datei den Speicher abfragen
+QUERY_PARAMS = ('level', 'logger', 'since', 'contains', 'guild_id', 'list_id', 'limit')
+
+
+def query_from_args(args):
+    """Build the keyword arguments of ``LogRingBuffer.query`` from Flask request arguments"""
+    return {
+        'level': parse_level(args.get('level')),
+        'logger': args.get('logger') or None,
+        'since': parse_since(args.get('since')),
+        'contains': args.get('contains') or None,
+        'guild_id': args.get('guild_id', type=int),
+        'list_id': args.get('list_id', type=int),
+        'limit': args.get('limit', 100, type=int),
+    }
+
+
+class LogRingBuffer(logging.Handler):
+    """
+    Bounded in-memory buffer of structured log records.
+
+    Every record is kept as a small tuple of its time, level, logger,
+    message and the guild and list IDs passed as ``extra``; logger names are
+    interned, so the buffer holds little more than the messages. The oldest
+    records are dropped once ``capacity`` is reached. ``query`` filters
+    them without touching the log file.
+    """
+
+    def __init__(self, capacity=LOG_BUFFER_SIZE, level=logging.NOTSET):
+        super().__init__(level)
+        self._entries = deque(maxlen=capacity)
+
+    def emit(self, record):
+        try:
+            message = record.getMessage()
+            if record.exc_info and not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            if record.exc_text and record.exc_text not in message:
+                message = f"{message}\n{record.exc_text}"
+            self._entries.append(_Entry((
+                record.created, record.levelno, sys.intern(record.name), message,
+                getattr(record, 'guild_id', None), getattr(record, 'list_id', None),
+            )))
+        except Exception:
+            self.handleError(record)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def query(self, level=None, logger=None, since=None, contains=None, guild_id=None, list_id=None, limit=100):
+        """
+        Return the newest matching records as dicts, oldest first.
+
+        ``level`` is a minimum level, ``logger`` matches the logger and its
+        children, ``since`` is a timestamp, ``contains`` a case-insensitive
+        part of the message.
+        """
+        limit = max(1, min(limit, MAX_QUERY_LIMIT))
+        prefix = logger + '.' if logger else None
+        needle = contains.lower() if contains else None
+        matches = []
+        # Vom neuesten Eintrag rückwärts, bis genug gefunden sind oder die Zeit erreicht ist
+        for entry in reversed(list(self._entries)):
+            created, levelno, name, message, entry_guild, entry_list = entry
+            if since is not None and created < since:
+                break
+            if level is not None and levelno < level:
+                continue
+            if logger and name != logger and not name.startswith(prefix):
+                continue
+            if guild_id is not None and entry_guild != guild_id:
+                continue
+            if list_id is not None and entry_list != list_id:
+                continue
+            if needle and needle not in message.lower():
+                continue
+            matches.append(entry)
+            if len(matches) >= limit:
+                break
+        return [entry.to_dict() for entry in reversed(matches)]
@@ -0,0 +1,146 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Log-Datei, die auch /api/logs liest
+LOG_FILE = os.environ.get("LOG_FILE", "discord_bot.log")
+# Rotation nach Größe ("size") oder Zeit ("time")
+LOG_ROTATE = os.environ.get("LOG_ROTATE", "size")
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_ROTATE_WHEN = os.environ.get("LOG_ROTATE_WHEN", "midnight")
+LOG_BACKUP_COUNT = int(os.environ.get("LOG_BACKUP_COUNT", "5"))
+
+# Grundlevel und Level einzelner Logger, z.B. "discord=INFO,discord.gateway=WARNING"
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "DEBUG")
+LOG_LEVELS = os.environ.get("LOG_LEVELS", "discord=INFO")
+
+# Ist die Warteschlange voll, werden Einträge verworfen statt den Aufrufer zu blockieren
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+# Sekunden, die beim Beenden auf das Ausschreiben der Warteschlange gewartet wird
+LOG_STOP_TIMEOUT = 5
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records when the queue is full instead of blocking"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Listener(logging.handlers.QueueListener):
+    """Queue listener whose stop gives up after a timeout instead of hanging on a stuck handler"""
+
+    def stop(self):
+        try:
+            self.queue.put(self._sentinel, timeout=LOG_STOP_TIMEOUT)
+        except queue.Full:
+            return
+        self._thread.join(LOG_STOP_TIMEOUT)
+        self._thread = None
+
+
+_handler = None
+_listener = None
+
+
+def parse_levels(text):
+    """Parse "name=LEVEL,..." into a dict of logger names and levels"""
+    levels = {}
+    for part in text.split(','):
+        name, _, level = part.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def apply_levels(level=None, levels=None):
+    """Set the root level and the levels of individual loggers"""
+    logging.getLogger().setLevel((level or LOG_LEVEL).upper())
+    for name, logger_level in parse_levels(LOG_LEVELS if levels is None else levels).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+
+def file_handler(path=LOG_FILE):
+    """Create the rotating handler of the log file"""
+    if LOG_ROTATE == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+    return logging.handlers.RotatingFileHandler(
+        path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+    )
+
+
+def setup_logging(*handlers, log_file=LOG_FILE, console=True):
+    """
+    Route all logging through a queue to a background listener.
+
+    The calling thread, e.g. the event loop, only puts the record on the
+    queue; the console, the rotating log file and ``handlers`` are written
+    by the listener thread, so a slow disk or pipe never stalls the caller.
+    Replaces any previous configuration, including one from this function.
+    """
+    global _handler, _listener
+    previous = _listener
+
+    targets = []
+    if console:
+        targets.append(logging.StreamHandler())
+    if log_file:
+        targets.append(file_handler(log_file))
+    targets.extend(handlers)
+    formatter = logging.Formatter(LOG_FORMAT)
+    for target in targets:
+        if target.formatter is None:
+            target.setFormatter(formatter)
+
+    handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    listener = _Listener(handler.queue, *targets, respect_handler_level=True)
+    listener.start()
+
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        root.removeHandler(old)
+        old.close()
+    root.addHandler(handler)
+    _handler, _listener = handler, listener
+    apply_levels()
+
+    # Die alte Konfiguration schreibt ihre restlichen Einträge noch aus
+    if previous is not None:
+        _stop(previous)
+
+
+def _stop(listener):
+    listener.stop()
+    for target in listener.handlers:
+        target.close()
+
+
+def stop_logging():
+    """Write out the queued records and stop the listener"""
+    global _listener
+    if _listener is not None:
+        _stop(_listener)
+        _listener = None
+
+
+def log_stats():
+    """Return the fill level of the log queue and the number of dropped records"""
+    if _handler is None:
+        return {}
+    return {'queued': _handler.queue.qsize(), 'queue_size': LOG_QUEUE_SIZE, 'dropped': _handler.dropped}
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,146 @@
+import logging
+import threading
+from collections import deque
+
+# Anzahl der zuletzt ausgegebenen Einträge, ab denen ein Client fortsetzen kann
+STREAM_HISTORY = 1000
+# Höchstens so viele ungesendete Einträge pro Client, ältere werden verworfen
+STREAM_BACKLOG = 500
+# Kommentarzeile, damit Proxys die Verbindung offen halten und Abbrüche bemerkt werden
+STREAM_KEEPALIVE = 15
+
+
+class _Subscriber:
+    """The pending records of one connected client"""
+
+    __slots__ = ("queue", "dropped", "condition")
+
+    def __init__(self, backlog):
+        self.queue = deque(maxlen=backlog)
+        self.dropped = 0
+        self.condition = threading.Condition()
+
+    def push(self, item):
+        with self.condition:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+            self.queue.append(item)
+            self.condition.notify()
+
+    def wait(self, timeout):
+        """Return the pending records and the number dropped since the last call"""
+        with self.condition:
+            if not self.queue:
+                self.condition.wait(timeout)
+            items = list(self.queue)
+            self.queue.clear()
+            dropped, self.dropped = self.dropped, 0
+        return items, dropped
+
+
+class LogBroadcaster(logging.Handler):
+    """
+    Logging handler that fans formatted records out to live subscribers.
+
+    Every record gets an increasing ID and is kept in a ring buffer, so a
+    client that reconnects resumes right after the last ID it received.
+    Each subscriber has its own bounded queue: a slow client loses its
+    oldest records instead of holding up the threads that log.
+    """
+
+    def __init__(self, history=STREAM_HISTORY, backlog=STREAM_BACKLOG, level=logging.NOTSET):
+        super().__init__(level)
+        self.backlog = backlog
+        self._history = deque(maxlen=history)
+        self._subscribers = set()
+        self._subscribers_lock = threading.Lock()
+        self.last_id = 0
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        # Handler.handle hält bereits self.lock, IDs und Verlauf bleiben geordnet
+        self.last_id += 1
+        item = (self.last_id, line)
+        self._history.append(item)
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.push(item)
+
+    def subscribe(self, last_id=None):
+        """
+        Register a client; returns ``(subscriber, replay, gap)``.
+
+        ``replay`` holds the buffered records after ``last_id`` (none without
+        one), ``gap`` is True if records in between are no longer buffered.
+        """
+        subscriber = _Subscriber(self.backlog)
+        self.acquire()
+        try:
+            if last_id is None:
+                replay, gap = [], False
+            elif last_id > self.last_id:
+                # Der Prozess wurde neu gestartet und die IDs beginnen von vorn
+                replay, gap = list(self._history), True
+            else:
+                replay = [item for item in self._history if item[0] > last_id]
+                gap = bool(self._history) and self._history[0][0] > last_id + 1
+            with self._subscribers_lock:
+                self._subscribers.add(subscriber)
+        finally:
+            self.release()
+        return subscriber, replay, gap
+
+    def unsubscribe(self, subscriber):
+        with self._subscribers_lock:
+            self._subscribers.discard(subscriber)
+
+    def stats(self):
+        """Return the number of clients and buffered records"""
+        with self._subscribers_lock:
+            clients = len(self._subscribers)
+        return {'clients': clients, 'buffered': len(self._history), 'last_id': self.last_id}
+
+
+def format_event(data, event_id=None, event=None):
+    """Format one server-sent event; multi-line data becomes several data lines"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in str(data).split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+def stream_logs(broadcaster, last_id=None, keepalive=STREAM_KEEPALIVE):
+    """
+    Yield the records of ``broadcaster`` as server-sent events.
+
+    Records after ``last_id`` that are still buffered are sent first. A
+    ``gap`` event tells the client that records were skipped, either before
+    the oldest buffered record or because the client fell behind.
+    """
+    subscriber, replay, gap = broadcaster.subscribe(last_id)
+    try:
+        # Browser verbinden sich nach einem Abbruch nach 3 Sekunden mit Last-Event-ID neu
+        yield "retry: 3000\n\n"
+        if gap:
+            yield format_event("", event="gap")
+        for event_id, line in replay:
+            yield format_event(line, event_id)
+        while True:
+            items, dropped = subscriber.wait(keepalive)
+            if dropped:
+                yield format_event(dropped, event="gap")
+            if not items:
+                yield ": keepalive\n\n"
+                continue
+            for event_id, line in items:
+                yield format_event(line, event_id)
+    finally:
+        broadcaster.unsubscribe(subscriber)
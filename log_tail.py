@@ -0,0 +1,72 @@
+import os
+
+# Blockgröße beim rückwärts Lesen vom Dateiende
+TAIL_BLOCK_SIZE = 8192
+# Mehr neue Bytes seit dem Cursor werden nicht gelesen, stattdessen nur das Ende
+MAX_READ_BYTES = 256 * 1024
+MAX_TAIL_LINES = 1000
+
+
+def format_cursor(stat, offset):
+    """Build the cursor for a byte offset in the file described by ``stat``"""
+    return f"{stat.st_ino}:{offset}"
+
+
+def parse_cursor(cursor):
+    """Split a cursor into ``(inode, offset)``; None if it is missing or malformed"""
+    try:
+        inode, offset = cursor.split(":")
+        return int(inode), int(offset)
+    except (AttributeError, ValueError):
+        return None
+
+
+def _decode(data):
+    return data.decode("utf-8", errors="replace").splitlines(keepends=True)
+
+
+def _tail(log_file, size, count):
+    """Read backwards block by block; returns the last ``count`` complete lines and their end"""
+    data = b""
+    newlines = 0
+    position = size
+    # Vor der ersten gefundenen Zeile kann ein unvollständiger Rest stehen, daher eine mehr
+    while position > 0 and newlines <= count:
+        step = min(TAIL_BLOCK_SIZE, position)
+        position -= step
+        log_file.seek(position)
+        block = log_file.read(step)
+        newlines += block.count(b"\n")
+        data = block + data
+
+    # Eine gerade geschriebene, unvollständige letzte Zeile folgt beim nächsten Abruf
+    end = data.rfind(b"\n") + 1
+    lines = _decode(data[:end])[-count:] if count else []
+    return lines, position + end
+
+
+def read_log(path, cursor=None, lines=50):
+    """
+    Return ``(lines, cursor, reset)`` for a growing log file.
+
+    Without a cursor the last ``lines`` lines are read by seeking backwards
+    from the end of the file. With the cursor of a previous call only the
+    complete lines written since then are read. ``reset`` is True whenever
+    the result replaces rather than continues what the client has: on the
+    first call, after the file was rotated or truncated, and when too much
+    was written in between to catch up.
+    """
+    lines = max(0, min(lines, MAX_TAIL_LINES))
+    with open(path, "rb") as log_file:
+        stat = os.fstat(log_file.fileno())
+        position = parse_cursor(cursor)
+        if position is not None:
+            inode, offset = position
+            if inode == stat.st_ino and offset <= stat.st_size and stat.st_size - offset <= MAX_READ_BYTES:
+                log_file.seek(offset)
+                data = log_file.read(stat.st_size - offset)
+                end = data.rfind(b"\n") + 1
+                return _decode(data[:end]), format_cursor(stat, offset + end), False
+
+        tail, end = _tail(log_file, stat.st_size, lines)
+        return tail, format_cursor(stat, end), True
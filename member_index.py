@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import time
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+
+class MemberIndex:
+    """
+    Per-guild lookup table from casefolded display name and username to member.
+
+    Replaces the linear scan over ``guild.members`` when resolving the names of
+    a list. The index is built once per guild and kept current through member
+    join, update and remove events.
+    """
+
+    def __init__(self):
+        # guild_id -> {casefolded name -> [member, ...]}
+        self._names = {}
+        # guild_id -> {member_id -> (keys under which the member is indexed)}
+        self._keys = {}
+
+    @staticmethod
+    def _member_keys(member):
+        """Return the casefolded names a member can be found under"""
+        display = member.display_name.casefold()
+        name = member.name.casefold()
+        return (display,) if display == name else (display, name)
+
+    def build(self, guild):
+        """(Re)build the index for a guild from its member cache"""
+        self._names[guild.id] = {}
+        self._keys[guild.id] = {}
+        for member in guild.members:
+            self._add(guild.id, member)
+        logger.debug(f"Member index for guild {guild.id} built with {len(guild.members)} members")
+
+    def drop_guild(self, guild_id):
+        """Forget everything indexed for a guild"""
+        self._names.pop(guild_id, None)
+        self._keys.pop(guild_id, None)
+
+    def add_member(self, member):
+        """Index a member, replacing any stale keys from a previous name"""
+        guild_id = member.guild.id
+        if guild_id not in self._names:
+            # Ungebaute Gilden werden beim ersten Zugriff komplett aufgebaut
+            return
+        self._remove(guild_id, member.id)
+        self._add(guild_id, member)
+
+    def remove_member(self, guild_id, member_id):
+        """Remove a member from the index of a guild"""
+        if guild_id in self._names:
+            self._remove(guild_id, member_id)
+
+    def resolve(self, guild, name):
+        """Return the member whose display name or username matches ``name``"""
+        names = self._names.get(guild.id)
+        if names is None:
+            self.build(guild)
+            names = self._names[guild.id]
+        members = names.get(name.casefold())
+        return members[0] if members else None
+
+    def _add(self, guild_id, member):
+        keys = self._member_keys(member)
+        names = self._names[guild_id]
+        for key in keys:
+            names.setdefault(key, []).append(member)
+        self._keys[guild_id][member.id] = keys
+
+    def _remove(self, guild_id, member_id):
+        keys = self._keys[guild_id].pop(member_id, ())
+        names = self._names[guild_id]
+        for key in keys:
+            members = [m for m in names.get(key, ()) if m.id != member_id]
+            if members:
+                names[key] = members
+            else:
+                names.pop(key, None)
+
+
+class LazyMemberLoader:
+    """
+    Loads the members named in a list on demand.
+
+    Used instead of chunking every guild at startup. Names the index cannot
+    resolve are looked up with a gateway member query, which matches usernames
+    and nicknames by prefix; the returned members are cached by discord.py and
+    added to the index. Names without a match are remembered for ``miss_ttl``
+    seconds, so edits of the same list do not query them again.
+    """
+
+    def __init__(self, index, limit=10, miss_ttl=300, concurrency=4):
+        self._index = index
+        self.limit = limit
+        self.miss_ttl = miss_ttl
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # (guild_id, casefolded name) -> Ablaufzeit des Fehltreffers
+        self._misses = {}
+        self.hits = 0
+        self.known_misses = 0
+        self.queries = 0
+        self.failed = 0
+        self.query_time = 0.0
+
+    async def prefetch(self, guild, names):
+        """Make sure every resolvable name of ``names`` is in the index"""
+        now = time.monotonic()
+        missing = []
+        for name in dict.fromkeys(names):
+            if self._index.resolve(guild, name) is not None:
+                self.hits += 1
+                continue
+            expires = self._misses.get((guild.id, name.casefold()))
+            if expires is not None and expires > now:
+                self.known_misses += 1
+                continue
+            missing.append(name)
+        if missing:
+            await asyncio.gather(*(self._query(guild, name) for name in missing))
+
+    def forget_misses(self, guild_id):
+        """Query the unknown names of a guild again, e.g. after a member joined"""
+        self._misses = {key: expires for key, expires in self._misses.items() if key[0] != guild_id}
+
+    async def _query(self, guild, name):
+        async with self._semaphore:
+            started = time.monotonic()
+            try:
+                members = await guild.query_members(query=name, limit=self.limit)
+            except (asyncio.TimeoutError, discord.ClientException) as e:
+                self.failed += 1
+                logger.warning(f"Member query for '{name}' in guild {guild.id} failed: {e}", extra={'guild_id': guild.id})
+                return
+            self.queries += 1
+            self.query_time += time.monotonic() - started
+
+        for member in members:
+            self._index.add_member(member)
+        if self._index.resolve(guild, name) is None:
+            now = time.monotonic()
+            if len(self._misses) >= 10000:
+                self._misses = {key: expires for key, expires in self._misses.items() if expires > now}
+            self._misses[(guild.id, name.casefold())] = now + self.miss_ttl
+
+    def stats(self):
+        """Return hit and query counters"""
+        return {
+            'hits': self.hits,
+            'known_misses': self.known_misses,
+            'queries': self.queries,
+            'failed': self.failed,
+            'avg_query_ms': round(self.query_time / self.queries * 1000, 1) if self.queries else None,
+            'remembered_misses': len(self._misses),
+        }
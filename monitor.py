@@ -1,27 +1,126 @@
+import os
+import math
+import time
 import logging
 import asyncio
 import threading
-import time
 import datetime
-from bot import run_bot, disconnect_bot
+from collections import Counter
+from bot import run_bot, begin_restart, resume_gateway, gateway_connections, heartbeat_ack_age
+
+# "soft" setzt die Gateway-Sitzung fort, "hard" startet den Bot komplett neu
+SCHEDULED_RESTART_MODE = os.environ.get("SCHEDULED_RESTART_MODE", "soft")
+SCHEDULED_RESTART_HOUR = 6
+
+HEARTBEAT_INTERVAL = 30
+# Erst nach so vielen Prüfungen ohne Verbindung neu starten
+HEARTBEAT_MISSES = 2
+# Abstand (Sekunden), in dem alte gespeicherte Listen gelöscht werden
+LIST_PURGE_INTERVAL = 3600
+# Längste Wartezeit, bevor die Uhrzeit für den täglichen Neustart neu geprüft wird
+SCHEDULE_RECHECK = 300
+BOT_SHUTDOWN_TIMEOUT = 10
+# Längste Wartezeit in Sekunden auf einen auf dem Bot-Loop erstellten Status
+STATUS_TIMEOUT = 5
+
+# Grenzwerte der Lebendigkeitsprüfung in Sekunden, 0 schaltet die Prüfung ab
+LIVENESS_MAX_ACK_AGE = float(os.environ.get("LIVENESS_MAX_ACK_AGE", "180"))
+# Ohne Ereignisse gilt die Verbindung nur als hängend, wenn auch keine Heartbeats bestätigt werden
+LIVENESS_MAX_EVENT_AGE = float(os.environ.get("LIVENESS_MAX_EVENT_AGE", "900"))
+LIVENESS_MAX_LATENCY = float(os.environ.get("LIVENESS_MAX_LATENCY", "10"))
+LIVENESS_MAX_REST_AGE = float(os.environ.get("LIVENESS_MAX_REST_AGE", "120"))
+# Probleme, die sich durch Fortsetzen der Gateway-Sitzung beheben lassen
+GATEWAY_PROBLEMS = {"stale_heartbeat", "stale_events", "high_latency"}
+# Mindestabstand in Sekunden zwischen zwei Messungen der Ereignisrate eines Shards
+SHARD_RATE_INTERVAL = 5
+
 
 logger = logging.getLogger(__name__)
 
+class _ShardSample:
+    """Gateway sequence numbers of a shard for its event rate and freshness"""
+    
+    __slots__ = ("sequence", "sampled_at", "last_sequence", "changed_at", "rate")
+    
+    def __init__(self, sequence, now):
+        self.sequence = sequence
+        self.sampled_at = now
+        self.last_sequence = sequence
+        self.changed_at = now
+        self.rate = None
+
+def format_uptime(start_time):
+    """Format the time since ``start_time`` as days, hours, minutes and seconds"""
+    if not start_time:
+        return "Not started"
+    
+    uptime = datetime.datetime.now() - start_time
+    days = uptime.days
+    hours, remainder = divmod(uptime.seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    
+    return f"{days}d {hours}h {minutes}m {seconds}s"
+
+def next_daily_run(now, hour=SCHEDULED_RESTART_HOUR):
+    """Return the next ``hour``:00 after ``now``"""
+    next_run = datetime.datetime.combine(now.date(), datetime.time(hour))
+    if next_run <= now:
+        next_run += datetime.timedelta(days=1)
+    return next_run
+
+def gateway_staleness(ack_age, event_age):
+    """
+    Return the staleness problems of a gateway connection.
+
+    Heartbeat acknowledgements are the primary signal. A long gap between
+    dispatch events alone is normal for a quiet bot, so it only counts when
+    the heartbeats are stale as well, or cannot be read at all.
+    """
+    ack_stale = bool(LIVENESS_MAX_ACK_AGE) and ack_age is not None and ack_age > LIVENESS_MAX_ACK_AGE
+    events_stale = bool(LIVENESS_MAX_EVENT_AGE) and event_age is not None and event_age > LIVENESS_MAX_EVENT_AGE
+    problems = []
+    if ack_stale:
+        problems.append("stale_heartbeat")
+    if events_stale and (ack_stale or ack_age is None):
+        problems.append("stale_events")
+    return problems
+
+def rest_stalled(now, last_success, started_at, pending):
+    """Return whether queued REST calls have gone without a success for too long"""
+    # Ohne ausstehende Aufrufe ist eine lange Pause kein Fehler
+    if not LIVENESS_MAX_REST_AGE or not pending:
+        return False
+    # Vor dem ersten erfolgreichen Aufruf zählt die Zeit ab dem Start des Bots
+    since = max(last_success or 0, started_at or 0)
+    return now - since > LIVENESS_MAX_REST_AGE
+
 class BotMonitor:
     """
     Monitors the Discord bot and restarts it if it crashes.
+    
+    A single thread runs the event loop for the lifetime of the monitor. The
+    bot, the heartbeat and the daily restart are tasks on that loop, so every
+    timer can be cancelled and stop() returns as soon as the bot is closed.
+    The synchronous methods used by the web app hand their work to the loop.
     """
     
     def __init__(self, bot, token):
         self.bot = bot
         self.token = token
-        self.bot_thread = None
+        self.loop = None
+        self.loop_thread = None
+        self.bot_task = None
+        self.bot_started_at = None
         self.running = False
         self.restart_count = 0
         self.start_time = None
         self.last_restart_time = None
-        self.event_loop = None
         self.lock = threading.Lock()
+        self._restart_lock = None
+        self._stop_event = None
+        self._shard_samples = {}
+        self.shard_restarts = Counter()
+        self._lists_purged_at = None
     
     def start(self):
         """Start the bot and monitoring system"""
@@ -32,140 +131,350 @@ class BotMonitor:
             
             self.running = True
             self.start_time = datetime.datetime.now()
-            self.start_bot()
-            
-            # Start the heartbeat check
-            self._start_heartbeat_check()
-            
-            # Start the scheduled restart at 6:00 AM
-            self._start_scheduled_restart()
+            self.loop = asyncio.new_event_loop()
+            self._restart_lock = asyncio.Lock()
+            self._stop_event = asyncio.Event()
+            self.loop_thread = threading.Thread(target=self._run_loop, name="bot-monitor", daemon=True)
+            self.loop_thread.start()
+    
+    def restart_bot(self):
+        """Restart the Discord bot"""
+        return self._submit(self._restart("hard"))
     
-    def start_bot(self):
-        """Start the Discord bot in a new thread"""
+    def soft_restart_bot(self):
+        """Recycle only the gateway connection, keeping process state and caches"""
+        return self._submit(self._restart("soft"))
+    
+    def restart_shard(self, shard_id, mode="hard"):
+        """Restart a single shard, resuming its session in soft mode"""
+        return self._submit(self._restart_shard(shard_id, mode))
+    
+    def stop(self, timeout=BOT_SHUTDOWN_TIMEOUT + 5):
+        """Stop the bot and monitoring system"""
+        with self.lock:
+            if not self.running:
+                return
+            self.running = False
+            loop, thread = self.loop, self.loop_thread
+        
+        loop.call_soon_threadsafe(self._stop_event.set)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Bot monitor did not stop in time")
+    
+    def _submit(self, coro):
+        """Run a coroutine on the monitor loop from another thread"""
+        with self.lock:
+            if not self.running:
+                coro.close()
+                logger.warning("Bot monitor is not running")
+                return None
+            return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._supervise())
+        finally:
+            # Übrige Aufgaben (z.B. verzögerte Listen-Bearbeitungen) beenden
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+    
+    async def _supervise(self):
+        self._start_bot()
+        tasks = [
+            asyncio.create_task(self._heartbeat()),
+            asyncio.create_task(self._scheduled_restart()),
+        ]
+        logger.info("Heartbeat monitor started")
+        try:
+            await self._stop_event.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._stop_bot()
+            logger.info("Bot monitor stopped")
+    
+    def _start_bot(self):
+        """Start the Discord bot as a task on the monitor loop"""
         if not self.token:
             logger.error("Cannot start bot: Discord token is not set")
             return
         
         logger.info("Starting Discord bot...")
         
-        # Create a new event loop for the bot
-        self.event_loop = asyncio.new_event_loop()
-        
-        def bot_worker():
-            """Worker function to run in the bot thread"""
-            asyncio.set_event_loop(self.event_loop)
-            self.event_loop.run_until_complete(run_bot(self.bot, self.token))
+        # A closed client has to be reset before it can log in again
+        if self.bot.is_closed():
+            self.bot.clear()
         
-        # Start the bot in a new thread
-        self.bot_thread = threading.Thread(target=bot_worker)
-        self.bot_thread.daemon = True
-        self.bot_thread.start()
-        logger.info("Bot thread started")
+        self.bot_started_at = time.time()
+        self.bot_task = asyncio.create_task(run_bot(self.bot, self.token))
     
-    def restart_bot(self):
-        """Restart the Discord bot"""
-        with self.lock:
-            logger.info("Restarting Discord bot...")
-            self.restart_count += 1
-            self.last_restart_time = datetime.datetime.now()
-            
-            # Disconnect the bot if it's running
-            if self.bot_thread and self.bot_thread.is_alive():
-                disconnect_bot(self.bot)
-                
-                # Wait for the thread to terminate
-                self.bot_thread.join(timeout=5)
-            
-            # Start a new bot instance
-            self.start_bot()
-            logger.info("Bot restarted successfully")
-    
-    def _start_heartbeat_check(self):
-        """Start a thread to periodically check if the bot is still running"""
-        def heartbeat_worker():
-            while self.running:
-                time.sleep(30)  # Check every 30 seconds
-                
-                with self.lock:
-                    # Check if the bot thread is still alive
-                    if not self.bot_thread or not self.bot_thread.is_alive():
-                        logger.warning("Bot thread is not running, attempting to restart...")
-                        self.restart_bot()
-                    
-                    # Check if the bot is connected to Discord
-                    if not self.is_bot_running():
-                        logger.warning("Bot is not connected to Discord, attempting to restart...")
-                        self.restart_bot()
+    async def _stop_bot(self):
+        """Close the bot and wait for its task to finish"""
+        task = self.bot_task
+        if task is None or task.done():
+            return
         
-        heartbeat_thread = threading.Thread(target=heartbeat_worker)
-        heartbeat_thread.daemon = True
-        heartbeat_thread.start()
-        logger.info("Heartbeat monitor started")
+        logger.info("Disconnecting bot...")
+        await self.bot.close()
+        done, _ = await asyncio.wait({task}, timeout=BOT_SHUTDOWN_TIMEOUT)
+        if not done:
+            logger.warning("Bot did not shut down in time, cancelling it")
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        logger.info("Bot disconnected")
     
-    def _start_scheduled_restart(self):
-        """Start a thread to restart the bot at 6:00 AM every day"""
-        def schedule_worker():
-            while self.running:
-                # Get current time
-                now = datetime.datetime.now()
-                
-                # Calculate time until next 6:00 AM
-                if now.hour >= 6:
-                    # If it's already past 6 AM, schedule for next day
-                    next_run = now.replace(day=now.day+1, hour=6, minute=0, second=0, microsecond=0)
-                else:
-                    # If it's before 6 AM, schedule for today
-                    next_run = now.replace(hour=6, minute=0, second=0, microsecond=0)
-                
-                # Calculate seconds until next run
-                seconds_until_restart = (next_run - now).total_seconds()
-                
-                logger.info(f"Scheduled restart in {seconds_until_restart} seconds (at 6:00 AM)")
-                
-                # Sleep until the scheduled time
-                time.sleep(seconds_until_restart)
-                
-                # Perform restart
-                logger.info("Performing scheduled daily restart at 6:00 AM")
-                self.restart_bot()
+    def _bot_alive(self):
+        return self.bot_task is not None and not self.bot_task.done()
+    
+    async def _restart(self, mode):
+        async with self._restart_lock:
+            try:
+                await self._restart_locked(mode)
+            except Exception as e:
+                logger.error(f"Error restarting bot: {e}")
+    
+    async def _restart_locked(self, mode):
+        if mode == "soft":
+            if self._bot_alive() and self.is_bot_running():
+                logger.info("Soft-restarting Discord bot (gateway resume)...")
+                self.restart_count += 1
+                self.last_restart_time = datetime.datetime.now()
+                await resume_gateway(self.bot)
+                return
+            logger.warning("Bot is not connected, falling back to a full restart")
         
-        schedule_thread = threading.Thread(target=schedule_worker)
-        schedule_thread.daemon = True
-        schedule_thread.start()
-        logger.info("Scheduled restart at 6:00 AM configured")
+        logger.info("Restarting Discord bot...")
+        self.restart_count += 1
+        self.last_restart_time = datetime.datetime.now()
+        begin_restart(self.bot, "hard")
+        await self._stop_bot()
+        self._start_bot()
+        logger.info("Bot restarted successfully")
     
-    def stop(self):
-        """Stop the bot and monitoring system"""
-        with self.lock:
-            if not self.running:
+    async def _restart_shard(self, shard_id, mode):
+        async with self._restart_lock:
+            shard = self.bot.get_shard(shard_id) if self.is_sharded() else None
+            if shard is None:
+                logger.warning(f"Cannot restart shard {shard_id}: no such shard")
                 return
+            try:
+                self.shard_restarts[shard_id] += 1
+                if mode == "soft" and not shard.is_closed():
+                    logger.info(f"Soft-restarting shard {shard_id} (gateway resume)...")
+                    await resume_gateway(self.bot, shard_id)
+                else:
+                    logger.info(f"Reconnecting shard {shard_id}...")
+                    await shard.reconnect()
+            except Exception as e:
+                logger.error(f"Error restarting shard {shard_id}: {e}")
+    
+    async def _check_shards(self, misses):
+        """Restart the shards that were unhealthy in consecutive checks"""
+        for shard in self.get_shards():
+            shard_id, problems = shard['id'], shard['problems']
+            if not problems:
+                misses.pop(shard_id, None)
+                continue
+            misses[shard_id] = misses.get(shard_id, 0) + 1
+            if misses[shard_id] < HEARTBEAT_MISSES:
+                continue
+            del misses[shard_id]
+            logger.warning(f"Shard {shard_id} is unhealthy ({', '.join(problems)}), attempting to restart it...")
+            await self._restart_shard(shard_id, "soft" if GATEWAY_PROBLEMS.issuperset(problems) else "hard")
+    
+    async def _heartbeat(self):
+        """Periodically check that the bot is running and its connections are alive"""
+        misses = 0
+        shard_misses = {}
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            self._sweep_lists()
+            await self._purge_lists()
+            if self._restart_lock.locked() or not self.token:
+                continue
             
-            self.running = False
+            if not self._bot_alive():
+                logger.warning("Bot task is not running, attempting to restart...")
+                mode = "hard"
+            else:
+                problems = self.get_liveness()['problems']
+                if self.is_sharded() and "not_connected" not in problems:
+                    # Hängende Shards werden einzeln neu gestartet
+                    await self._check_shards(shard_misses)
+                    problems = [p for p in problems if p not in GATEWAY_PROBLEMS]
+                if not problems:
+                    misses = 0
+                    continue
+                misses += 1
+                if misses < HEARTBEAT_MISSES:
+                    continue
+                logger.warning(f"Bot is unhealthy ({', '.join(problems)}), attempting to restart...")
+                # Hängendes Gateway: Sitzung fortsetzen, sonst komplett neu starten
+                mode = "soft" if GATEWAY_PROBLEMS.issuperset(problems) else "hard"
             
-            # Disconnect the bot
-            disconnect_bot(self.bot)
+            misses = 0
+            await self._restart(mode)
+    
+    def _sweep_lists(self):
+        """Expire idle lists of the list cache; runs on the bot loop, which owns the cache"""
+        cache = getattr(self.bot, 'list_cache', None)
+        if cache is not None:
+            cache.sweep()
+    
+    async def _purge_lists(self):
+        """Delete stored lists past their retention, at most every ``LIST_PURGE_INTERVAL`` seconds"""
+        cache = getattr(self.bot, 'list_cache', None)
+        now = time.monotonic()
+        if cache is None or (self._lists_purged_at is not None and now - self._lists_purged_at < LIST_PURGE_INTERVAL):
+            return
+        self._lists_purged_at = now
+        try:
+            await cache.purge()
+        except Exception as e:
+            logger.error(f"Error purging old lists: {e}")
+    
+    async def _scheduled_restart(self):
+        """Restart the bot at 6:00 AM every day"""
+        while True:
+            next_run = next_daily_run(datetime.datetime.now())
+            logger.info(f"Scheduled {SCHEDULED_RESTART_MODE} restart at {next_run:%Y-%m-%d %H:%M}")
             
-            # Wait for the thread to terminate
-            if self.bot_thread:
-                self.bot_thread.join(timeout=5)
+            # In Etappen schlafen, damit Zeitumstellungen und Uhrkorrekturen berücksichtigt werden
+            while True:
+                remaining = (next_run - datetime.datetime.now()).total_seconds()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(remaining, SCHEDULE_RECHECK))
             
-            logger.info("Bot monitor stopped")
+            logger.info(f"Performing scheduled daily {SCHEDULED_RESTART_MODE} restart at 6:00 AM")
+            await self._restart(SCHEDULED_RESTART_MODE)
     
     def is_bot_running(self):
         """Check if the bot is connected to Discord"""
         return self.bot.is_ready() if hasattr(self.bot, 'is_ready') else False
     
-    def get_uptime(self):
-        """Get the bot's uptime as a formatted string"""
-        if not self.start_time:
-            return "Not started"
+    def get_liveness(self):
+        """Get the freshness of the gateway and REST connections and any threshold violations"""
+        now = time.time()
+        connected = self.is_bot_running()
+        
+        event_age = None
+        ack_age = None
+        if connected:
+            with self.lock:
+                for shard_id, ws in gateway_connections(self.bot):
+                    # Die Sequenznummer steigt mit jedem Dispatch-Ereignis, ihre letzte
+                    # Änderung ist auf eine Prüfung genau das letzte Ereignis
+                    sample = self._sample_shard(shard_id, ws.sequence if ws else None, now)
+                    age = now - sample.changed_at
+                    event_age = age if event_age is None else min(event_age, age)
+                    # Heartbeat-Bestätigungen (op 11) kommen auch bei einem ruhigen Bot regelmäßig an
+                    age = heartbeat_ack_age(ws)
+                    if age is not None:
+                        ack_age = age if ack_age is None else max(ack_age, age)
+        latency = self.bot.latency if connected else None
+        if latency is not None and not math.isfinite(latency):
+            latency = None
+        
+        rest = getattr(self.bot, 'rest', None)
+        last_success = rest.last_success if rest else None
+        rest_pending = rest.pending() if rest else 0
+        rest_age = now - last_success if last_success else None
         
-        uptime = datetime.datetime.now() - self.start_time
-        days = uptime.days
-        hours, remainder = divmod(uptime.seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
+        problems = []
+        if not connected:
+            problems.append("not_connected")
+        else:
+            problems.extend(gateway_staleness(ack_age, event_age))
+            if LIVENESS_MAX_LATENCY and latency is not None and latency > LIVENESS_MAX_LATENCY:
+                problems.append("high_latency")
+            if rest_stalled(now, last_success, self.bot_started_at, rest_pending):
+                problems.append("rest_stalled")
+        
+        return {
+            'healthy': not problems,
+            'problems': problems,
+            'last_heartbeat_ack_age_s': round(ack_age, 1) if ack_age is not None else None,
+            'last_event_age_s': round(event_age, 1) if event_age is not None else None,
+            'latency_ms': round(latency * 1000, 1) if latency is not None else None,
+            'last_rest_success_age_s': round(rest_age, 1) if rest_age is not None else None,
+            'rest_pending': rest_pending,
+            'thresholds': {
+                'max_heartbeat_ack_age_s': LIVENESS_MAX_ACK_AGE,
+                'max_event_age_s': LIVENESS_MAX_EVENT_AGE,
+                'max_latency_s': LIVENESS_MAX_LATENCY,
+                'max_rest_age_s': LIVENESS_MAX_REST_AGE,
+            },
+        }
+    
+    def is_sharded(self):
+        """Check if the bot runs in auto-sharded mode"""
+        return bool(getattr(self.bot, 'shards', None))
+    
+    def get_shards(self):
+        """Get latency, guild count, event rate and health of every shard"""
+        if not self.is_bot_running():
+            return []
         
-        return f"{days}d {hours}h {minutes}m {seconds}s"
+        now = time.time()
+        guilds = Counter(guild.shard_id for guild in self.bot.guilds)
+        shards = []
+        with self.lock:
+            for shard_id, ws in gateway_connections(self.bot):
+                sample = self._sample_shard(shard_id, ws.sequence if ws else None, now)
+                closed = ws is None or not ws.open
+                latency = None if closed or not math.isfinite(ws.latency) else ws.latency
+                event_age = now - sample.changed_at
+                ack_age = None if closed else heartbeat_ack_age(ws)
+                
+                problems = []
+                if closed:
+                    problems.append("closed")
+                else:
+                    problems.extend(gateway_staleness(ack_age, event_age))
+                    if LIVENESS_MAX_LATENCY and latency is not None and latency > LIVENESS_MAX_LATENCY:
+                        problems.append("high_latency")
+                
+                shards.append({
+                    'id': shard_id,
+                    'healthy': not problems,
+                    'problems': problems,
+                    'latency_ms': round(latency * 1000, 1) if latency is not None else None,
+                    'guilds': guilds.get(shard_id, 0),
+                    'events_per_s': round(sample.rate, 2) if sample.rate is not None else None,
+                    'last_heartbeat_ack_age_s': round(ack_age, 1) if ack_age is not None else None,
+                    'last_event_age_s': round(event_age, 1),
+                    'restarts': self.shard_restarts.get(shard_id, 0),
+                })
+        return shards
+    
+    def _sample_shard(self, shard_id, sequence, now):
+        sample = self._shard_samples.get(shard_id)
+        if sample is None or sequence is None:
+            sample = self._shard_samples[shard_id] = _ShardSample(sequence, now)
+            return sample
+        if sequence != sample.last_sequence:
+            sample.last_sequence = sequence
+            sample.changed_at = now
+        elapsed = now - sample.sampled_at
+        if elapsed >= SHARD_RATE_INTERVAL:
+            # Nach einer neuen Sitzung beginnt die Sequenznummer wieder bei 1
+            delta = sequence - (sample.sequence or 0)
+            sample.rate = (delta if delta >= 0 else sequence) / elapsed
+            sample.sequence = sequence
+            sample.sampled_at = now
+        return sample
+    
+    def get_uptime(self):
+        """Get the bot's uptime as a formatted string"""
+        return format_uptime(self.start_time)
     
     def get_last_restart_time(self):
         """Get the time of the last restart"""
@@ -182,3 +491,76 @@ class BotMonitor:
         if hasattr(self.bot, 'guilds'):
             return len(self.bot.guilds)
         return 0
+    
+    def get_edit_stats(self):
+        """Get counters of the list edit coalescer"""
+        coalescer = getattr(self.bot, 'edit_coalescer', None)
+        return coalescer.stats() if coalescer else {}
+    
+    def get_list_cache_stats(self):
+        """Get size, hit rate and eviction counters of the list cache"""
+        cache = getattr(self.bot, 'list_cache', None)
+        return cache.stats() if cache else {}
+    
+    def get_list_update_stats(self):
+        """Get queue depth and throughput of the per-list update queues"""
+        updates = getattr(self.bot, 'list_updates', None)
+        return updates.stats() if updates else {}
+    
+    def get_rest_stats(self):
+        """Get queue depth and wait times of the outbound REST scheduler"""
+        rest = getattr(self.bot, 'rest', None)
+        return rest.stats() if rest else {}
+    
+    def get_member_stats(self):
+        """Get hit and query counters of the lazy member loader"""
+        loader = getattr(self.bot, 'member_loader', None)
+        return loader.stats() if loader else {}
+    
+    def get_restart_history(self):
+        """Get the most recent restarts with their measured downtime"""
+        return list(getattr(self.bot, 'restart_log', []))
+    
+    def get_summary(self):
+        """Get the status values shown on the dashboard, without the list and REST statistics"""
+        liveness = self.get_liveness()
+        return {
+            'is_running': self.is_bot_running(),
+            'uptime': self.get_uptime(),
+            'last_restart': self.get_last_restart_time(),
+            'restart_count': self.get_restart_count(),
+            'bot_guilds': self.get_guild_count(),
+            'healthy': liveness['healthy'],
+            'problems': liveness['problems'],
+            'latency_ms': liveness['latency_ms'],
+            'shards': self.get_shards(),
+        }
+    
+    def collect_status(self, timeout=STATUS_TIMEOUT):
+        """Build the complete status on the monitor loop, which owns the list and REST state"""
+        future = self._submit(self._collect_status())
+        if future is None:
+            return self.get_status()
+        return future.result(timeout)
+    
+    async def _collect_status(self):
+        return self.get_status()
+    
+    def get_status(self):
+        """Get the complete status of the bot for the dashboard"""
+        return {
+            'is_running': self.is_bot_running(),
+            'uptime': self.get_uptime(),
+            'last_restart': self.get_last_restart_time(),
+            'restart_count': self.get_restart_count(),
+            'bot_guilds': self.get_guild_count(),
+            'list_edits': self.get_edit_stats(),
+            'list_cache': self.get_list_cache_stats(),
+            'list_updates': self.get_list_update_stats(),
+            'rest': self.get_rest_stats(),
+            'restarts': self.get_restart_history(),
+            'liveness': self.get_liveness(),
+            'shards': self.get_shards(),
+            'time_to_ready_s': getattr(self.bot, 'time_to_ready', None),
+            'members': self.get_member_stats(),
+        }
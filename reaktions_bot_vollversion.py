@@ -8,22 +8,20 @@ import datetime
 import traceback
 import sys
 import os
+from log_setup import setup_logging
+from member_index import MemberIndex
 
-# Logging einrichten
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('discord_bot.log')
-    ]
-)
+# Logging einrichten; Konsole und Datei schreibt ein Hintergrund-Thread
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Speichert die zuletzt gesendete Liste zum Bearbeiten
 message_cache = {}
 status_emojis = {"✅", "❌"}
 
+# Index von Anzeige-/Benutzernamen auf Mitglieder pro Server
+member_index = MemberIndex()
+
 # ======================
 # BOT ERSTELLEN
 # ======================
@@ -56,6 +54,40 @@ def create_discord_bot():
     async def on_guild_join(guild):
         """Event, das ausgelöst wird, wenn der Bot einem neuen Server beitritt"""
         logger.info(f'Bot ist einem neuen Server beigetreten: {guild.name} (ID: {guild.id})')
+        member_index.build(guild)
+    
+    @bot.event
+    async def on_guild_available(guild):
+        """Event, das ausgelöst wird, wenn ein Server bereit ist"""
+        member_index.build(guild)
+    
+    @bot.event
+    async def on_guild_remove(guild):
+        """Event, das ausgelöst wird, wenn der Bot einen Server verlässt oder verliert"""
+        member_index.drop_guild(guild.id)
+    
+    @bot.event
+    async def on_member_join(member):
+        """Event, das ausgelöst wird, wenn ein Mitglied einem Server beitritt"""
+        member_index.add_member(member)
+    
+    @bot.event
+    async def on_member_update(before, after):
+        """Event, das ausgelöst wird, wenn sich Nickname oder Rollen eines Mitglieds ändern"""
+        member_index.add_member(after)
+    
+    @bot.event
+    async def on_user_update(before, after):
+        """Event, das ausgelöst wird, wenn sich der Benutzername oder globale Name ändert"""
+        for guild in bot.guilds:
+            member = guild.get_member(after.id)
+            if member:
+                member_index.add_member(member)
+    
+    @bot.event
+    async def on_raw_member_remove(payload):
+        """Event, das ausgelöst wird, wenn ein Mitglied einen Server verlässt"""
+        member_index.remove_member(payload.guild_id, payload.user.id)
     
     @bot.event
     async def on_command_error(ctx, error):
@@ -113,11 +145,7 @@ def create_discord_bot():
         
         for name in namen:
             # Versuche den Benutzer zu finden (nach Nickname oder Username)
-            member = None
-            for m in guild.members:
-                if m.display_name.lower() == name.lower() or m.name.lower() == name.lower():
-                    member = m
-                    break
+            member = member_index.resolve(guild, name)
             
             if member:
                 # Nutze die Hauptrolle des Mitglieds für die Farbe
@@ -233,11 +261,7 @@ def create_discord_bot():
             guild = channel.guild
             for name in hinzugefuegte_namen:
                 # Versuche den Benutzer zu finden
-                member = None
-                for m in guild.members:
-                    if m.display_name.lower() == name.lower() or m.name.lower() == name.lower():
-                        member = m
-                        break
+                member = member_index.resolve(guild, name)
                 
                 if member:
                     # Mit Rollenfarbe
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Prioritätsspuren: kleinere Zahl wird zuerst bedient
+LANE_INTERACTIVE = 0  # Statusänderungen an bestehenden Listen
+LANE_NORMAL = 1       # Antworten auf Befehle
+LANE_BULK = 2         # Reaktionen hinzufügen, Erinnerungen, Exporte
+LANE_NAMES = ("interactive", "normal", "bulk")
+
+
+class _Request:
+    __slots__ = ("route", "call", "future", "queued_at")
+
+    def __init__(self, route, call, future, queued_at):
+        self.route = route
+        self.call = call
+        self.future = future
+        self.queued_at = queued_at
+
+
+class RestScheduler:
+    """
+    Central scheduler for outbound Discord REST calls.
+
+    Calls are queued in priority lanes and started by a single task.
+    discord.py enforces Discord's rate limits from the response headers and
+    waits inside a call when a bucket is exhausted; the scheduler only
+    decides which call is started next. At most ``max_in_flight`` calls run
+    at once, and at most ``route_in_flight`` per route (e.g. message edits
+    in one channel). A route that discord.py is holding back therefore does
+    not take up every slot, calls on other routes keep going, and queued
+    interactive status edits overtake bulk work on the same route.
+    """
+
+    def __init__(self, max_in_flight=10, route_in_flight=1):
+        self.max_in_flight = max_in_flight
+        self.route_in_flight = route_in_flight
+        self._lanes = tuple(deque() for _ in LANE_NAMES)
+        # Route -> Anzahl laufender Aufrufe
+        self._routes = {}
+        self._in_flight = 0
+        self._wakeup = None
+        self._dispatcher = None
+        self._loop = None
+        self.dispatched = [0] * len(LANE_NAMES)
+        self.failed = 0
+        self.wait_total = [0.0] * len(LANE_NAMES)
+        self.wait_max = [0.0] * len(LANE_NAMES)
+        self.last_success = None
+
+    async def submit(self, lane, route, call):
+        """
+        Run ``call()`` (a coroutine function) once it is its turn.
+
+        ``route`` is a ``(kind, major_id)`` tuple such as
+        ``("edit_message", channel_id)``. Returns the result of the call.
+        """
+        self._ensure_dispatcher()
+        future = self._loop.create_future()
+        self._lanes[lane].append(_Request(route, call, future, time.monotonic()))
+        self._wakeup.set()
+        return await future
+
+    def _ensure_dispatcher(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._dispatcher and not self._dispatcher.done():
+            return
+        # Neuer Event-Loop (z.B. nach einem Neustart): Warteschlangen verwerfen
+        for lane in self._lanes:
+            lane.clear()
+        self._routes = {}
+        self._in_flight = 0
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._dispatcher = loop.create_task(self._dispatch_loop())
+
+    async def _dispatch_loop(self):
+        while True:
+            self._wakeup.clear()
+            self._dispatch_ready()
+            await self._wakeup.wait()
+
+    def _dispatch_ready(self):
+        """Start every queued call that may run now, higher lanes first"""
+        now = time.monotonic()
+        for lane_index, lane in enumerate(self._lanes):
+            for _ in range(len(lane)):
+                request = lane.popleft()
+                if request.future.cancelled():
+                    continue
+                if (
+                    self._in_flight >= self.max_in_flight
+                    or self._routes.get(request.route, 0) >= self.route_in_flight
+                ):
+                    # Bleibt in der Reihenfolge seiner Spur
+                    lane.append(request)
+                    continue
+                self._start(lane_index, request, now)
+
+    def _start(self, lane_index, request, now):
+        waited = now - request.queued_at
+        self.dispatched[lane_index] += 1
+        self.wait_total[lane_index] += waited
+        self.wait_max[lane_index] = max(self.wait_max[lane_index], waited)
+        self._in_flight += 1
+        self._routes[request.route] = self._routes.get(request.route, 0) + 1
+        self._loop.create_task(self._run(request))
+
+    async def _run(self, request):
+        try:
+            result = await request.call()
+        except Exception as e:
+            self.failed += 1
+            if not request.future.done():
+                request.future.set_exception(e)
+        else:
+            self.last_success = time.time()
+            if not request.future.done():
+                request.future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            running = self._routes.get(request.route, 0) - 1
+            if running > 0:
+                self._routes[request.route] = running
+            else:
+                self._routes.pop(request.route, None)
+            self._wakeup.set()
+
+    def pending(self):
+        """Return the number of queued and running calls"""
+        return sum(len(lane) for lane in self._lanes) + self._in_flight
+
+    def stats(self):
+        """Return queue depth and wait-time statistics per lane (safe to call from other threads)"""
+        lanes = {}
+        for index, name in enumerate(LANE_NAMES):
+            dispatched = self.dispatched[index]
+            lanes[name] = {
+                'queued': len(self._lanes[index]),
+                'dispatched': dispatched,
+                'avg_wait_ms': round(self.wait_total[index] / dispatched * 1000, 1) if dispatched else 0.0,
+                'max_wait_ms': round(self.wait_max[index] * 1000, 1),
+            }
+        return {
+            'lanes': lanes,
+            'in_flight': self._in_flight,
+            'failed': self.failed,
+            'busy_routes': len(self._routes),
+        }
@@ -0,0 +1,63 @@
+import logging
+
+from list_state import KATEGORIE_ANDERE, ROLLEN_REIHENFOLGE
+
+logger = logging.getLogger(__name__)
+
+_RANG_BY_NAME = {rolle: rang for rang, rolle in enumerate(ROLLEN_REIHENFOLGE)}
+
+
+class RoleCategories:
+    """
+    Caches the list category of members.
+
+    Each guild gets a table from role ID to category rank, built once from
+    the role names in ``ROLLEN_REIHENFOLGE``. A member's category is the best
+    rank among their role IDs and is cached until their roles or the guild's
+    roles change.
+    """
+
+    def __init__(self):
+        # guild_id -> {role_id -> rang}
+        self._ranks = {}
+        # guild_id -> {member_id -> rang}
+        self._members = {}
+
+    def category(self, member):
+        """Return the category rank of a member"""
+        guild_id = member.guild.id
+        members = self._members.get(guild_id)
+        if members is None:
+            members = self._members[guild_id] = {}
+        rang = members.get(member.id)
+        if rang is None:
+            rang = members[member.id] = self._compute(member)
+        return rang
+
+    def invalidate_member(self, guild_id, member_id):
+        """Forget the cached category of a member"""
+        members = self._members.get(guild_id)
+        if members:
+            members.pop(member_id, None)
+
+    def invalidate_guild(self, guild_id):
+        """Forget the role table and all cached categories of a guild"""
+        self._ranks.pop(guild_id, None)
+        self._members.pop(guild_id, None)
+
+    def _role_ranks(self, guild):
+        ranks = self._ranks.get(guild.id)
+        if ranks is None:
+            ranks = self._ranks[guild.id] = {
+                role.id: _RANG_BY_NAME[role.name]
+                for role in guild.roles if role.name in _RANG_BY_NAME
+            }
+            logger.debug(f"Role category table for guild {guild.id} built with {len(ranks)} roles")
+        return ranks
+
+    def _compute(self, member):
+        ranks = self._role_ranks(member.guild)
+        rang = KATEGORIE_ANDERE
+        for role in member.roles:
+            rang = min(rang, ranks.get(role.id, KATEGORIE_ANDERE))
+        return rang
@@ -1,21 +1,25 @@
 import os
+import atexit
 import logging
 import threading
 import time
 import datetime
 import flask
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, jsonify, request
 from reaktions_bot_vollversion import create_discord_bot, BotMonitor
+from log_setup import LOG_FILE, setup_logging
+from log_buffer import QUERY_PARAMS, LogRingBuffer, query_from_args
+from log_stream import LogBroadcaster, stream_logs
+from log_tail import read_log
+from status_stream import StatusPublisher
 
-# Konfiguriere Logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('discord_bot.log')
-    ]
-)
+# Verteilt neue Log-Einträge live an das Dashboard
+log_broadcaster = LogBroadcaster()
+# Hält die letzten Einträge strukturiert zum Filtern über /api/logs
+log_buffer = LogRingBuffer()
+
+# Konfiguriere Logging: Konsole, rotierende Datei und Live-Stream schreibt ein Hintergrund-Thread
+setup_logging(log_broadcaster, log_buffer)
 logger = logging.getLogger(__name__)
 
 # Erstelle Flask-App
@@ -44,6 +48,9 @@ def start_bot():
     bot_thread.daemon = True
     bot_thread.start()
     logger.info("Bot-Monitor-Thread gestartet")
+    
+    # Bot beim Beenden des Prozesses sauber trennen
+    atexit.register(bot_monitor.stop)
 
 # Initialisiere den Bot beim Start
 with app.app_context():
@@ -54,19 +61,34 @@ with app.app_context():
 def index():
     return render_template('index.html')
 
-@app.route('/api/status')
-def status():
-    """API-Endpunkt zum Abrufen des Bot-Status"""
-    status_data = {
+def bot_status():
+    """Sammelt die im Dashboard angezeigten Statuswerte"""
+    return {
         'is_running': bot_monitor.is_bot_running(),
         'uptime': bot_monitor.get_uptime(),
         'last_restart': bot_monitor.get_last_restart_time(),
         'restart_count': bot_monitor.get_restart_count(),
-        'server_time': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'bot_guilds': bot_monitor.get_guild_count(),
     }
+
+# Sendet Statusänderungen an die Dashboards, gemessen wird nur, solange eines verbunden ist
+status_publisher = StatusPublisher(bot_status)
+
+@app.route('/api/status')
+def status():
+    """API-Endpunkt zum Abrufen des Bot-Status"""
+    status_data = bot_status()
+    status_data['server_time'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     return jsonify(status_data)
 
+@app.route('/api/status/stream')
+def status_stream():
+    """API-Endpunkt, der bei jeder Statusänderung einen Status als Server-Sent Event sendet"""
+    return Response(
+        status_publisher.stream(request.headers.get('Last-Event-ID')), mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/restart', methods=['POST'])
 def restart_bot():
     """API-Endpunkt zum manuellen Neustarten des Bots"""
@@ -76,15 +98,37 @@ def restart_bot():
 
 @app.route('/api/logs')
 def get_logs():
-    """API-Endpunkt zum Abrufen der neuesten Logs"""
+    """
+    API-Endpunkt zum Abrufen der neuesten Logs, mit ?cursor= nur der seitdem geschriebenen.
+    
+    Mit level, logger, since, contains, guild_id, list_id oder limit werden
+    stattdessen die Einträge im Speicher gefiltert, ohne die Datei zu lesen.
+    """
+    if any(name in request.args for name in QUERY_PARAMS):
+        records = log_buffer.query(**query_from_args(request.args))
+        return jsonify({'records': records, 'buffered': len(log_buffer)})
+    # Vor dem Lesen merken, damit der Live-Stream lückenlos anschließt
+    stream_id = log_broadcaster.last_id
     try:
-        with open('discord_bot.log', 'r') as log_file:
-            # Hole die letzten 50 Zeilen
-            lines = log_file.readlines()[-50:]
-            return jsonify({'logs': lines})
+        lines, cursor, reset = read_log(
+            LOG_FILE, request.args.get('cursor'), request.args.get('lines', 50, type=int)
+        )
+        return jsonify({'logs': lines, 'cursor': cursor, 'reset': reset, 'stream_id': stream_id})
     except Exception as e:
         logger.error(f"Fehler beim Lesen der Log-Datei: {e}")
         return jsonify({'error': 'Fehler beim Lesen der Logs', 'logs': []})
 
+@app.route('/api/logs/stream')
+def stream_logs_events():
+    """API-Endpunkt, der neue Log-Einträge als Server-Sent Events sendet"""
+    # Browser senden beim automatischen Neuverbinden die zuletzt erhaltene ID mit
+    last_id = request.headers.get('Last-Event-ID', type=int)
+    if last_id is None:
+        last_id = request.args.get('last_id', type=int)
+    return Response(
+        stream_logs(log_broadcaster, last_id), mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
@@ -9,52 +9,220 @@ document.addEventListener('DOMContentLoaded', function() {
     const logsDisplay = document.getElementById('logs-display');
     const restartButton = document.getElementById('restart-button');
     const refreshLogsButton = document.getElementById('refresh-logs-button');
+    const shardsDisplay = document.getElementById('shards-display');
+    const logsFilter = document.getElementById('logs-filter');
+
+    // Funktion zum Anzeigen der Shards mit Latenz, Servern und Ereignisrate
+    function updateShards(shards) {
+        if (!shards || shards.length === 0) {
+            shardsDisplay.innerHTML = '<tr><td colspan="7" class="text-muted">Keine Shards verbunden.</td></tr>';
+            return;
+        }
+        shardsDisplay.innerHTML = shards.map(shard => `
+            <tr>
+                <td>${shard.id}</td>
+                <td>${shard.healthy
+                    ? '<span class="badge bg-success">OK</span>'
+                    : `<span class="badge bg-danger">${shard.problems.join(', ')}</span>`}</td>
+                <td>${shard.latency_ms !== null ? shard.latency_ms + ' ms' : '-'}</td>
+                <td>${shard.guilds}</td>
+                <td>${shard.events_per_s !== null ? shard.events_per_s : '-'}</td>
+                <td>${shard.restarts}</td>
+                <td class="text-end">
+                    <button class="btn btn-sm btn-outline-warning shard-restart-button" data-shard="${shard.id}">
+                        <i class="fas fa-sync"></i>
+                    </button>
+                </td>
+            </tr>`).join('');
+    }
+
+    // Handler für den Neustart einzelner Shards
+    shardsDisplay.addEventListener('click', function(event) {
+        const button = event.target.closest('.shard-restart-button');
+        if (!button || !confirm(`Shard ${button.dataset.shard} neu verbinden?`)) {
+            return;
+        }
+        button.disabled = true;
+        fetch(`/api/restart?shard=${button.dataset.shard}&mode=soft`, { method: 'POST' })
+            .then(response => response.json())
+            .then(data => console.log('Shard restart response:', data))
+            .catch(error => console.error('Error restarting shard:', error))
+            .finally(() => setTimeout(updateBotStatus, 5000));
+    });
+
+    // Funktion zum Anzeigen eines Bot-Status
+    function showStatus(data) {
+        // Status-Indikator aktualisieren
+        botStatusIndicator.innerHTML = data.is_running 
+            ? '<span class="badge bg-success">Online</span>'
+            : '<span class="badge bg-danger">Offline</span>';
+        
+        // Andere Statusinformationen aktualisieren
+        uptimeDisplay.textContent = data.uptime;
+        lastRestartDisplay.textContent = data.last_restart;
+        restartCountDisplay.textContent = data.restart_count;
+        guildCountDisplay.textContent = data.bot_guilds;
+        serverTimeDisplay.textContent = data.server_time;
+        updateShards(data.shards);
+    }
 
     // Funktion zum Abrufen und Aktualisieren des Bot-Status
     function updateBotStatus() {
         fetch('/api/status')
             .then(response => response.json())
-            .then(data => {
-                // Status-Indikator aktualisieren
-                botStatusIndicator.innerHTML = data.is_running 
-                    ? '<span class="badge bg-success">Online</span>'
-                    : '<span class="badge bg-danger">Offline</span>';
-                
-                // Andere Statusinformationen aktualisieren
-                uptimeDisplay.textContent = data.uptime;
-                lastRestartDisplay.textContent = data.last_restart;
-                restartCountDisplay.textContent = data.restart_count;
-                guildCountDisplay.textContent = data.bot_guilds;
-                serverTimeDisplay.textContent = data.server_time;
-            })
+            .then(showStatus)
             .catch(error => {
                 console.error('Error fetching bot status:', error);
                 botStatusIndicator.innerHTML = '<span class="badge bg-warning">Unbekannt</span>';
             });
     }
 
+    // Statusänderungen vom Server empfangen, statt regelmäßig abzufragen
+    let statusStream = null;
+
+    function startStatusStream() {
+        if (!window.EventSource) {
+            return;
+        }
+        statusStream = new EventSource('/api/status/stream');
+        statusStream.addEventListener('status', event => showStatus(JSON.parse(event.data)));
+        // Ohne Änderung kommen nur Uptime und Serverzeit
+        statusStream.addEventListener('keepalive', event => {
+            const data = JSON.parse(event.data);
+            uptimeDisplay.textContent = data.uptime;
+            serverTimeDisplay.textContent = data.server_time;
+        });
+        statusStream.onerror = () => {
+            // Nicht auf die Wiederverbindung des Browsers warten: der Stream wird geschlossen,
+            // bis zum nächsten Versuch fragt das Intervall unten den Status ab
+            statusStream.close();
+            statusStream = null;
+            updateBotStatus();
+            setTimeout(startStatusStream, 10000);
+        };
+    }
+
+    // Position in der Log-Datei; danach werden nur noch neue Zeilen abgerufen
+    let logCursor = null;
+    let logLines = [];
+    const MAX_LOG_LINES = 500;
+
+    // Live-Stream der Logs; setzt nach Abbrüchen bei der zuletzt erhaltenen ID fort
+    let logStream = null;
+    let lastLogId = null;
+
+    let logFilterActive = false;
+
+    // Funktion zum Anzeigen der Log-Zeilen, ersetzt oder angehängt
+    function showLogs(lines, replace) {
+        logLines = replace ? lines : logLines.concat(lines);
+        if (logLines.length > MAX_LOG_LINES) {
+            logLines = logLines.slice(-MAX_LOG_LINES);
+        }
+        if (logLines.length === 0) {
+            logsDisplay.textContent = 'Keine Logs verfügbar.';
+            return;
+        }
+        // Während eine Filterung angezeigt wird, laufen neue Zeilen nur im Hintergrund mit
+        if (logFilterActive) {
+            return;
+        }
+        if (replace || lines.length > 0) {
+            logsDisplay.textContent = logLines.join('');
+            // Automatisch zum unteren Rand scrollen
+            const logsContainer = logsDisplay.parentElement;
+            logsContainer.scrollTop = logsContainer.scrollHeight;
+        }
+    }
+
     // Funktion zum Abrufen und Aktualisieren der Logs
     function updateLogs() {
-        fetch('/api/logs')
+        const url = logCursor ? `/api/logs?cursor=${encodeURIComponent(logCursor)}` : '/api/logs';
+        fetch(url)
             .then(response => response.json())
             .then(data => {
-                if (data.logs && data.logs.length > 0) {
-                    // Log-Zeilen zusammenfügen und Anzeige aktualisieren
-                    const logText = data.logs.join('');
-                    logsDisplay.textContent = logText;
-                    // Automatisch zum unteren Rand scrollen
-                    const logsContainer = logsDisplay.parentElement;
-                    logsContainer.scrollTop = logsContainer.scrollHeight;
-                } else {
-                    logsDisplay.textContent = 'Keine Logs verfügbar.';
+                if (data.error) {
+                    throw new Error(data.error);
+                }
+                logCursor = data.cursor;
+                // Bei reset (erster Abruf, rotierte Datei) ersetzen, sonst anhängen
+                showLogs(data.logs, data.reset);
+                if (data.stream_id !== undefined) {
+                    startLogStream(data.stream_id);
                 }
             })
             .catch(error => {
                 console.error('Error fetching logs:', error);
+                logCursor = null;
                 logsDisplay.textContent = 'Fehler beim Laden der Logs. Bitte versuche es erneut.';
             });
     }
 
+    // Funktion zum Empfangen neuer Log-Einträge, sobald sie geschrieben werden
+    function startLogStream(streamId) {
+        if (!window.EventSource || logStream) {
+            return;
+        }
+        lastLogId = streamId;
+        logStream = new EventSource(`/api/logs/stream?last_id=${lastLogId}`);
+        logStream.onmessage = event => {
+            lastLogId = Number(event.lastEventId);
+            showLogs([event.data + '\n'], false);
+        };
+        logStream.addEventListener('gap', () => {
+            showLogs(['… einige Log-Einträge wurden übersprungen …\n'], false);
+        });
+        logStream.onerror = () => {
+            // Der Browser verbindet sich selbst neu; nur eine geschlossene Verbindung neu aufbauen
+            if (logStream.readyState === EventSource.CLOSED) {
+                logStream = null;
+                logCursor = null;
+                setTimeout(() => startLogStream(lastLogId), 5000);
+            }
+        };
+    }
+
+    // Funktion zum Filtern der Logs im Speicher des Servers
+    function filterLogs() {
+        const params = new URLSearchParams({ limit: 200 });
+        const level = document.getElementById('logs-filter-level').value;
+        const loggerName = document.getElementById('logs-filter-logger').value.trim();
+        const contains = document.getElementById('logs-filter-contains').value.trim();
+        if (level) params.set('level', level);
+        if (loggerName) params.set('logger', loggerName);
+        if (contains) params.set('contains', contains);
+
+        logFilterActive = true;
+        fetch(`/api/logs?${params}`)
+            .then(response => response.json())
+            .then(data => {
+                if (!data.records || data.records.length === 0) {
+                    logsDisplay.textContent = 'Keine passenden Log-Einträge.';
+                    return;
+                }
+                logsDisplay.textContent = data.records
+                    .map(record => `${record.time} - ${record.logger} - ${record.level} - ${record.message}\n`)
+                    .join('');
+                const logsContainer = logsDisplay.parentElement;
+                logsContainer.scrollTop = logsContainer.scrollHeight;
+            })
+            .catch(error => {
+                console.error('Error filtering logs:', error);
+                logsDisplay.textContent = 'Fehler beim Filtern der Logs.';
+            });
+    }
+
+    logsFilter.addEventListener('submit', function(event) {
+        event.preventDefault();
+        filterLogs();
+    });
+
+    document.getElementById('logs-filter-reset').addEventListener('click', function() {
+        logsFilter.reset();
+        logFilterActive = false;
+        showLogs(logLines, true);
+    });
+
     // Handler für den Bot-Neustart-Button
     restartButton.addEventListener('click', function() {
         if (confirm('Bist du sicher, dass du den Bot neu starten möchtest?')) {
@@ -77,7 +245,9 @@ document.addEventListener('DOMContentLoaded', function() {
                     restartButton.innerHTML = '<i class="fas fa-sync me-2"></i>Bot neustarten';
                     // Status nach dem Neustart aktualisieren
                     updateBotStatus();
-                    updateLogs();
+                    if (!logStream) {
+                        updateLogs();
+                    }
                 }, 5000);
             })
             .catch(error => {
@@ -94,7 +264,13 @@ document.addEventListener('DOMContentLoaded', function() {
         refreshLogsButton.disabled = true;
         refreshLogsButton.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Aktualisiere...';
         
-        updateLogs();
+        if (logFilterActive) {
+            filterLogs();
+        } else {
+            // Komplett neu laden, der Live-Stream hängt danach weiter an
+            logCursor = null;
+            updateLogs();
+        }
         
         setTimeout(() => {
             refreshLogsButton.disabled = false;
@@ -103,10 +279,22 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 
     // Initiale Aktualisierung
-    updateBotStatus();
+    startStatusStream();
+    if (!statusStream) {
+        updateBotStatus();
+    }
     updateLogs();
     
-    // Regelmäßige Aktualisierungen einrichten (alle 10 Sekunden)
-    setInterval(updateBotStatus, 10000);
-    setInterval(updateLogs, 30000);
+    // Status nur abfragen (alle 10 Sekunden), solange kein Status-Stream verbunden ist
+    setInterval(() => {
+        if (!statusStream) {
+            updateBotStatus();
+        }
+    }, 10000);
+    // Logs nur abfragen, solange kein Live-Stream verbunden ist
+    setInterval(() => {
+        if (!logStream) {
+            updateLogs();
+        }
+    }, 30000);
 });
\ No newline at end of file
@@ -0,0 +1,156 @@
+import datetime
+import json
+import logging
+import threading
+import time
+
+from log_stream import format_event
+
+logger = logging.getLogger(__name__)
+
+# Abstand (Sekunden), in dem der Status geprüft wird, solange jemand zusieht
+STATUS_SAMPLE_INTERVAL = 2
+# Ohne Änderung nur alle 30 Sekunden Uptime und Serverzeit senden
+STATUS_KEEPALIVE = 30
+# Latenzstufen in Millisekunden; nur ein Wechsel der Stufe gilt als Änderung
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2500)
+
+
+def latency_bucket(latency_ms):
+    """Return the index of the latency bucket of ``latency_ms``, None if unknown"""
+    if latency_ms is None:
+        return None
+    for index, limit in enumerate(LATENCY_BUCKETS_MS):
+        if latency_ms < limit:
+            return index
+    return len(LATENCY_BUCKETS_MS)
+
+
+def status_key(summary):
+    """Reduce a status summary to the values whose change is worth a frame"""
+    return (
+        summary.get('is_running'),
+        summary.get('healthy'),
+        tuple(summary.get('problems') or ()),
+        latency_bucket(summary.get('latency_ms')),
+        summary.get('bot_guilds'),
+        summary.get('restart_count'),
+        summary.get('last_restart'),
+        tuple(
+            (
+                shard['id'], shard['healthy'], tuple(shard['problems']),
+                latency_bucket(shard['latency_ms']), shard['guilds'], shard['restarts'],
+            )
+            for shard in summary.get('shards') or ()
+        ),
+    )
+
+
+def _server_time():
+    return datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class StatusPublisher:
+    """
+    Pushes the dashboard status to all connected clients when it changes.
+
+    One background thread samples ``get_summary()`` every ``interval``
+    seconds while at least one client is connected, however many there
+    are. A new frame is published only when the ready state, health,
+    latency bucket, guild count, restarts or shards changed; otherwise
+    clients get a small keepalive with uptime and server time.
+    """
+
+    def __init__(self, get_summary, interval=STATUS_SAMPLE_INTERVAL):
+        self._get_summary = get_summary
+        self.interval = interval
+        self._condition = threading.Condition()
+        # Eine ältere Messung darf eine neuere nicht überschreiben
+        self._sample_lock = threading.Lock()
+        self._watched = threading.Event()
+        self._thread = None
+        # Frame-IDs eines neu gestarteten Prozesses dürfen nicht mit alten übereinstimmen
+        self._epoch = int(time.time())
+        self._sequence = 0
+        self._key = None
+        self.frame_id = None
+        self.frame = None
+        self.latest = None
+        self.clients = 0
+        self.samples = 0
+
+    def sample(self):
+        """Sample the status once and publish a frame if a watched value changed"""
+        with self._sample_lock:
+            try:
+                summary = self._get_summary()
+            except Exception as e:
+                logger.error(f"Error sampling bot status: {e}")
+                return
+            key = status_key(summary)
+            with self._condition:
+                self.samples += 1
+                self.latest = summary
+                if key != self._key:
+                    self._key = key
+                    self._sequence += 1
+                    self.frame_id = f"{self._epoch}.{self._sequence}"
+                    self.frame = summary
+                    self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            self._watched.wait()
+            self.sample()
+            time.sleep(self.interval)
+
+    def _connect(self):
+        with self._condition:
+            self.clients += 1
+            first = self.frame is None or not self._watched.is_set()
+            self._watched.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="status-publisher", daemon=True)
+                self._thread.start()
+        if first:
+            # Der erste Zuschauer soll nicht auf die nächste Messung warten
+            self.sample()
+
+    def _disconnect(self):
+        with self._condition:
+            self.clients -= 1
+            if not self.clients:
+                self._watched.clear()
+
+    def stream(self, last_id=None, keepalive=STATUS_KEEPALIVE):
+        """
+        Yield status frames as server-sent events.
+
+        The current frame is sent first unless ``last_id`` shows the client
+        already has it, then every new frame and a keepalive whenever
+        nothing changed for ``keepalive`` seconds.
+        """
+        self._connect()
+        try:
+            yield "retry: 3000\n\n"
+            sent = last_id
+            while True:
+                with self._condition:
+                    if self.frame is None or self.frame_id == sent:
+                        self._condition.wait(keepalive)
+                    frame_id, frame, latest = self.frame_id, self.frame, self.latest
+                if frame is None:
+                    yield ": keepalive\n\n"
+                    continue
+                if frame_id != sent:
+                    sent = frame_id
+                    yield format_event(json.dumps(dict(frame, server_time=_server_time())), frame_id, "status")
+                else:
+                    data = {'uptime': latest['uptime'], 'server_time': _server_time()}
+                    yield format_event(json.dumps(data), event="keepalive")
+        finally:
+            self._disconnect()
+
+    def stats(self):
+        """Return the number of clients, samples and published frames"""
+        return {'clients': self.clients, 'samples': self.samples, 'frames': self._sequence}
@@ -0,0 +1,141 @@
+import pytest
+
+import bot
+from bot import create_discord_bot, parse_shard_ids
+from cluster import Cluster, _Worker, merge_sections, split_shards
+from monitor import BotMonitor
+
+
+def test_parse_shard_ids():
+    assert parse_shard_ids("0-3") == [0, 1, 2, 3]
+    assert parse_shard_ids("4,0,2") == [0, 2, 4]
+    # Überlappende Bereiche, Leerzeichen und leere Teile
+    assert parse_shard_ids(" 0-2, 2 ,5-6,,") == [0, 1, 2, 5, 6]
+    assert parse_shard_ids("") == []
+
+
+def test_parse_shard_ids_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_shard_ids("0-x")
+
+
+def test_split_shards_covers_every_shard_once():
+    for shard_count in range(1, 20):
+        for workers in range(1, 8):
+            ranges = split_shards(shard_count, workers)
+            assert [shard for shard_ids in ranges for shard in shard_ids] == list(range(shard_count))
+            sizes = [len(shard_ids) for shard_ids in ranges]
+            assert min(sizes) >= 1
+            assert max(sizes) - min(sizes) <= 1
+
+
+def test_split_shards_never_more_workers_than_shards():
+    assert split_shards(2, 5) == [[0], [1]]
+    assert split_shards(5, 0) == [[0, 1, 2, 3, 4]]
+
+
+def worker_status(guilds, shard_id, hits, misses, problems=(), dispatched=(0, 0), avg_wait=(0.0, 0.0)):
+    return {
+        'is_running': True,
+        'uptime': "0d 1h 0m 0s",
+        'last_restart': "Never restarted",
+        'restart_count': 1,
+        'bot_guilds': guilds,
+        'list_edits': {'changes': 10, 'edits_sent': 4, 'window': 1.0, 'max_delay': 5.0},
+        'list_cache': {'entries': 3, 'hits': hits, 'misses': misses, 'hit_rate': None, 'max_entries': 500},
+        'list_updates': {'queued': 1, 'max_depth': 2},
+        'rest': {
+            'lanes': [
+                {'name': name, 'queued': 0, 'dispatched': count, 'avg_wait_ms': wait, 'max_wait_ms': wait}
+                for name, count, wait in zip(("interaction", "list_edit"), dispatched, avg_wait)
+            ],
+            'in_flight': 1,
+            'failed': 0,
+            'busy_routes': 1,
+        },
+        'restarts': [],
+        'liveness': {
+            'healthy': not problems,
+            'problems': list(problems),
+            'last_heartbeat_ack_age_s': 10.0 * (shard_id + 1),
+            'latency_ms': 40.0 + shard_id,
+            'rest_pending': 2,
+            'thresholds': {'max_heartbeat_ack_age_s': 180.0},
+        },
+        'shards': [{'id': shard_id, 'latency_ms': 40.0 + shard_id}],
+        'time_to_ready_s': 3.0 + shard_id,
+        'members': {},
+    }
+
+
+def make_cluster(*statuses):
+    cluster = Cluster(len(statuses), "token")
+    for index, status in enumerate(statuses):
+        worker = _Worker(index, [index])
+        worker.status = status
+        cluster.workers.append(worker)
+    return cluster
+
+
+def test_merge_sections():
+    merged = merge_sections([
+        {'hits': 3, 'misses': 1, 'hit_rate': 0.75, 'max_entries': 500, 'ttl': 60, 'flag': True, 'age': None},
+        {'hits': 1, 'misses': 3, 'hit_rate': 0.25, 'max_entries': 600, 'ttl': 60, 'flag': False, 'age': None},
+        None,
+    ])
+    assert merged == {
+        'hits': 4, 'misses': 4, 'hit_rate': 0.5, 'max_entries': 600, 'ttl': 60, 'flag': False, 'age': None,
+    }
+    assert merge_sections([]) == {}
+
+
+def test_cluster_merges_worker_status():
+    cluster = make_cluster(
+        worker_status(2, 0, hits=3, misses=1, dispatched=(1, 3), avg_wait=(4.0, 8.0)),
+        worker_status(5, 1, hits=0, misses=4, problems=("stale_heartbeat",), dispatched=(3, 0), avg_wait=(8.0, 0.0)),
+    )
+    status = cluster.get_status()
+
+    assert status['bot_guilds'] == 7
+    assert status['restart_count'] == 2
+    assert status['time_to_ready_s'] == 4.0
+    assert [shard['worker'] for shard in status['shards']] == [0, 1]
+    assert status['list_edits'] == {'changes': 20, 'edits_sent': 8, 'window': 1.0, 'max_delay': 5.0}
+    assert status['list_cache']['hit_rate'] == 0.375
+    assert status['list_cache']['max_entries'] == 500
+    assert status['list_updates'] == {'queued': 2, 'max_depth': 2}
+
+    # Wartezeiten werden mit der Anzahl der Aufrufe gewichtet
+    interaction, list_edit = status['rest']['lanes']
+    assert interaction == {'name': "interaction", 'queued': 0, 'dispatched': 4, 'avg_wait_ms': 7.0, 'max_wait_ms': 8.0}
+    assert list_edit['avg_wait_ms'] == 8.0
+    assert status['rest']['in_flight'] == 2
+
+    liveness = status['liveness']
+    assert liveness['healthy'] is False
+    assert liveness['problems'] == ["stale_heartbeat"]
+    assert liveness['last_heartbeat_ack_age_s'] == 20.0
+    assert liveness['latency_ms'] == 41.0
+    assert liveness['rest_pending'] == 4
+    assert liveness['thresholds'] == {'max_heartbeat_ack_age_s': 180.0}
+
+    summary = cluster.get_summary()
+    assert summary['latency_ms'] == 41.0
+    assert summary['problems'] == ["stale_heartbeat"]
+
+
+def test_worker_without_status_is_unhealthy():
+    cluster = make_cluster(worker_status(2, 0, hits=0, misses=0))
+    cluster.workers.append(_Worker(1, [1]))
+    status = cluster.get_status()
+    assert status['liveness']['healthy'] is False
+    assert status['list_cache']['hit_rate'] is None
+    assert status['workers'][1]['status'] is None
+
+
+def test_status_has_the_same_shape_in_both_modes(monkeypatch):
+    monkeypatch.setattr(bot, "LIST_STORE_PATH", "")
+    single = BotMonitor(create_discord_bot(), "token").get_status()
+    cluster = make_cluster(worker_status(2, 0, hits=1, misses=1)).collect_status()
+    assert set(cluster) == set(single) | {'workers'}
+    assert set(cluster['liveness']) >= {'healthy', 'problems', 'latency_ms'}
@@ -0,0 +1,146 @@
+import asyncio
+
+from edit_coalescer import EditCoalescer
+
+WINDOW = 0.02
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_burst_is_folded_into_one_edit():
+    async def scenario():
+        flushed = []
+
+        async def flush(key):
+            flushed.append(key)
+
+        coalescer = EditCoalescer(flush, window=WINDOW, max_delay=1.0)
+        for _ in range(10):
+            coalescer.request("liste")
+        await asyncio.sleep(WINDOW * 5)
+        return flushed, coalescer.stats()
+
+    flushed, stats = run(scenario())
+    assert flushed == ["liste"]
+    assert stats['changes'] == 10
+    assert stats['edits_sent'] == 1
+    assert stats['edits_saved'] == 9
+    assert stats['pending_lists'] == 0
+
+
+def test_lists_are_edited_separately():
+    async def scenario():
+        flushed = []
+
+        async def flush(key):
+            flushed.append(key)
+
+        coalescer = EditCoalescer(flush, window=WINDOW, max_delay=1.0)
+        coalescer.request("a")
+        coalescer.request("b")
+        coalescer.request("a")
+        await asyncio.sleep(WINDOW * 5)
+        return flushed
+
+    assert sorted(run(scenario())) == ["a", "b"]
+
+
+def test_continuous_changes_are_flushed_after_max_delay():
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        flushed = []
+
+        async def flush(key):
+            flushed.append(loop.time() - started)
+
+        coalescer = EditCoalescer(flush, window=WINDOW * 2, max_delay=WINDOW * 4)
+        # Jede Änderung kommt vor Ablauf des Fensters, das Fenster allein würde nie enden
+        for _ in range(12):
+            coalescer.request("liste")
+            await asyncio.sleep(WINDOW)
+        return flushed
+
+    flushed = run(scenario())
+    # Bearbeitet, während die Änderungen noch andauern
+    assert flushed
+    assert flushed[0] < WINDOW * 12
+
+
+def test_change_during_edit_triggers_one_more_edit():
+    async def scenario():
+        calls = 0
+        release = asyncio.Event()
+
+        async def flush(key):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await release.wait()
+
+        coalescer = EditCoalescer(flush, window=WINDOW, max_delay=1.0)
+        coalescer.request("liste")
+        await asyncio.sleep(WINDOW * 2)
+        assert calls == 1
+        coalescer.request("liste")
+        coalescer.request("liste")
+        release.set()
+        await asyncio.sleep(WINDOW * 5)
+        return calls
+
+    assert run(scenario()) == 2
+
+
+def test_failed_edit_is_counted_and_forgotten():
+    async def scenario():
+        async def flush(key):
+            raise RuntimeError("kaputt")
+
+        coalescer = EditCoalescer(flush, window=WINDOW, max_delay=1.0)
+        coalescer.request("liste")
+        await asyncio.sleep(WINDOW * 3)
+        return coalescer.stats()
+
+    stats = run(scenario())
+    assert stats['edits_failed'] == 1
+    assert stats['pending_lists'] == 0
+
+
+def test_discard_and_settle_drop_pending_edit():
+    async def scenario():
+        flushed = []
+
+        async def flush(key):
+            flushed.append(key)
+
+        coalescer = EditCoalescer(flush, window=WINDOW, max_delay=1.0)
+        coalescer.request("a")
+        coalescer.request("b")
+        coalescer.discard("a")
+        coalescer.settle("b")
+        await asyncio.sleep(WINDOW * 3)
+        return flushed, coalescer.stats()
+
+    flushed, stats = run(scenario())
+    assert flushed == []
+    assert stats['edits_answered'] == 1
+    assert stats['pending_lists'] == 0
+
+
+def test_flush_sends_immediately():
+    async def scenario():
+        flushed = []
+
+        async def flush(key):
+            flushed.append(key)
+
+        coalescer = EditCoalescer(flush, window=10.0, max_delay=10.0)
+        coalescer.request("liste")
+        await coalescer.flush("liste")
+        return flushed, coalescer.stats()
+
+    flushed, stats = run(scenario())
+    assert flushed == ["liste"]
+    assert stats['pending_lists'] == 0
@@ -0,0 +1,224 @@
+import asyncio
+import threading
+
+import list_cache
+import list_store
+from list_cache import ListCache
+from list_state import ListState
+from list_store import ListStore
+
+
+def make_state(message_id, names=("Anna", "Ben"), user_message_id=None, part_ids=()):
+    state = ListState(author_id=1, user_message_id=user_message_id, guild_id=2, channel_id=3, message_id=message_id)
+    for name in names:
+        state.add(name)
+    state.part_ids = list(part_ids)
+    return state
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def use_clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(list_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_evicts_least_recently_used_over_max_entries():
+    cache = ListCache(max_entries=2, ttl=None)
+    cache.add(make_state(1, user_message_id=11, part_ids=[101]))
+    cache.add(make_state(2))
+    cache.get(1)
+    cache.add(make_state(3))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    assert cache.evictions == 1
+
+
+def test_evicting_without_store_forgets_indexes():
+    cache = ListCache(max_entries=1, ttl=None)
+    cache.add(make_state(1, user_message_id=11, part_ids=[101]))
+    cache.add(make_state(2))
+
+    assert 1 not in cache
+    assert 11 not in cache.user_messages
+    assert cache.list_id(101) is None
+
+
+def test_evicts_over_max_bytes_but_keeps_newest():
+    state = make_state(1, names=[f"Name {i}" for i in range(50)])
+    cache = ListCache(max_bytes=state.approx_size() + 1, ttl=None)
+    cache.add(state)
+    cache.add(make_state(2, names=[f"Name {i}" for i in range(50)]))
+
+    assert len(cache) == 1
+    assert cache.get(2) is not None
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+
+def test_save_updates_byte_accounting():
+    cache = ListCache(ttl=None)
+    state = make_state(1)
+    cache.add(state)
+    before = cache.stats()['bytes']
+    for i in range(20):
+        state.add(f"Neu {i}")
+    cache.save(state)
+
+    assert cache.stats()['bytes'] == state.approx_size() > before
+
+
+def test_idle_lists_expire_after_ttl(monkeypatch):
+    clock = use_clock(monkeypatch)
+    cache = ListCache(ttl=60)
+    cache.add(make_state(1))
+    clock.now += 30
+    cache.get(1)
+    clock.now += 45
+    cache.sweep()
+    assert 1 in cache
+
+    clock.now += 61
+    cache.sweep()
+    assert 1 not in cache
+    assert cache.expirations == 1
+
+
+def test_stats_does_not_evict(monkeypatch):
+    clock = use_clock(monkeypatch)
+    cache = ListCache(ttl=60)
+    cache.add(make_state(1))
+    clock.now += 120
+
+    assert cache.stats()['entries'] == 1
+    assert cache.get(1) is not None
+
+
+def test_stats_from_another_thread_while_loop_adds():
+    cache = ListCache(max_entries=50, ttl=None)
+    errors = []
+    done = threading.Event()
+
+    def read_stats():
+        try:
+            while not done.is_set():
+                cache.stats()
+        except Exception as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=read_stats)
+    reader.start()
+    try:
+        for message_id in range(5000):
+            cache.add(make_state(message_id, user_message_id=message_id + 100000, part_ids=[message_id + 200000]))
+    finally:
+        done.set()
+        reader.join()
+
+    assert not errors
+    assert len(cache) == 50
+
+
+def test_evicted_list_spills_to_store_and_reloads(tmp_path):
+    store = ListStore(str(tmp_path / "lists.db"))
+    cache = ListCache(store=store, max_entries=1, ttl=None)
+    state = make_state(1, user_message_id=11, part_ids=[101])
+    state.set_status(0, 1)
+    cache.add(state)
+    cache.add(make_state(2))
+
+    assert cache.get(1) is None
+    assert 1 in cache
+    # Der Rückwärtsindex bleibt für gespeicherte Listen erhalten
+    assert cache.user_messages[11] == 1
+    assert cache.list_id(101) == 1
+
+    reloaded = asyncio.run(cache.fetch_by_user_message(11))
+    assert reloaded is not state
+    assert reloaded.names() == ["Anna", "Ben"]
+    assert reloaded.status[0] == 1
+    assert reloaded.part_ids == [101]
+    assert cache.misses == 1 and cache.loads == 1
+    store.close()
+
+
+def test_load_index_registers_stored_lists(tmp_path):
+    path = str(tmp_path / "lists.db")
+    store = ListStore(path)
+    store.save(make_state(1, user_message_id=11, part_ids=[101, 102]))
+    store.close()
+
+    cache = ListCache(store=ListStore(path), ttl=None)
+    cache.load_index()
+
+    assert 1 in cache and cache.get(1) is None
+    assert cache.user_messages == {11: 1}
+    assert cache.parts_of(1) == [101, 102]
+    assert asyncio.run(cache.fetch(1)).names() == ["Anna", "Ben"]
+    cache.store.close()
+
+
+def test_remove_forgets_list_everywhere(tmp_path):
+    store = ListStore(str(tmp_path / "lists.db"))
+    cache = ListCache(store=store, ttl=None)
+    cache.add(make_state(1, user_message_id=11, part_ids=[101]))
+    cache.remove(1)
+
+    assert 1 not in cache
+    assert not cache.user_messages and not cache.parts
+    assert store.load(1) is None
+    store.close()
+
+
+def test_remove_of_unloaded_list_forgets_command_message(tmp_path):
+    store = ListStore(str(tmp_path / "lists.db"))
+    cache = ListCache(store=store, max_entries=1, ttl=None)
+    cache.add(make_state(1, user_message_id=11, part_ids=[101]))
+    cache.add(make_state(2, user_message_id=12))
+    assert cache.get(1) is None
+
+    cache.remove(1)
+    assert cache.user_messages == {12: 2}
+    assert not cache.parts
+    store.close()
+
+
+def test_purge_forgets_old_unloaded_lists_and_keeps_loaded_ones(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(list_store.time, "time", lambda: now[0])
+    store = ListStore(str(tmp_path / "lists.db"))
+    cache = ListCache(store=store, max_entries=2, ttl=None, retention=100)
+    cache.add(make_state(1, user_message_id=11, part_ids=[101]))
+    cache.add(make_state(2, user_message_id=12, part_ids=[102]))
+    cache.add(make_state(3, user_message_id=13))
+    store.flush()
+    now[0] = 2000.0
+    cache.add(make_state(4, user_message_id=14))
+    store.flush()
+    assert cache.get(1) is None and cache.get(2) is None
+
+    # 1 und 2 sind nur gespeichert, 3 ist alt, aber im Speicher und damit in Gebrauch
+    assert asyncio.run(cache.purge()) == 2
+    assert 1 not in cache and 2 not in cache
+    assert cache.user_messages == {13: 3, 14: 4}
+    assert not cache.parts
+    assert asyncio.run(cache.fetch(1)) is None
+    store.flush()
+    assert sorted(row[0] for row in store.load_index()) == [3, 4]
+    assert cache.stats()['purged'] == 2
+    store.close()
+
+
+def test_purge_without_retention_does_nothing(tmp_path):
+    store = ListStore(str(tmp_path / "lists.db"))
+    cache = ListCache(store=store, retention=0)
+    cache.add(make_state(1))
+    assert asyncio.run(cache.purge()) == 0
+    store.close()
@@ -0,0 +1,147 @@
+import discord
+
+from list_renderer import (
+    EMBED_MAX_FIELDS, FIELD_NAME_MAX, FIELD_VALUE_MAX, LISTE_TITEL, LISTE_TITEL_FORTSETZUNG,
+    MESSAGE_MAX_CHARS, MESSAGE_MAX_EMBEDS, render_parts, same_part, to_embeds,
+)
+from list_state import KATEGORIE_NAMEN, STATUS_JA, ListState
+
+
+def make_state(anzahl, laenge=0):
+    state = ListState(author_id=1, user_message_id=2, guild_id=3, channel_id=4, message_id=5)
+    for i in range(anzahl):
+        state.add(f"Mitglied {i}" + "x" * laenge, member_id=1000 + i, category=i % len(KATEGORIE_NAMEN))
+    return state
+
+
+def fresh(state, compact):
+    """Render a copy of the state without any memoised fragments or packing"""
+    return render_parts(ListState.from_row(state.to_row()), compact)
+
+
+def assert_within_limits(parts):
+    for part in parts:
+        assert 1 <= len(part) <= MESSAGE_MAX_EMBEDS
+        zeichen = 0
+        for embed in part:
+            assert len(embed["fields"]) <= EMBED_MAX_FIELDS
+            zeichen += len(embed.get("title", "")) + len(embed.get("description", ""))
+            for field in embed["fields"]:
+                assert len(field["name"]) <= FIELD_NAME_MAX
+                assert len(field["value"]) <= FIELD_VALUE_MAX
+                zeichen += len(field["name"]) + len(field["value"])
+        assert zeichen <= MESSAGE_MAX_CHARS
+
+
+def field_names(parts):
+    return [field["name"] for part in parts for embed in part for field in embed["fields"]]
+
+
+def test_roster_of_30_names_fits_one_message():
+    state = make_state(30)
+    parts = render_parts(state)
+
+    assert len(parts) == 1
+    assert_within_limits(parts)
+    # 30 Namen und 6 Kategorien brauchen mehr als die 25 Felder eines Embeds
+    assert len(parts[0]) == 2
+    assert parts[0][0]["title"] == LISTE_TITEL
+    assert sum(name.startswith("Mitglied") for name in field_names(parts)) == 30
+
+
+def test_compact_roster_uses_one_field_per_category():
+    state = make_state(30)
+    parts = render_parts(state, compact=True)
+
+    assert len(parts) == 1 and len(parts[0]) == 1
+    assert len(parts[0][0]["fields"]) == len(KATEGORIE_NAMEN)
+    assert parts[0][0]["fields"][0]["value"].count("\n") == 4
+
+
+def test_large_list_is_split_across_messages():
+    state = make_state(1000, laenge=20)
+    parts = render_parts(state)
+
+    assert len(parts) > 1
+    assert_within_limits(parts)
+    assert parts[0][0]["title"] == LISTE_TITEL
+    assert all(part[0]["title"] == LISTE_TITEL_FORTSETZUNG for part in parts[1:])
+    namen = [name for name in field_names(parts) if name.startswith("Mitglied")]
+    assert len(namen) == 1000
+
+
+def test_large_compact_list_is_split_across_messages():
+    state = make_state(3000, laenge=40)
+    parts = render_parts(state, compact=True)
+
+    assert len(parts) > 1
+    assert_within_limits(parts)
+    zeilen = sum(field["value"].count("\n") + 1 for part in parts for embed in part for field in embed["fields"])
+    assert zeilen == 3000
+
+
+def test_repack_after_middle_category_change_matches_fresh_render():
+    for compact in (True, False):
+        state = make_state(600, laenge=30)
+        before = render_parts(state, compact)
+        assert len(before) > 2
+
+        state.set_status(302, STATUS_JA)  # Kategorie 2 von 6
+        after = render_parts(state, compact)
+
+        assert after == fresh(state, compact)
+        # Teile vor der geänderten Kategorie werden unverändert wiederverwendet
+        teil = state.packed[1][2][0]
+        assert all(after[i] is before[i] for i in range(teil))
+        assert after[teil] is not before[teil]
+        assert before != after
+    assert teil > 0
+
+
+def test_repack_after_adding_and_removing_names_matches_fresh_render():
+    state = make_state(400, laenge=30)
+    render_parts(state)
+    for i in range(0, 400, 7):
+        state.remove(f"Mitglied {i}" + "x" * 30)
+    state.add("Neu", category=1)
+    parts = render_parts(state)
+
+    assert parts == fresh(state, False)
+    assert_within_limits(parts)
+
+
+def test_removed_category_disappears():
+    state = make_state(6)
+    render_parts(state)
+    state.remove("Mitglied 3")
+    parts = render_parts(state)
+
+    assert f"__**{KATEGORIE_NAMEN[3]}**__" not in field_names(parts)
+    assert parts == fresh(state, False)
+
+
+def test_unchanged_state_returns_same_parts():
+    state = make_state(50)
+    parts = render_parts(state)
+
+    assert render_parts(state) is parts
+
+
+def test_same_part():
+    state = make_state(10)
+    parts = render_parts(state)
+
+    assert same_part(parts[0], parts[0])
+    assert same_part(parts[0], fresh(state, False)[0])
+    assert not same_part(None, parts[0])
+    state.set_status(0, STATUS_JA)
+    assert not same_part(parts[0], render_parts(state)[0])
+
+
+def test_to_embeds():
+    state = make_state(30)
+    embeds = to_embeds(render_parts(state)[0])
+
+    assert all(isinstance(embed, discord.Embed) for embed in embeds)
+    assert embeds[0].title == LISTE_TITEL
+    assert sum(len(embed.fields) for embed in embeds) == 36
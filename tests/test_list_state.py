@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+from list_state import KATEGORIE_ANDERE, STATUS_ENTFERNT, STATUS_JA, STATUS_NEIN, ListState
+
+
+def make_state(message_id=5):
+    return ListState(author_id=1, user_message_id=2, guild_id=3, channel_id=4, message_id=message_id)
+
+
+def member(member_id, display_name, name=None):
+    return SimpleNamespace(id=member_id, display_name=display_name, name=name or display_name.lower())
+
+
+def test_add_ignores_duplicate_names():
+    state = make_state()
+    assert state.add("Anna") == 0
+    assert state.add("anna") is None
+    assert state.names() == ["Anna"]
+
+
+def test_remove_tombstones_and_compacts():
+    state = make_state()
+    for name in ("Anna", "Ben", "Clara", "Dora"):
+        state.add(name)
+
+    assert state.remove("ben")
+    assert state.status[1] == STATUS_ENTFERNT
+    assert len(state) == 3 and len(state.entries) == 4
+    assert not state.remove("Ben")
+
+    state.remove("Anna")
+    state.remove("Clara")
+    # Mehr als die Hälfte entfernt: die Einträge werden verdichtet
+    assert [entry.name for entry in state.entries] == ["Dora"]
+    assert state.find(member(None, "Dora")) == 0
+
+
+def test_find_by_member_and_name():
+    state = make_state()
+    state.add("Anna", member_id=111)
+    state.add("Ben")
+
+    assert state.find(member(111, "Andere")) == 0
+    assert state.find(member(222, "Ben")) == 1
+    assert state.find(member(333, "Jemand", "ben")) == 1
+    assert state.find(member(444, "Niemand")) is None
+
+
+def test_find_ignores_names_bound_to_other_members():
+    state = make_state()
+    state.add("Max", member_id=111)
+
+    assert state.find(member(222, "Maximilian", "max")) is None
+
+
+def test_status_changes_mark_category_dirty():
+    state = make_state()
+    state.add("Anna", category=2)
+    state.add("Ben", category=4)
+    assert state.take_dirty() == {2, 4}
+
+    assert state.set_status(1, STATUS_JA)
+    assert not state.set_status(1, STATUS_JA)
+    assert state.take_dirty() == {4}
+    assert state.take_dirty() == set()
+
+
+def test_sync_names():
+    state = make_state()
+    for name in ("Anna", "Ben"):
+        state.add(name)
+    state.set_status(0, STATUS_JA)
+
+    added, removed = state.sync_names(["anna", "Clara"], lambda name: (99, 1))
+
+    assert added == ["Clara"] and removed == ["Ben"]
+    assert state.names() == ["Anna", "Clara"]
+    # Bestehende Einträge behalten ihren Status
+    assert state.status[0] == STATUS_JA
+    assert state.entries[2].member_id == 99 and state.entries[2].category == 1
+
+
+def test_row_round_trip():
+    state = make_state()
+    state.add("Anna", member_id=111, category=0)
+    state.add("Ben", category=KATEGORIE_ANDERE)
+    state.add("Clara", member_id=333, category=2, status=STATUS_JA)
+    state.remove("Ben")
+    state.part_ids = [501, 502]
+
+    loaded = ListState.from_row(state.to_row())
+
+    assert loaded.message_id == 5 and loaded.channel_id == 4 and loaded.guild_id == 3
+    assert loaded.author_id == 1 and loaded.user_message_id == 2
+    assert loaded.part_ids == [501, 502]
+    assert loaded.names() == ["Anna", "Clara"]
+    assert list(loaded.status) == [STATUS_NEIN, STATUS_JA]
+    assert [(e.member_id, e.category) for e in loaded.entries] == [(111, 0), (333, 2)]
+    assert loaded.categories == {0: {0: None}, 2: {1: None}}
+    assert loaded.to_row() == state.to_row()
+
+
+def test_message_ids():
+    state = make_state()
+    state.part_ids = [6, 7]
+    assert state.message_ids() == [5, 6, 7]
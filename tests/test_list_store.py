@@ -0,0 +1,82 @@
+import list_store
+from list_state import ListState
+from list_store import ListStore
+
+
+def make_state(message_id, names=("Anna", "Ben")):
+    state = ListState(author_id=1, user_message_id=10 + message_id, guild_id=2, channel_id=3, message_id=message_id)
+    for name in names:
+        state.add(name)
+    return state
+
+
+def test_round_trip_through_database(tmp_path):
+    path = str(tmp_path / "lists.db")
+    store = ListStore(path)
+    state = make_state(1)
+    state.part_ids = [101]
+    state.set_status(1, 1)
+    store.save(state)
+    store.close()
+
+    loaded = ListStore(path).load(1)
+    assert loaded.names() == ["Anna", "Ben"]
+    assert list(loaded.status) == [0, 1]
+    assert loaded.part_ids == [101]
+    assert loaded.user_message_id == 11
+
+
+def test_load_prefers_pending_rows(tmp_path):
+    store = ListStore(str(tmp_path / "lists.db"))
+    store.save(make_state(1))
+    store.flush()
+    store.save(make_state(1, names=("Anna", "Ben", "Clara")))
+
+    assert store.load(1).names() == ["Anna", "Ben", "Clara"]
+    assert store.stats()['pending_rows'] == 1
+
+
+def test_pending_delete_hides_written_row(tmp_path):
+    store = ListStore(str(tmp_path / "lists.db"))
+    store.save(make_state(1))
+    store.flush()
+    store.delete(1)
+
+    assert store.load(1) is None
+    store.flush()
+    assert store.load(1) is None
+    assert store.load_index() == []
+
+
+def test_flush_writes_batches(tmp_path):
+    store = ListStore(str(tmp_path / "lists.db"))
+    store.save(make_state(1))
+    store.save(make_state(2))
+    store.save(make_state(1, names=("Clara",)))
+    store.flush()
+
+    assert store.batches_written == 1
+    assert store.rows_written == 2
+    assert sorted(store.load_index()) == [(1, 11, []), (2, 12, [])]
+    assert store.load(1).names() == ["Clara"]
+
+
+
+def test_purge_deletes_only_old_written_rows(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(list_store.time, "time", lambda: now[0])
+    store = ListStore(str(tmp_path / "lists.db"))
+    store.save(make_state(1))
+    store.save(make_state(2))
+    store.flush()
+    now[0] = 5000.0
+    store.save(make_state(3))
+    store.flush()
+    # Eine noch nicht geschriebene Änderung hält die Liste am Leben
+    store.save(make_state(2, names=("Clara",)))
+
+    assert store.purge(max_age=3000) == [1]
+    assert store.load(1) is None
+    store.flush()
+    assert sorted(row[0] for row in store.load_index()) == [2, 3]
+    assert store.stats()['rows_purged'] == 1
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+
+from list_updates import ListUpdateQueue
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class Lists:
+    """Loads list states from a dict, optionally slowly, and records changes"""
+
+    def __init__(self, states, delay=0):
+        self.states = states
+        self.delay = delay
+        self.changes = []
+
+    async def load(self, key):
+        await asyncio.sleep(self.delay)
+        return self.states.get(key)
+
+    def on_change(self, state, changes):
+        self.changes.append((list(state), changes))
+
+
+def append(wert, changed=True):
+    def update(state):
+        state.append(wert)
+        return changed
+    return update
+
+
+def test_updates_are_applied_in_order_with_one_change_callback():
+    async def scenario():
+        lists = Lists({"a": []}, delay=0.01)
+        queue = ListUpdateQueue(lists.load, lists.on_change)
+        for wert in range(5):
+            queue.submit("a", append(wert))
+        queue.submit("a", append("x", changed=False))
+        await asyncio.sleep(0.05)
+        return lists, queue.stats()
+
+    lists, stats = run(scenario())
+    assert lists.states["a"] == [0, 1, 2, 3, 4, "x"]
+    assert lists.changes == [([0, 1, 2, 3, 4, "x"], 5)]
+    assert stats['applied'] == 6
+    assert stats['max_depth'] == 6
+    assert stats['active_lists'] == 0 and stats['queued'] == 0
+
+
+def test_lists_do_not_wait_for_each_other():
+    async def scenario():
+        lists = Lists({"a": [], "b": []})
+        blocked = asyncio.Event()
+
+        async def load(key):
+            if key == "a":
+                await blocked.wait()
+            return lists.states[key]
+
+        queue = ListUpdateQueue(load, lists.on_change)
+        queue.submit("a", append(1))
+        queue.submit("b", append(2))
+        await asyncio.sleep(0.01)
+        b_done = lists.states["b"] == [2]
+        blocked.set()
+        await asyncio.sleep(0.01)
+        return b_done, lists.states
+
+    b_done, states = run(scenario())
+    assert b_done
+    assert states == {"a": [1], "b": [2]}
+
+
+def test_apply_resolves_with_state():
+    async def scenario():
+        lists = Lists({"a": []})
+        queue = ListUpdateQueue(lists.load, lists.on_change)
+        queue.submit("a", append(1))
+        return await queue.apply("a", append(2))
+
+    assert run(scenario()) == [1, 2]
+
+
+def test_missing_list_drops_updates():
+    async def scenario():
+        lists = Lists({})
+        queue = ListUpdateQueue(lists.load, lists.on_change)
+        queue.submit("weg", append(1))
+        result = await queue.apply("weg", append(2))
+        return result, lists.changes, queue.stats()
+
+    result, changes, stats = run(scenario())
+    assert result is None
+    assert changes == []
+    assert stats['dropped'] == 2
+
+
+def test_failing_update_does_not_stop_the_queue():
+    def kaputt(state):
+        raise ValueError("kaputt")
+
+    async def scenario():
+        lists = Lists({"a": []})
+        queue = ListUpdateQueue(lists.load, lists.on_change)
+        queue.submit("a", kaputt)
+        state = await queue.apply("a", append(1))
+        return state, queue.stats()
+
+    state, stats = run(scenario())
+    assert state == [1]
+    assert stats['failed'] == 1 and stats['applied'] == 1
+
+
+def test_stats_from_another_thread_while_queues_change():
+    errors = []
+
+    async def scenario():
+        lists = Lists({key: [] for key in range(200)})
+        queue = ListUpdateQueue(lists.load, lists.on_change)
+        done = threading.Event()
+
+        def read_stats():
+            try:
+                while not done.is_set():
+                    queue.stats()
+            except Exception as e:
+                errors.append(e)
+
+        reader = threading.Thread(target=read_stats)
+        reader.start()
+        try:
+            for _ in range(20):
+                for key in range(200):
+                    queue.submit(key, append(key))
+                await asyncio.sleep(0)
+        finally:
+            done.set()
+            reader.join()
+
+    run(scenario())
+    assert not errors
+
@@ -0,0 +1,88 @@
+import datetime
+import logging
+import sys
+
+from werkzeug.datastructures import MultiDict
+
+from log_buffer import LogRingBuffer, parse_level, parse_since, query_from_args
+
+
+def emit(buffer, message, level=logging.INFO, name="bot", created=None, **extra):
+    record = logging.makeLogRecord({'msg': message, 'levelno': level, 'name': name, **extra})
+    if created is not None:
+        record.created = created
+    buffer.handle(record)
+
+
+def messages(records):
+    return [record['message'] for record in records]
+
+
+def test_oldest_records_are_dropped_at_capacity():
+    buffer = LogRingBuffer(capacity=3)
+    for number in range(5):
+        emit(buffer, f"m{number}")
+    assert len(buffer) == 3
+    assert messages(buffer.query()) == ["m2", "m3", "m4"]
+
+
+def test_query_filters():
+    buffer = LogRingBuffer()
+    emit(buffer, "ready", name="bot")
+    emit(buffer, "heartbeat", level=logging.DEBUG, name="discord.gateway")
+    emit(buffer, "Rate Limited", level=logging.WARNING, name="discord.http", guild_id=1)
+    emit(buffer, "list edited", name="bot.lists", guild_id=1, list_id=7)
+    emit(buffer, "list edited", name="discordant", guild_id=2, list_id=8)
+
+    assert messages(buffer.query(level=logging.WARNING)) == ["Rate Limited"]
+    # Der Logger und seine Kinder, kein Präfix des Namens
+    assert messages(buffer.query(logger="discord")) == ["heartbeat", "Rate Limited"]
+    assert messages(buffer.query(contains="RATE")) == ["Rate Limited"]
+    assert messages(buffer.query(guild_id=1)) == ["Rate Limited", "list edited"]
+    assert [record['list_id'] for record in buffer.query(list_id=8)] == [8]
+
+
+def test_query_returns_newest_matches_oldest_first():
+    buffer = LogRingBuffer()
+    for number in range(10):
+        emit(buffer, f"m{number}", created=1000.0 + number)
+    assert messages(buffer.query(limit=3)) == ["m7", "m8", "m9"]
+    assert messages(buffer.query(since=1006.0)) == ["m6", "m7", "m8", "m9"]
+
+
+def test_record_dict():
+    buffer = LogRingBuffer()
+    emit(buffer, "hello %s", level=logging.ERROR, args=("world",), guild_id=3)
+    record, = buffer.query()
+    assert record['message'] == "hello world"
+    assert record['level'] == "ERROR"
+    assert (record['logger'], record['guild_id'], record['list_id']) == ("bot", 3, None)
+
+
+def test_exception_text_is_kept():
+    buffer = LogRingBuffer()
+    try:
+        raise ValueError("kaputt")
+    except ValueError:
+        emit(buffer, "failed", level=logging.ERROR, exc_info=sys.exc_info())
+    message = buffer.query()[0]['message']
+    assert message.startswith("failed\nTraceback")
+    assert "ValueError: kaputt" in message
+
+
+def test_parse_level_and_since():
+    assert parse_level("warning") == logging.WARNING
+    assert parse_level("30") == 30
+    assert parse_level("loud") is None
+    assert parse_since("1700000000.5") == 1700000000.5
+    assert parse_since("2024-01-02 03:04:05") == datetime.datetime(2024, 1, 2, 3, 4, 5).timestamp()
+    assert parse_since("yesterday") is None
+
+
+def test_query_from_args():
+    args = MultiDict({'level': "error", 'logger': "discord", 'guild_id': "5", 'list_id': "x", 'limit': "20"})
+    assert query_from_args(args) == {
+        'level': logging.ERROR, 'logger': "discord", 'since': None, 'contains': None,
+        'guild_id': 5, 'list_id': None, 'limit': 20,
+    }
+    assert query_from_args(MultiDict())['limit'] == 100
@@ -0,0 +1,93 @@
+import logging
+import queue
+import threading
+
+import pytest
+
+import log_setup
+from log_setup import DroppingQueueHandler, parse_levels, setup_logging, stop_logging
+
+
+class Collect(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.records.append(record.getMessage())
+        self.threads.add(threading.current_thread().name)
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    discord_level = logging.getLogger("discord").level
+    yield root
+    stop_logging()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    logging.getLogger("discord").setLevel(discord_level)
+
+
+def test_parse_levels():
+    assert parse_levels("discord=info, discord.gateway=WARNING,,broken") == {
+        'discord': "INFO", 'discord.gateway': "WARNING",
+    }
+
+
+def test_records_are_written_by_the_listener_thread(root_logger, monkeypatch):
+    monkeypatch.setattr(log_setup, "LOG_LEVELS", "discord=WARNING")
+    collect = Collect()
+    setup_logging(collect, log_file=None, console=False)
+
+    # Der Aufrufer legt nur in die Warteschlange
+    assert [type(handler) for handler in root_logger.handlers] == [DroppingQueueHandler]
+
+    logging.getLogger("bot").debug("debug")
+    logging.getLogger("discord.gateway").info("gateway info")
+    logging.getLogger("discord.gateway").warning("gateway warning")
+    stop_logging()
+
+    assert collect.records == ["debug", "gateway warning"]
+    assert threading.current_thread().name not in collect.threads
+
+
+def test_handler_levels_are_respected(root_logger):
+    collect = Collect(logging.WARNING)
+    setup_logging(collect, log_file=None, console=False)
+    logging.getLogger("bot").info("info")
+    logging.getLogger("bot").error("error")
+    stop_logging()
+    assert collect.records == ["error"]
+
+
+def test_reconfiguring_writes_out_the_old_listener(root_logger):
+    first, second = Collect(), Collect()
+    setup_logging(first, log_file=None, console=False)
+    logging.getLogger("bot").info("one")
+    setup_logging(second, log_file=None, console=False)
+    logging.getLogger("bot").info("two")
+    stop_logging()
+    assert (first.records, second.records) == (["one"], ["two"])
+    assert len(root_logger.handlers) == 1
+
+
+def test_log_file_is_written(root_logger, tmp_path):
+    path = tmp_path / "bot.log"
+    setup_logging(log_file=str(path), console=False)
+    logging.getLogger("bot").info("to the file")
+    stop_logging()
+    assert "bot - INFO - to the file" in path.read_text(encoding="utf-8")
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(2))
+    for number in range(5):
+        handler.handle(logging.makeLogRecord({'msg': str(number)}))
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
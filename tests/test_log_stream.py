@@ -0,0 +1,76 @@
+import logging
+
+from log_stream import LogBroadcaster, format_event, stream_logs
+
+
+def emit(broadcaster, *messages):
+    for message in messages:
+        broadcaster.handle(logging.makeLogRecord({'msg': message, 'levelno': logging.INFO}))
+
+
+def test_format_event():
+    assert format_event("a\nb", 7) == "id: 7\ndata: a\ndata: b\n\n"
+    assert format_event(3, event="gap") == "event: gap\ndata: 3\n\n"
+
+
+def test_subscribe_without_last_id_replays_nothing():
+    broadcaster = LogBroadcaster()
+    emit(broadcaster, "a", "b")
+    subscriber, replay, gap = broadcaster.subscribe()
+    assert (replay, gap) == ([], False)
+
+    emit(broadcaster, "c")
+    assert subscriber.wait(0) == ([(3, "c")], 0)
+
+
+def test_replay_after_last_id():
+    broadcaster = LogBroadcaster()
+    emit(broadcaster, "a", "b", "c")
+    _, replay, gap = broadcaster.subscribe(last_id=1)
+    assert (replay, gap) == ([(2, "b"), (3, "c")], False)
+    _, replay, gap = broadcaster.subscribe(last_id=3)
+    assert (replay, gap) == ([], False)
+
+
+def test_replay_reports_gap_when_history_overflowed():
+    broadcaster = LogBroadcaster(history=3)
+    emit(broadcaster, "a", "b", "c", "d", "e")
+    _, replay, gap = broadcaster.subscribe(last_id=1)
+    assert replay == [(3, "c"), (4, "d"), (5, "e")]
+    assert gap is True
+    # Genau der älteste gepufferte Eintrag folgt: keine Lücke
+    _, replay, gap = broadcaster.subscribe(last_id=2)
+    assert gap is False
+
+
+def test_last_id_from_before_a_restart_replays_everything():
+    broadcaster = LogBroadcaster()
+    emit(broadcaster, "a")
+    _, replay, gap = broadcaster.subscribe(last_id=500)
+    assert (replay, gap) == ([(1, "a")], True)
+
+
+def test_slow_subscriber_drops_oldest_records():
+    broadcaster = LogBroadcaster(backlog=2)
+    subscriber, _, _ = broadcaster.subscribe()
+    emit(broadcaster, "a", "b", "c", "d")
+    assert subscriber.wait(0) == ([(3, "c"), (4, "d")], 2)
+
+
+def test_stream_logs_resumes_from_last_event_id():
+    broadcaster = LogBroadcaster(history=2)
+    emit(broadcaster, "a", "b", "c")
+    stream = stream_logs(broadcaster, last_id=0, keepalive=0)
+
+    assert next(stream) == "retry: 3000\n\n"
+    assert next(stream) == format_event("", event="gap")
+    assert next(stream) == format_event("b", 2)
+    assert next(stream) == format_event("c", 3)
+    assert broadcaster.stats()['clients'] == 1
+
+    emit(broadcaster, "d")
+    assert next(stream) == format_event("d", 4)
+    assert next(stream) == ": keepalive\n\n"
+
+    stream.close()
+    assert broadcaster.stats() == {'clients': 0, 'buffered': 2, 'last_id': 4}
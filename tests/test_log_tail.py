@@ -0,0 +1,85 @@
+import os
+
+import log_tail
+from log_tail import parse_cursor, read_log
+
+
+def write(path, text, mode="a"):
+    with open(path, mode, encoding="utf-8") as log_file:
+        log_file.write(text)
+
+
+def numbered(first, last):
+    return "".join(f"line {number}\n" for number in range(first, last))
+
+
+def test_first_call_returns_last_lines(tmp_path, monkeypatch):
+    # Kleine Blöcke, damit mehrere Blöcke rückwärts gelesen werden
+    monkeypatch.setattr(log_tail, "TAIL_BLOCK_SIZE", 16)
+    path = tmp_path / "bot.log"
+    write(path, numbered(0, 100))
+
+    lines, cursor, reset = read_log(path, lines=3)
+    assert lines == ["line 97\n", "line 98\n", "line 99\n"]
+    assert reset is True
+    assert parse_cursor(cursor)[1] == os.path.getsize(path)
+
+
+def test_cursor_returns_only_new_complete_lines(tmp_path):
+    path = tmp_path / "bot.log"
+    write(path, numbered(0, 10))
+    _, cursor, _ = read_log(path)
+
+    # Eine unvollständige letzte Zeile folgt erst beim nächsten Abruf
+    write(path, "line 10\nline 1")
+    lines, cursor, reset = read_log(path, cursor)
+    assert (lines, reset) == (["line 10\n"], False)
+
+    write(path, "1\n")
+    lines, cursor, reset = read_log(path, cursor)
+    assert (lines, reset) == (["line 11\n"], False)
+
+    assert read_log(path, cursor) == ([], cursor, False)
+
+
+def test_truncated_file_resets(tmp_path):
+    path = tmp_path / "bot.log"
+    write(path, numbered(0, 50))
+    _, cursor, _ = read_log(path)
+
+    write(path, numbered(0, 2), mode="w")
+    lines, cursor, reset = read_log(path, cursor)
+    assert (lines, reset) == (["line 0\n", "line 1\n"], True)
+    assert parse_cursor(cursor)[1] == os.path.getsize(path)
+
+
+def test_rotated_file_resets(tmp_path):
+    path = tmp_path / "bot.log"
+    write(path, numbered(0, 5))
+    _, cursor, _ = read_log(path)
+
+    # Wie RotatingFileHandler: die alte Datei wird umbenannt, eine neue angelegt
+    os.rename(path, tmp_path / "bot.log.1")
+    write(path, numbered(0, 20))
+    assert parse_cursor(read_log(path)[1])[0] != parse_cursor(cursor)[0]
+    lines, _, reset = read_log(path, cursor, lines=2)
+    assert (lines, reset) == (["line 18\n", "line 19\n"], True)
+
+
+def test_falling_too_far_behind_resets(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_tail, "MAX_READ_BYTES", 100)
+    path = tmp_path / "bot.log"
+    write(path, numbered(0, 5))
+    _, cursor, _ = read_log(path)
+
+    write(path, numbered(5, 100))
+    lines, _, reset = read_log(path, cursor, lines=1)
+    assert (lines, reset) == (["line 99\n"], True)
+
+
+def test_malformed_cursor_reads_the_tail(tmp_path):
+    path = tmp_path / "bot.log"
+    write(path, numbered(0, 3))
+    lines, _, reset = read_log(path, "garbage", lines=1)
+    assert (lines, reset) == (["line 2\n"], True)
+    assert parse_cursor(None) is None
@@ -0,0 +1,137 @@
+import asyncio
+from types import SimpleNamespace
+
+import member_index
+from member_index import LazyMemberLoader, MemberIndex
+
+
+def make_member(guild, member_id, name, display_name=None):
+    return SimpleNamespace(id=member_id, name=name, display_name=display_name or name, guild=guild)
+
+
+class FakeGuild:
+    """Guild whose member query matches names by prefix, like the gateway"""
+
+    def __init__(self, guild_id=1, members=(), server_members=()):
+        self.id = guild_id
+        self.members = list(members)
+        self.server_members = list(server_members)
+        self.queries = []
+
+    async def query_members(self, query, limit):
+        self.queries.append(query)
+        prefix = query.casefold()
+        found = [
+            member for member in self.server_members
+            if member.name.casefold().startswith(prefix) or member.display_name.casefold().startswith(prefix)
+        ][:limit]
+        # discord.py legt die gefundenen Mitglieder im Cache ab
+        self.members.extend(member for member in found if member not in self.members)
+        return found
+
+
+def test_resolves_display_name_and_username_casefolded():
+    guild = FakeGuild()
+    anna = make_member(guild, 1, "anna_92", "Anna")
+    guild.members = [anna, make_member(guild, 2, "ben")]
+    index = MemberIndex()
+
+    assert index.resolve(guild, "ANNA") is anna
+    assert index.resolve(guild, "Anna_92") is anna
+    assert index.resolve(guild, "Clara") is None
+
+
+def test_rename_replaces_old_keys():
+    guild = FakeGuild()
+    anna = make_member(guild, 1, "anna_92", "Anna")
+    guild.members = [anna]
+    index = MemberIndex()
+    index.build(guild)
+
+    renamed = make_member(guild, 1, "anna_92", "Anni")
+    index.add_member(renamed)
+    assert index.resolve(guild, "Anna") is None
+    assert index.resolve(guild, "Anni") is renamed
+    assert index.resolve(guild, "anna_92") is renamed
+
+    index.remove_member(guild.id, 1)
+    assert index.resolve(guild, "anni") is None
+
+
+def test_shared_name_keeps_other_member_after_remove():
+    guild = FakeGuild()
+    first, second = make_member(guild, 1, "a", "Sam"), make_member(guild, 2, "b", "Sam")
+    guild.members = [first, second]
+    index = MemberIndex()
+    assert index.resolve(guild, "sam") is first
+    index.remove_member(guild.id, 1)
+    assert index.resolve(guild, "sam") is second
+
+
+def test_members_of_unbuilt_guild_are_ignored_until_first_use():
+    guild = FakeGuild()
+    anna = make_member(guild, 1, "anna")
+    index = MemberIndex()
+    index.add_member(anna)
+    guild.members = [anna]
+    # Beim ersten Zugriff wird aus dem Mitglieder-Cache gebaut
+    assert index.resolve(guild, "anna") is anna
+    index.drop_guild(guild.id)
+    guild.members = []
+    assert index.resolve(guild, "anna") is None
+
+
+def test_loader_queries_only_unknown_names_by_prefix():
+    guild = FakeGuild()
+    anna = make_member(guild, 1, "anna")
+    guild.members = [anna]
+    ben = make_member(guild, 2, "benjamin", "Ben")
+    guild.server_members = [anna, ben, make_member(guild, 3, "bente")]
+    index = MemberIndex()
+    loader = LazyMemberLoader(index)
+
+    asyncio.run(loader.prefetch(guild, ["Anna", "Ben", "Ben"]))
+    assert guild.queries == ["Ben"]
+    assert index.resolve(guild, "Ben") is ben
+    # Weitere Treffer des Präfixes landen ebenfalls im Index
+    assert index.resolve(guild, "bente") is not None
+    assert loader.stats()['hits'] == 1 and loader.stats()['queries'] == 1
+
+
+def test_loader_remembers_misses(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(member_index.time, "monotonic", lambda: now[0])
+    guild = FakeGuild()
+    index = MemberIndex()
+    loader = LazyMemberLoader(index, miss_ttl=300)
+
+    asyncio.run(loader.prefetch(guild, ["Clara"]))
+    asyncio.run(loader.prefetch(guild, ["clara"]))
+    assert guild.queries == ["Clara"]
+    assert loader.known_misses == 1
+
+    now[0] += 301
+    asyncio.run(loader.prefetch(guild, ["Clara"]))
+    assert len(guild.queries) == 2
+
+    # Nach einem Beitritt wird erneut gesucht
+    clara = make_member(guild, 4, "clara")
+    guild.server_members.append(clara)
+    loader.forget_misses(guild.id)
+    asyncio.run(loader.prefetch(guild, ["Clara"]))
+    assert len(guild.queries) == 3
+    assert index.resolve(guild, "Clara") is clara
+    assert loader.stats()['remembered_misses'] == 0
+
+
+def test_failed_query_is_not_remembered():
+    guild = FakeGuild()
+
+    async def timeout(query, limit):
+        raise asyncio.TimeoutError()
+
+    guild.query_members = timeout
+    loader = LazyMemberLoader(MemberIndex())
+    asyncio.run(loader.prefetch(guild, ["Clara"]))
+    assert loader.failed == 1
+    assert loader.stats()['remembered_misses'] == 0
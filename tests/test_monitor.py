@@ -0,0 +1,85 @@
+import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import monitor
+from monitor import gateway_staleness, next_daily_run, rest_stalled
+
+
+@pytest.fixture(autouse=True)
+def thresholds(monkeypatch):
+    monkeypatch.setattr(monitor, "LIVENESS_MAX_ACK_AGE", 180.0)
+    monkeypatch.setattr(monitor, "LIVENESS_MAX_EVENT_AGE", 900.0)
+    monkeypatch.setattr(monitor, "LIVENESS_MAX_REST_AGE", 120.0)
+
+
+def test_fresh_connection_is_healthy():
+    assert gateway_staleness(ack_age=20, event_age=5) == []
+
+
+def test_quiet_bot_with_fresh_heartbeats_is_healthy():
+    # Nachts oder ohne Präfix-Befehle kommen lange keine Ereignisse
+    assert gateway_staleness(ack_age=30, event_age=3600) == []
+
+
+def test_stale_heartbeat():
+    assert gateway_staleness(ack_age=200, event_age=5) == ["stale_heartbeat"]
+    assert gateway_staleness(ack_age=200, event_age=1000) == ["stale_heartbeat", "stale_events"]
+
+
+def test_stale_events_count_without_heartbeat_information():
+    assert gateway_staleness(ack_age=None, event_age=1000) == ["stale_events"]
+    assert gateway_staleness(ack_age=None, event_age=None) == []
+
+
+def test_disabled_thresholds(monkeypatch):
+    monkeypatch.setattr(monitor, "LIVENESS_MAX_ACK_AGE", 0)
+    monkeypatch.setattr(monitor, "LIVENESS_MAX_EVENT_AGE", 0)
+    assert gateway_staleness(ack_age=10000, event_age=10000) == []
+
+
+def test_idle_rest_scheduler_is_never_stalled():
+    assert not rest_stalled(now=10000, last_success=100, started_at=50, pending=0)
+
+
+def test_rest_stalled_after_last_success():
+    assert not rest_stalled(now=1000, last_success=900, started_at=0, pending=3)
+    assert rest_stalled(now=1000, last_success=850, started_at=0, pending=3)
+
+
+def test_no_rest_success_yet_counts_from_start():
+    assert not rest_stalled(now=1000, last_success=None, started_at=950, pending=1)
+    assert rest_stalled(now=1000, last_success=None, started_at=800, pending=1)
+
+
+def test_rest_check_disabled(monkeypatch):
+    monkeypatch.setattr(monitor, "LIVENESS_MAX_REST_AGE", 0)
+    assert not rest_stalled(now=1000, last_success=None, started_at=0, pending=1)
+
+
+def test_next_daily_run_before_and_after_the_hour():
+    assert next_daily_run(datetime.datetime(2026, 10, 18, 5, 59)) == datetime.datetime(2026, 10, 18, 6, 0)
+    assert next_daily_run(datetime.datetime(2026, 10, 18, 6, 0)) == datetime.datetime(2026, 10, 19, 6, 0)
+    assert next_daily_run(datetime.datetime(2026, 10, 18, 14, 30)) == datetime.datetime(2026, 10, 19, 6, 0)
+
+
+def test_next_daily_run_across_midnight():
+    assert next_daily_run(datetime.datetime(2026, 12, 31, 23, 59)) == datetime.datetime(2027, 1, 1, 6, 0)
+    assert next_daily_run(datetime.datetime(2027, 1, 1, 0, 1)) == datetime.datetime(2027, 1, 1, 6, 0)
+
+
+@pytest.mark.parametrize("now, stunden", [
+    (datetime.datetime(2026, 3, 28, 22, 0), 7),   # Umstellung auf Sommerzeit
+    (datetime.datetime(2026, 10, 24, 22, 0), 9),  # Umstellung auf Winterzeit
+])
+def test_next_daily_run_keeps_local_wall_time_across_dst(now, stunden):
+    next_run = next_daily_run(now)
+    assert next_run == datetime.datetime(now.year, now.month, now.day + 1, 6, 0)
+
+    # Der Neustart bleibt um 6:00 Ortszeit, die tatsächliche Wartezeit folgt der Zeitumstellung
+    berlin = ZoneInfo("Europe/Berlin")
+    utc = datetime.timezone.utc
+    start = now.replace(tzinfo=berlin).astimezone(utc)
+    ziel = next_run.replace(tzinfo=berlin).astimezone(utc)
+    assert (ziel - start).total_seconds() == stunden * 3600
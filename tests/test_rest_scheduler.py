@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from rest_scheduler import LANE_BULK, LANE_INTERACTIVE, LANE_NORMAL, RestScheduler
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def recorder(started, name, gate=None, result=None):
+    async def call():
+        started.append(name)
+        if gate is not None:
+            await gate.wait()
+        return result if result is not None else name
+    return call
+
+
+def test_returns_result_of_call():
+    async def scenario():
+        scheduler = RestScheduler()
+        return await scheduler.submit(LANE_NORMAL, ("send_message", 1), recorder([], "ok"))
+
+    assert run(scenario()) == "ok"
+
+
+def test_higher_lanes_are_started_first():
+    async def scenario():
+        scheduler = RestScheduler(max_in_flight=1)
+        started = []
+        gate = asyncio.Event()
+        first = asyncio.create_task(scheduler.submit(LANE_BULK, ("add_reaction", 1), recorder(started, "bulk 1", gate)))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(scheduler.submit(LANE_BULK, ("add_reaction", 2), recorder(started, "bulk 2"))),
+            asyncio.create_task(scheduler.submit(LANE_NORMAL, ("send_message", 3), recorder(started, "normal"))),
+            asyncio.create_task(scheduler.submit(LANE_INTERACTIVE, ("edit_message", 4), recorder(started, "interactive"))),
+        ]
+        await asyncio.sleep(0.01)
+        assert started == ["bulk 1"]
+        gate.set()
+        await asyncio.gather(first, *tasks)
+        return started
+
+    assert run(scenario()) == ["bulk 1", "interactive", "normal", "bulk 2"]
+
+
+def test_busy_route_does_not_block_other_routes():
+    async def scenario():
+        scheduler = RestScheduler()
+        started = []
+        gate = asyncio.Event()
+        held = asyncio.create_task(scheduler.submit(LANE_INTERACTIVE, ("edit_message", 1), recorder(started, "a1", gate)))
+        queued = asyncio.create_task(scheduler.submit(LANE_INTERACTIVE, ("edit_message", 1), recorder(started, "a2")))
+        other = await scheduler.submit(LANE_BULK, ("edit_message", 2), recorder(started, "b"))
+        assert other == "b"
+        assert started == ["a1", "b"]
+        stats = scheduler.stats()
+        gate.set()
+        await asyncio.gather(held, queued)
+        return started, stats
+
+    started, stats = run(scenario())
+    # Aufrufe derselben Route laufen der Reihe nach
+    assert started == ["a1", "b", "a2"]
+    assert stats['busy_routes'] == 1
+    assert stats['lanes']['interactive']['queued'] == 1
+
+
+def test_stats_and_failures():
+    async def scenario():
+        scheduler = RestScheduler()
+
+        async def kaputt():
+            raise RuntimeError("kaputt")
+
+        with pytest.raises(RuntimeError):
+            await scheduler.submit(LANE_NORMAL, ("send_message", 1), kaputt)
+        await scheduler.submit(LANE_NORMAL, ("send_message", 1), recorder([], "ok"))
+        await scheduler.submit(LANE_BULK, ("add_reaction", 1), recorder([], "ok"))
+        await asyncio.sleep(0)
+        return scheduler
+
+    scheduler = run(scenario())
+    stats = scheduler.stats()
+    assert stats['failed'] == 1
+    assert stats['in_flight'] == 0 and stats['busy_routes'] == 0
+    assert stats['lanes']['normal']['dispatched'] == 2
+    assert stats['lanes']['bulk']['dispatched'] == 1
+    assert stats['lanes']['interactive'] == {'queued': 0, 'dispatched': 0, 'avg_wait_ms': 0.0, 'max_wait_ms': 0.0}
+    assert scheduler.pending() == 0
+    assert scheduler.last_success is not None
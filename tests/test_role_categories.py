@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+from list_state import KATEGORIE_ANDERE, ROLLEN_REIHENFOLGE
+from role_categories import RoleCategories
+
+
+class CountingGuild:
+    """Guild that counts how often its role list is read"""
+
+    def __init__(self, roles, guild_id=1):
+        self.id = guild_id
+        self._roles = roles
+        self.role_reads = 0
+
+    @property
+    def roles(self):
+        self.role_reads += 1
+        return self._roles
+
+
+def role(role_id, name):
+    return SimpleNamespace(id=role_id, name=name)
+
+
+def member(guild, member_id, *roles):
+    return SimpleNamespace(id=member_id, guild=guild, roles=list(roles))
+
+
+ARZT = role(10, "Arzt")
+CHEFARZT = role(11, "Chefarzt")
+GAST = role(12, "Gast")
+
+
+def test_best_rank_among_roles():
+    guild = CountingGuild([ARZT, CHEFARZT, GAST])
+    categories = RoleCategories()
+    assert categories.category(member(guild, 1, GAST, ARZT, CHEFARZT)) == ROLLEN_REIHENFOLGE.index("Chefarzt")
+    assert categories.category(member(guild, 2, ARZT)) == ROLLEN_REIHENFOLGE.index("Arzt")
+    assert categories.category(member(guild, 3, GAST)) == KATEGORIE_ANDERE
+    assert categories.category(member(guild, 4)) == KATEGORIE_ANDERE
+
+
+def test_role_table_is_built_once_per_guild():
+    guild = CountingGuild([ARZT, CHEFARZT])
+    categories = RoleCategories()
+    for member_id in range(50):
+        categories.category(member(guild, member_id, ARZT))
+    assert guild.role_reads == 1
+
+
+def test_member_rank_is_cached_until_invalidated():
+    guild = CountingGuild([ARZT, CHEFARZT])
+    categories = RoleCategories()
+    anna = member(guild, 1, ARZT)
+    assert categories.category(anna) == ROLLEN_REIHENFOLGE.index("Arzt")
+
+    # Ohne Ereignis bleibt der gespeicherte Rang
+    anna.roles.append(CHEFARZT)
+    assert categories.category(anna) == ROLLEN_REIHENFOLGE.index("Arzt")
+
+    categories.invalidate_member(guild.id, anna.id)
+    assert categories.category(anna) == ROLLEN_REIHENFOLGE.index("Chefarzt")
+
+
+def test_role_rename_takes_effect_after_guild_invalidation():
+    gast = role(12, "Gast")
+    guild = CountingGuild([gast])
+    categories = RoleCategories()
+    ben = member(guild, 2, gast)
+    assert categories.category(ben) == KATEGORIE_ANDERE
+
+    gast.name = "Praktikant"
+    categories.invalidate_guild(guild.id)
+    assert categories.category(ben) == ROLLEN_REIHENFOLGE.index("Praktikant")
+    assert guild.role_reads == 2
+
+
+def test_guilds_are_separate():
+    first, second = CountingGuild([ARZT], guild_id=1), CountingGuild([], guild_id=2)
+    categories = RoleCategories()
+    assert categories.category(member(first, 1, ARZT)) == ROLLEN_REIHENFOLGE.index("Arzt")
+    # Gleiche Mitglieds- und Rollen-ID, aber die Rolle gibt es im zweiten Server nicht
+    assert categories.category(member(second, 1, ARZT)) == KATEGORIE_ANDERE
+    categories.invalidate_member(3, 1)
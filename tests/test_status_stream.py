@@ -0,0 +1,97 @@
+import json
+
+from status_stream import StatusPublisher, latency_bucket, status_key
+
+
+def summary(**changes):
+    data = {
+        'is_running': True,
+        'uptime': "0d 0h 1m 0s",
+        'last_restart': "Never restarted",
+        'restart_count': 0,
+        'bot_guilds': 3,
+        'healthy': True,
+        'problems': [],
+        'latency_ms': 40.0,
+        'shards': [],
+    }
+    data.update(changes)
+    return data
+
+
+def parse(event):
+    fields = dict(line.split(": ", 1) for line in event.strip().split("\n"))
+    return fields.get("event"), fields.get("id"), json.loads(fields["data"])
+
+
+def test_latency_bucket():
+    assert latency_bucket(None) is None
+    assert latency_bucket(40) == latency_bucket(99) == 0
+    assert latency_bucket(100) == 1
+    assert latency_bucket(10000) == 5
+
+
+def test_status_key_ignores_uptime_and_small_latency_changes():
+    assert status_key(summary()) == status_key(summary(uptime="9d", latency_ms=80.0))
+    assert status_key(summary()) != status_key(summary(latency_ms=300.0))
+    assert status_key(summary()) != status_key(summary(healthy=False, problems=["stale_heartbeat"]))
+
+
+def test_stream_sends_frames_only_on_change():
+    current = summary()
+    # Ohne eigene Messungen des Hintergrund-Threads während des Tests
+    publisher = StatusPublisher(lambda: current, interval=3600)
+    stream = publisher.stream(keepalive=0.01)
+
+    assert next(stream) == "retry: 3000\n\n"
+    event, first_id, data = parse(next(stream))
+    assert (event, data['bot_guilds']) == ("status", 3)
+    assert publisher.clients == 1
+
+    # Nur die Uptime ändert sich: Keepalive statt Frame
+    current = summary(uptime="0d 0h 2m 0s", latency_ms=60.0)
+    publisher.sample()
+    event, event_id, data = parse(next(stream))
+    assert (event, event_id, data['uptime']) == ("keepalive", None, "0d 0h 2m 0s")
+    assert set(data) == {'uptime', 'server_time'}
+
+    current = summary(healthy=False, problems=["stale_heartbeat"])
+    publisher.sample()
+    event, event_id, data = parse(next(stream))
+    assert (event, data['healthy'], data['problems']) == ("status", False, ["stale_heartbeat"])
+    assert event_id != first_id
+    assert publisher.stats()['frames'] == 2
+
+    stream.close()
+    assert publisher.clients == 0
+
+
+def test_reconnect_with_current_frame_id_skips_the_frame():
+    publisher = StatusPublisher(summary, interval=3600)
+    first = publisher.stream(keepalive=0.01)
+    next(first)
+    _, frame_id, _ = parse(next(first))
+
+    second = publisher.stream(last_id=frame_id, keepalive=0.01)
+    next(second)
+    event, _, _ = parse(next(second))
+    assert event == "keepalive"
+    first.close()
+    second.close()
+
+
+def test_failing_summary_keeps_the_last_frame():
+    calls = []
+
+    def get_summary():
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError("bot loop gone")
+        return summary()
+
+    publisher = StatusPublisher(get_summary, interval=3600)
+    publisher.sample()
+    frame_id = publisher.frame_id
+    publisher.sample()
+    assert publisher.frame_id == frame_id
+    assert publisher.frame['bot_guilds'] == 3